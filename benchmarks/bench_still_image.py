@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Still Image Encoding Benchmark
+画像シーンのエンコード速度ベンチマーク
+
+従来の -loop 1 による毎フレーム scale/pad と、静止画モード
+（1フレームだけ処理して tpad で複製）のエンコード時間を比較する。
+結果は「出力1秒あたりのエンコード時間」で表示する。
+
+使い方:
+    python benchmarks/bench_still_image.py [--durations 5 15] [--image photo.jpg]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from insightmovie.project import Scene, MediaType
+from insightmovie.video import FFmpegWrapper, SceneGenerator
+
+
+def make_test_image(ffmpeg: FFmpegWrapper, path: Path, size: str):
+    """テスト用の大きな画像を生成（24メガピクセル相当）"""
+    args = [
+        "-f", "lavfi",
+        "-i", f"testsrc2=s={size}:d=1",
+        "-frames:v", "1",
+        "-y",
+        str(path)
+    ]
+    if not ffmpeg.run_command(args):
+        raise RuntimeError("テスト画像の生成に失敗しました")
+
+
+def run_mode(
+    ffmpeg: FFmpegWrapper,
+    mode: str,
+    image_path: str,
+    output_path: str,
+    duration: float,
+    resolution: str,
+    fps: int
+) -> float:
+    """
+    1モードを実行して経過時間を返す
+
+    Args:
+        mode: "legacy"（従来の画像→動画ステップ）, "loop"（1パス・毎フレーム処理）,
+              "still"（1パス・静止画モード）
+    """
+    width, height = map(int, resolution.split('x'))
+    scene = Scene(media_path=image_path, media_type=MediaType.IMAGE)
+
+    start = time.perf_counter()
+    if mode == "legacy":
+        generator = SceneGenerator(ffmpeg, single_pass=False)
+        temp_path = generator._generate_from_image(image_path, duration, width, height, fps)
+        ok = temp_path is not None
+        if temp_path:
+            Path(temp_path).unlink()
+    else:
+        generator = SceneGenerator(ffmpeg, still_image_fast_path=(mode == "still"))
+        ok = generator._generate_single_pass(
+            scene, output_path, duration, width, height, fps
+        )
+    elapsed = time.perf_counter() - start
+
+    if not ok:
+        raise RuntimeError(f"{mode} モードのエンコードに失敗しました")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="画像シーンのエンコード速度ベンチマーク")
+    parser.add_argument("--image", help="入力画像（省略時は6000x4000のテスト画像を生成）")
+    parser.add_argument("--durations", type=float, nargs="+", default=[5.0, 15.0])
+    parser.add_argument("--resolution", default="1080x1920")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=2)
+    parser.add_argument("--ffmpeg", help="ffmpegのパス（省略時は自動検出）")
+    options = parser.parse_args()
+
+    ffmpeg = FFmpegWrapper(options.ffmpeg)
+    print(f"ffmpeg: {ffmpeg.get_version()}")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        image_path = options.image
+        if not image_path:
+            image_path = str(Path(work_dir) / "bench.jpg")
+            make_test_image(ffmpeg, Path(image_path), "6000x4000")
+
+        output_path = str(Path(work_dir) / "out.mp4")
+        modes = ["legacy", "loop", "still"]
+
+        print(f"\n解像度 {options.resolution} / {options.fps}fps / 試行 {options.repeat}回（最速値）")
+        print(f"{'長さ':>6} | " + " | ".join(f"{mode:>16}" for mode in modes) + " | 高速化")
+        print("-" * 80)
+
+        for duration in options.durations:
+            per_second = {}
+            for mode in modes:
+                best = min(
+                    run_mode(ffmpeg, mode, image_path, output_path,
+                             duration, options.resolution, options.fps)
+                    for _ in range(options.repeat)
+                )
+                per_second[mode] = best / duration
+
+            speedup = per_second["loop"] / per_second["still"]
+            cells = " | ".join(f"{per_second[mode]:>11.3f} s/s " for mode in modes)
+            print(f"{duration:>5.1f}s | {cells} | x{speedup:.1f}")
+
+    print("\n(s/s = 出力1秒あたりのエンコード時間、高速化 = loop / still)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
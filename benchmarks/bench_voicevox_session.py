@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+VOICEVOX Session Benchmark
+VOICEVOXクライアントの接続使い回し（keep-alive）ベンチマーク
+
+従来のリクエストごとに接続を開く方式（requests.get/post）と、
+VoiceVoxClient の接続プールを使う方式で、音声生成1回
+（/audio_query + /synthesis）あたりの時間を比較する。
+エンジンを指定しない場合は、応答だけを返す代役のエンジンをローカルに起動する
+（合成処理の時間を含まないため、通信の差だけが表れる）。
+
+使い方:
+    python benchmarks/bench_voicevox_session.py [--requests 200] [--threads 1 4]
+    python benchmarks/bench_voicevox_session.py --url http://127.0.0.1:50021
+"""
+import argparse
+import io
+import json
+import sys
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from insightmovie.voicevox import VoiceVoxClient
+
+
+def make_silent_wav(seconds: float = 1.0, rate: int = 24000) -> bytes:
+    """代役のエンジンが返す無音のWAV"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(rate)
+        wav_file.writeframes(b'\x00\x00' * int(seconds * rate))
+    return buffer.getvalue()
+
+
+class StandInEngineHandler(BaseHTTPRequestHandler):
+    """VOICEVOXエンジンの代役（/version, /audio_query, /synthesis に即座に応答）"""
+
+    protocol_version = "HTTP/1.1"  # keep-alive に対応
+    disable_nagle_algorithm = True  # 実際のエンジン（uvicorn）と同じく TCP_NODELAY
+    WAV_DATA = make_silent_wav()
+
+    def do_GET(self):
+        if urlparse(self.path).path == "/version":
+            self._respond(b'"0.0.0-bench"', "application/json")
+        else:
+            self._respond(b'{}', "application/json", status=404)
+
+    def do_POST(self):
+        # 本文を読み切ってから応答する（同じ接続で次のリクエストを受けるため）
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        path = urlparse(self.path).path
+        if path == "/audio_query":
+            query = {"accent_phrases": [], "speedScale": 1.0, "outputSamplingRate": 24000}
+            self._respond(json.dumps(query).encode('utf-8'), "application/json")
+        elif path == "/synthesis":
+            self._respond(self.WAV_DATA, "audio/wav")
+        else:
+            self._respond(b'{}', "application/json", status=404)
+
+    def _respond(self, body: bytes, content_type: str, status: int = 200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stand_in_engine() -> ThreadingHTTPServer:
+    """代役のエンジンを空いているポートで起動"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInEngineHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def generate_without_pool(base_url: str, text: str, speaker_id: int) -> bytes:
+    """従来の方式（リクエストごとに新しい接続）で音声を生成"""
+    response = requests.post(
+        f"{base_url}/audio_query",
+        params={"text": text, "speaker": speaker_id},
+        timeout=10.0
+    )
+    response.raise_for_status()
+    response = requests.post(
+        f"{base_url}/synthesis",
+        params={"speaker": speaker_id},
+        json=response.json(),
+        timeout=30.0
+    )
+    response.raise_for_status()
+    return response.content
+
+
+def run_mode(
+    mode: str,
+    base_url: str,
+    count: int,
+    threads: int,
+    text: str,
+    speaker_id: int
+) -> float:
+    """
+    1モードを実行して、音声生成1回あたりの時間（ミリ秒）を返す
+
+    Args:
+        mode: "per_request"（従来）, "pooled"（VoiceVoxClient の接続プール）
+    """
+    client = VoiceVoxClient(base_url=base_url, pool_size=max(threads, VoiceVoxClient.DEFAULT_POOL_SIZE))
+    if mode == "pooled":
+        generate = client.generate_audio
+    else:
+        def generate(text_: str, speaker_id_: int) -> bytes:
+            return generate_without_pool(base_url, text_, speaker_id_)
+
+    try:
+        # 1回目の接続・エンジンの初回処理を除く
+        generate(text, speaker_id)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            results = list(executor.map(lambda _: generate(text, speaker_id), range(count)))
+        elapsed = time.perf_counter() - start
+    finally:
+        client.close()
+
+    if not all(results):
+        raise RuntimeError(f"{mode} モードで音声生成に失敗しました")
+    # 並列実行では経過時間をリクエスト数で割った値（スループットの逆数）
+    return elapsed / count * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VOICEVOXクライアントの接続使い回しベンチマーク")
+    parser.add_argument("--url", help="VOICEVOXエンジンのURL（省略時は代役のエンジンを起動）")
+    parser.add_argument("--requests", type=int, default=200, help="音声生成の回数")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--text", default="こんにちは")
+    parser.add_argument("--speaker", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    options = parser.parse_args()
+
+    server = None
+    base_url = options.url
+    if not base_url:
+        server = start_stand_in_engine()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        print(f"代役のエンジンを起動: {base_url}")
+    elif not VoiceVoxClient(base_url=base_url).check_connection():
+        print(f"エンジンに接続できません: {base_url}")
+        return 1
+
+    modes = ["per_request", "pooled"]
+    print(f"\n音声生成 {options.requests}回 × 試行 {options.repeat}回（最速値）")
+    print(f"{'並列数':>6} | " + " | ".join(f"{mode:>14}" for mode in modes) + " | 短縮/回 | 高速化")
+    print("-" * 72)
+
+    try:
+        for threads in options.threads:
+            per_call = {}
+            for mode in modes:
+                per_call[mode] = min(
+                    run_mode(mode, base_url, options.requests, threads, options.text, options.speaker)
+                    for _ in range(options.repeat)
+                )
+
+            saved = per_call["per_request"] - per_call["pooled"]
+            speedup = per_call["per_request"] / per_call["pooled"]
+            cells = " | ".join(f"{per_call[mode]:>11.2f} ms" for mode in modes)
+            print(f"{threads:>6} | {cells} | {saved:>5.2f} ms | x{speedup:.1f}")
+    finally:
+        if server:
+            server.shutdown()
+
+    print("\n(ms = 音声生成1回（/audio_query + /synthesis）あたりの時間、高速化 = per_request / pooled)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
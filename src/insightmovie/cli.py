@@ -0,0 +1,160 @@
+"""
+InsightMovie - Command Line Interface
+GUIを使わずにプロジェクトを書き出すコマンドラインツール
+
+使い方:
+    python -m insightmovie.cli project.improj -o output.mp4
+"""
+import argparse
+import signal
+import sys
+import threading
+
+from insightmovie.core import Config
+from insightmovie.project import Project, get_encoding_profile
+from insightmovie.voicevox import VoiceVoxClient, VoiceVoxPool, EngineLauncher, AudioCache
+from insightmovie.video import FFmpegWrapper, RenderJob, SceneClipCache, MediaProxyCache, RenderHistory
+
+
+# キャンセルで終了したときの終了コード（Ctrl+C と同じ）
+EXIT_CANCELLED = 130
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """コマンドライン引数の定義"""
+    parser = argparse.ArgumentParser(
+        prog="insightmovie",
+        description="InsightMovieのプロジェクトを動画に書き出します"
+    )
+    parser.add_argument("project", help="プロジェクトファイル (.improj / .json)")
+    parser.add_argument("-o", "--output", help="出力ファイル（省略時はプロジェクトの設定）")
+    parser.add_argument("--profile", choices=["draft", "balanced", "final"], help="エンコードプロファイル")
+    parser.add_argument("--workers", type=int, help="並列レンダリング数（0で自動）")
+    parser.add_argument("--speaker", type=int, help="デフォルト話者ID（省略時は設定ファイル）")
+    parser.add_argument(
+        "--engine-url", action="append",
+        help="VOICEVOXエンジンのURL（省略時は設定ファイル、複数指定すると合成を振り分ける）"
+    )
+    parser.add_argument(
+        "--engines", type=int, default=0,
+        help="VOICEVOXエンジン（CPU版）を指定した数だけ起動して合成を振り分ける（設定ファイルのエンジンパスを使用）"
+    )
+    parser.add_argument("--resume", action="store_true", help="前回失敗した書き出しを再開する")
+    parser.add_argument("--estimate", action="store_true", help="書き出さずに所要時間の予測だけを表示する")
+    return parser
+
+
+def main(argv=None) -> int:
+    """
+    メイン関数
+
+    Args:
+        argv: コマンドライン引数（Noneなら sys.argv）
+
+    Returns:
+        終了コード（成功 0 / 失敗 1 / キャンセル 130）
+    """
+    args = build_parser().parse_args(argv)
+    config = Config()
+
+    project = Project(args.project)
+    if args.output:
+        project.output.output_path = args.output
+    if not project.output.output_path:
+        print("出力ファイルが指定されていません（-o で指定してください）")
+        return 1
+    if args.profile:
+        project.output.profile = get_encoding_profile(args.profile)
+    if args.workers is not None:
+        project.settings.render_workers = args.workers
+
+    launcher = None
+    engine_urls = args.engine_url or []
+    if args.engines > 0 and not args.estimate:
+        launcher = EngineLauncher(config.engine_path)
+        engine_urls = launcher.launch_pool(args.engines)
+        if not engine_urls:
+            print("VOICEVOXエンジンを起動できませんでした")
+            return 1
+
+    if len(engine_urls) > 1 or launcher:
+        client = VoiceVoxPool(engine_urls)
+    else:
+        client = VoiceVoxClient(
+            base_url=(engine_urls[0] if engine_urls else None) or config.engine_url or project.settings.voicevox_base_url
+        )
+
+    try:
+        if launcher:
+            ready = client.wait_until_ready()
+            print(f"VOICEVOXエンジン: {ready}/{len(engine_urls)} 台が応答")
+        return export(args, config, project, client)
+    finally:
+        client.close()
+        if launcher:
+            launcher.stop_pool()
+
+
+def export(args: argparse.Namespace, config: Config, project: Project, client: VoiceVoxClient) -> int:
+    """
+    プロジェクトを書き出す（--estimate なら予測だけを表示）
+
+    Args:
+        args: コマンドライン引数
+        config: 設定
+        project: 書き出すプロジェクト
+        client: VOICEVOXクライアント（VoiceVoxPool も可）
+
+    Returns:
+        終了コード
+    """
+    ffmpeg = FFmpegWrapper.from_config(config, project.settings.ffmpeg_path)
+    speaker_id = args.speaker if args.speaker is not None else (config.default_speaker_id or 13)
+
+    audio_cache = AudioCache()
+    clip_cache = SceneClipCache()
+    history = RenderHistory()
+
+    if args.estimate:
+        estimate = project.estimate_render_time(speaker_id, audio_cache, clip_cache, history, ffmpeg)
+        basis = "履歴から推定" if estimate.from_history else "既定値"
+        print(f"予測所要時間: 約{estimate.format_total()}（{basis}、並列数 {estimate.workers}、"
+              f"キャッシュ再利用 {estimate.cache_hits}/{len(estimate.scenes)}シーン）")
+        return 0
+
+    job = RenderJob(
+        project,
+        client,
+        audio_cache,
+        ffmpeg,
+        speaker_id,
+        clip_cache=clip_cache,
+        proxy_cache=MediaProxyCache(ffmpeg),
+        resume=args.resume,
+        history=history
+    )
+
+    # 書き出しは別スレッドで実行し、メインスレッドで Ctrl+C / SIGTERM を受けて中止する
+    result = {}
+    worker = threading.Thread(target=lambda: result.update(zip(("success", "message"), job.run())))
+
+    def on_signal(signum, frame):
+        print("\n中止要求を受け付けました")
+        job.cancel()
+
+    signal.signal(signal.SIGINT, on_signal)
+    if hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, on_signal)
+
+    worker.start()
+    while worker.is_alive():
+        worker.join(0.2)
+
+    print(result.get("message", ""))
+    if job.cancelled:
+        return EXIT_CANCELLED
+    return 0 if result.get("success") else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
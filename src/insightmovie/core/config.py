@@ -78,6 +78,17 @@ class Config:
         self.set("engine_path", path)
         self.save()
 
+    @property
+    def ffmpeg_cache(self) -> Optional[Dict[str, Any]]:
+        """ffmpegの検出結果（パス・サイズ・更新時刻・バージョン・対応機能）"""
+        return self.get("ffmpeg_cache")
+
+    @ffmpeg_cache.setter
+    def ffmpeg_cache(self, cache: Dict[str, Any]):
+        """ffmpegの検出結果を設定"""
+        self.set("ffmpeg_cache", cache)
+        self.save()
+
     @property
     def default_speaker_id(self) -> Optional[int]:
         """デフォルト話者ID"""
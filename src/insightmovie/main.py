@@ -24,7 +24,7 @@ def main():
     # 初回実行チェック
     if config.is_first_run:
         # セットアップウィザード表示
-        wizard = SetupWizard()
+        wizard = SetupWizard(engine_url=config.engine_url)
         if wizard.exec() != QDialog.DialogCode.Accepted:
             # キャンセルされた場合は終了
             return 0
@@ -50,15 +50,15 @@ def main():
 
         # エンジン接続確認
         if not client.check_connection():
-            # 再検出を試みる
+            # 再検出を試みる（前回の接続先 → デフォルトポート → ポート範囲を並行して確認）
             print("エンジンに接続できません。再検出を試みます...")
             engine_info = client.discover_engine()
             if engine_info:
                 config.engine_url = engine_info.base_url
 
-    # ffmpeg検出
+    # ffmpeg検出（前回の検出結果が有効なら再利用）
     try:
-        ffmpeg = FFmpegWrapper()
+        ffmpeg = FFmpegWrapper.from_config(config)
     except Exception as e:
         print(f"ffmpeg警告: {e}")
         ffmpeg = None
@@ -3,6 +3,13 @@ Project Management Module
 プロジェクト管理モジュール
 """
 from .scene import Scene, MediaType, DurationMode
-from .project import Project
+from .project import (
+    Project, OutputSettings, ProjectSettings,
+    EncodingProfile, ENCODING_PROFILES, get_encoding_profile
+)
 
-__all__ = ['Scene', 'MediaType', 'DurationMode', 'Project']
+__all__ = [
+    'Scene', 'MediaType', 'DurationMode', 'Project',
+    'OutputSettings', 'ProjectSettings',
+    'EncodingProfile', 'ENCODING_PROFILES', 'get_encoding_profile',
+]
@@ -10,18 +10,97 @@ from dataclasses import dataclass, field
 from .scene import Scene
 
 
+@dataclass
+class EncodingProfile:
+    """エンコードプロファイル（x264基準の設定。他のエンコーダーでは EncoderPolicy が読み替える）"""
+    name: str = "balanced"
+    preset: str = "medium"
+    crf: int = 23
+    tune: Optional[str] = None
+    threads: int = 0  # 1エンコードあたりのスレッド数（0なら自動）
+    scale: float = 1.0  # 出力解像度の倍率（1.0なら等倍）
+    intermediate: bool = False  # シーン動画を中間コーデックで作り、結合時に1回だけエンコードするか
+
+    def to_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'preset': self.preset,
+            'crf': self.crf,
+            'tune': self.tune,
+            'threads': self.threads,
+            'scale': self.scale,
+            'intermediate': self.intermediate,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'EncodingProfile':
+        return cls(
+            name=data.get('name', 'balanced'),
+            preset=data.get('preset', 'medium'),
+            crf=data.get('crf', 23),
+            tune=data.get('tune'),
+            threads=data.get('threads', 0),
+            scale=data.get('scale', 1.0),
+            intermediate=data.get('intermediate', False),
+        )
+
+    def apply_resolution(self, resolution: str) -> str:
+        """
+        プロファイルの倍率を解像度に適用
+
+        Args:
+            resolution: 解像度 "WxH"
+
+        Returns:
+            縮小後の解像度 "WxH"（x264のため偶数に丸める）
+        """
+        if self.scale >= 1.0:
+            return resolution
+        width, height = map(int, resolution.split('x'))
+        width = max(2, int(width * self.scale) // 2 * 2)
+        height = max(2, int(height * self.scale) // 2 * 2)
+        return f"{width}x{height}"
+
+
+# 組み込みのエンコードプロファイル
+ENCODING_PROFILES = {
+    # タイミング確認用：半分の解像度・最速プリセット
+    'draft': EncodingProfile(name='draft', preset='ultrafast', crf=30, scale=0.5),
+    # 従来の設定（x264のデフォルト）
+    'balanced': EncodingProfile(name='balanced', preset='medium', crf=23),
+    # 納品用：時間をかけて高画質
+    'final': EncodingProfile(name='final', preset='slow', crf=18),
+}
+
+
+def get_encoding_profile(name: str) -> EncodingProfile:
+    """
+    名前から組み込みプロファイルを取得
+
+    Args:
+        name: プロファイル名（draft / balanced / final）
+
+    Returns:
+        プロファイルのコピー（未知の名前なら balanced）
+    """
+    profile = ENCODING_PROFILES.get(name, ENCODING_PROFILES['balanced'])
+    return EncodingProfile.from_dict(profile.to_dict())
+
+
 @dataclass
 class OutputSettings:
     """出力設定"""
     resolution: str = "1080x1920"  # 縦動画デフォルト
     fps: int = 30
     output_path: str = ""
+    profile: EncodingProfile = field(default_factory=EncodingProfile)
 
     def to_dict(self) -> dict:
         return {
             'resolution': self.resolution,
             'fps': self.fps,
             'output_path': self.output_path,
+            'profile': self.profile.to_dict(),
         }
 
     @classmethod
@@ -30,8 +109,14 @@ class OutputSettings:
             resolution=data.get('resolution', '1080x1920'),
             fps=data.get('fps', 30),
             output_path=data.get('output_path', ''),
+            profile=EncodingProfile.from_dict(data.get('profile', {})),
         )
 
+    @property
+    def render_resolution(self) -> str:
+        """プロファイルの倍率を適用した実際の出力解像度"""
+        return self.profile.apply_resolution(self.resolution)
+
 
 @dataclass
 class ProjectSettings:
@@ -40,6 +125,9 @@ class ProjectSettings:
     voicevox_run_exe: Optional[str] = None
     ffmpeg_path: Optional[str] = None
     font_path: Optional[str] = None
+    render_workers: int = 0  # 並列レンダリング数（0なら自動）
+    streaming_export: bool = False  # 中間ファイルを作らずパイプで書き出すか
+    workspace_dir: Optional[str] = None  # 中間ファイルの置き場所（Noneならシステムの一時ディレクトリ）
 
     def to_dict(self) -> dict:
         return {
@@ -47,6 +135,9 @@ class ProjectSettings:
             'voicevox_run_exe': self.voicevox_run_exe,
             'ffmpeg_path': self.ffmpeg_path,
             'font_path': self.font_path,
+            'render_workers': self.render_workers,
+            'streaming_export': self.streaming_export,
+            'workspace_dir': self.workspace_dir,
         }
 
     @classmethod
@@ -56,6 +147,9 @@ class ProjectSettings:
             voicevox_run_exe=data.get('voicevox_run_exe'),
             ffmpeg_path=data.get('ffmpeg_path'),
             font_path=data.get('font_path'),
+            render_workers=data.get('render_workers', 0),
+            streaming_export=data.get('streaming_export', False),
+            workspace_dir=data.get('workspace_dir'),
         )
 
 
@@ -199,3 +293,21 @@ class Project:
     def is_valid(self) -> bool:
         """プロジェクトが有効か（最低限の条件）"""
         return len(self.scenes) > 0
+
+    def estimate_render_time(self, speaker_id: int, audio_cache=None, clip_cache=None, history=None, ffmpeg=None):
+        """
+        書き出しにかかる時間を予測
+
+        Args:
+            speaker_id: プロジェクトデフォルトの話者ID
+            audio_cache: 音声キャッシュ（AudioCache）
+            clip_cache: シーン動画キャッシュ（SceneClipCache）
+            history: 書き出し履歴（RenderHistory、Noneなら既定値だけで予測）
+            ffmpeg: 書き出しに使うffmpeg（FFmpegWrapper）
+
+        Returns:
+            RenderEstimate
+        """
+        # video パッケージが project を参照するため、ここで読み込む
+        from ..video.render_estimator import RenderEstimator
+        return RenderEstimator(history).estimate(self, speaker_id, audio_cache, clip_cache, ffmpeg)
@@ -29,10 +29,11 @@ class EngineCheckThread(QThread):
 
     def run(self):
         self.progress.emit("VOICEVOXエンジンを検索中...")
-        engine_info = self.client.discover_engine()
+        # 前回の接続先を優先して全ポートを並行して確認し、見つかった時点で残りを打ち切る
+        engine = self.client.discover_engine()
 
-        if engine_info:
-            self.found.emit(engine_info.base_url)
+        if engine:
+            self.found.emit(engine.base_url)
         else:
             self.not_found.emit()
 
@@ -302,7 +303,7 @@ class CompletionPage(QWizardPage):
 class SetupWizard(QWizard):
     """セットアップウィザード"""
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, engine_url: Optional[str] = None):
         super().__init__(parent)
         self.setWindowTitle("InsightMovie - 初回セットアップ")
         self.setWizardStyle(QWizard.ModernStyle)
@@ -312,7 +313,8 @@ class SetupWizard(QWizard):
         self.setStyleSheet(get_stylesheet())
 
         # コンポーネント初期化
-        self.client = VoiceVoxClient()
+        # 前回の接続先（Config.engine_url）があればエンジン検出で最初に確認する
+        self.client = VoiceVoxClient(base_url=engine_url)
         self.launcher = EngineLauncher()
 
         # ページ追加
@@ -2,6 +2,7 @@
 Project Window - 4 Scene Video Editor
 4シーン動画編集ウィンドウ
 """
+import copy
 import os
 import subprocess
 import platform
@@ -12,20 +13,23 @@ from PySide6.QtWidgets import (
     QComboBox, QSpinBox, QDoubleSpinBox, QRadioButton, QButtonGroup,
     QGridLayout, QFrame, QScrollArea, QDialog, QCheckBox
 )
-from PySide6.QtCore import Qt, QThread, Signal, QSize
+from PySide6.QtCore import Qt, QThread, QTimer, Signal, QSize
 from PySide6.QtGui import QPixmap, QIcon, QAction
 from pathlib import Path
 from typing import Optional
 
-from ..project import Project, Scene, MediaType, DurationMode
+from ..project import Project, Scene, MediaType, DurationMode, get_encoding_profile
 from ..voicevox import VoiceVoxClient, AudioCache
-from ..video import FFmpegWrapper, SceneGenerator, VideoComposer
+from ..video import (
+    FFmpegWrapper, RenderJob, SceneClipCache, MediaProxyCache, JobManifest, RenderProgress, RenderHistory
+)
 from .theme import get_stylesheet, COLOR_PALETTE, SPACING, RADIUS
 
 
 class VideoGenerationThread(QThread):
     """動画生成スレッド"""
     progress = Signal(str)  # 進捗メッセージ
+    progress_event = Signal(object)  # 進捗イベント（RenderProgress）
     finished = Signal(bool, str)  # 成功/失敗, メッセージ
 
     def __init__(
@@ -34,145 +38,87 @@ class VideoGenerationThread(QThread):
         voicevox_client: VoiceVoxClient,
         audio_cache: AudioCache,
         ffmpeg: FFmpegWrapper,
-        speaker_id: int
+        speaker_id: int,
+        max_workers: Optional[int] = None,
+        clip_cache: Optional[SceneClipCache] = None,
+        proxy_cache: Optional[MediaProxyCache] = None,
+        resume: bool = False,
+        history: Optional[RenderHistory] = None
     ):
         super().__init__()
-        self.project = project
-        self.voicevox = voicevox_client
-        self.audio_cache = audio_cache
-        self.ffmpeg = ffmpeg
-        self.speaker_id = speaker_id
+        self.job = RenderJob(
+            project,
+            voicevox_client,
+            audio_cache,
+            ffmpeg,
+            speaker_id,
+            max_workers=max_workers,
+            progress_callback=self.progress.emit,
+            progress_event_callback=self.progress_event.emit,
+            clip_cache=clip_cache,
+            proxy_cache=proxy_cache,
+            resume=resume,
+            history=history
+        )
 
     def run(self):
         """動画生成処理"""
-        try:
-            import tempfile
-            from pathlib import Path
-
-            self.progress.emit("動画生成を開始します...")
-
-            # 一時ディレクトリ
-            temp_dir = Path(tempfile.gettempdir()) / "insightmovie_build"
-            temp_dir.mkdir(parents=True, exist_ok=True)
-
-            scene_videos = []
-
-            # 各シーンを生成
-            for i, scene in enumerate(self.project.scenes, 1):
-                self.progress.emit(f"\n{'='*50}")
-                self.progress.emit(f"シーン {i}/{len(self.project.scenes)} を処理中...")
-                self.progress.emit(f"  ナレーション: {scene.narration_text[:50] if scene.has_narration else 'なし'}")
-                self.progress.emit(f"  字幕: {scene.subtitle_text if scene.has_subtitle else 'なし'}")
-
-                # 音声生成
-                audio_path = None
-                duration = scene.fixed_seconds  # デフォルト
-                total_duration = scene.fixed_seconds  # シーンの長さ（無音含む）
-
-                if scene.has_narration:
-                    # シーンごとの話者ID（指定がなければプロジェクトデフォルトを使用）
-                    scene_speaker_id = scene.speaker_id if scene.speaker_id is not None else self.speaker_id
-
-                    # キャッシュチェック
-                    if self.audio_cache.exists(scene.narration_text, scene_speaker_id):
-                        self.progress.emit(f"  音声をキャッシュから取得中...")
-                        audio_data = self.audio_cache.load(scene.narration_text, scene_speaker_id)
-                        audio_path = self.audio_cache.get_cache_path(
-                            scene.narration_text,
-                            scene_speaker_id
-                        )
-                        duration = self.audio_cache.get_duration(
-                            scene.narration_text,
-                            scene_speaker_id
-                        )
-                        self.progress.emit(f"  ✓ 音声取得: {Path(audio_path).name} ({duration:.2f}秒)")
-                    else:
-                        # 新規生成
-                        self.progress.emit(f"  音声を生成中（VOICEVOX）...")
-                        audio_data = self.voicevox.generate_audio(
-                            scene.narration_text,
-                            scene_speaker_id
-                        )
-                        if not audio_data:
-                            self.progress.emit(f"  ✗ 音声生成失敗")
-                            self.finished.emit(False, "音声生成に失敗しました")
-                            return
-
-                        audio_path = self.audio_cache.save(
-                            scene.narration_text,
-                            scene_speaker_id,
-                            audio_data
-                        )
-                        duration = AudioCache.get_audio_duration_from_bytes(audio_data)
-                        self.progress.emit(f"  ✓ 音声生成完了: {Path(audio_path).name} ({duration:.2f}秒)")
-
-                    # 前後に無音パディングを追加するため+2秒
-                    silence_padding = 2.0  # 前後1秒ずつ
-
-                    if scene.duration_mode == DurationMode.AUTO:
-                        # 音声長に合わせる（+無音パディング）
-                        if duration:
-                            total_duration = duration + silence_padding
-                            scene.fixed_seconds = total_duration
-                            self.progress.emit(f"  シーン長さを音声に合わせる: {duration:.2f}秒 + 無音{silence_padding}秒 = {total_duration:.2f}秒")
-                    else:
-                        # 固定長使用
-                        total_duration = scene.fixed_seconds
-                        self.progress.emit(f"  固定長を使用: {total_duration:.2f}秒")
-                else:
-                    self.progress.emit(f"  ナレーションなし（音声スキップ）")
-                    total_duration = scene.fixed_seconds
-
-                # シーン動画生成
-                self.progress.emit(f"  動画を生成中...")
-                scene_video_path = temp_dir / f"scene_{i:03d}.mp4"
-
-                generator = SceneGenerator(
-                    self.ffmpeg,
-                    self.project.settings.font_path
-                )
-
-                success = generator.generate_scene(
-                    scene,
-                    str(scene_video_path),
-                    total_duration,
-                    self.project.output.resolution,
-                    self.project.output.fps,
-                    str(audio_path) if audio_path else None
-                )
-
-                if not success:
-                    self.finished.emit(False, f"シーン {i} の生成に失敗しました")
-                    return
-
-                scene_videos.append(str(scene_video_path))
-
-            # 動画を結合
-            self.progress.emit("動画を結合中...")
-            composer = VideoComposer(self.ffmpeg)
-
-            success = composer.concat_videos(
-                scene_videos,
-                self.project.output.output_path
-            )
+        success, message = self.job.run()
+        self.finished.emit(success, message)
 
-            # 一時ファイル削除
-            for video_path in scene_videos:
-                if Path(video_path).exists():
-                    Path(video_path).unlink()
+    def cancel(self):
+        """動画生成を中止（UIスレッドから呼ぶ）"""
+        self.job.cancel()
 
-            if success:
-                self.finished.emit(True, f"動画を保存しました: {self.project.output.output_path}")
-            else:
-                self.finished.emit(False, "動画の結合に失敗しました")
 
-        except Exception as e:
-            self.finished.emit(False, f"エラー: {str(e)}")
+class RenderEstimateThread(QThread):
+    """書き出し時間の予測スレッド（シーンのフィンガープリント計算・ffmpegの確認をUIスレッドで行わない）"""
+    finished = Signal(object)  # RenderEstimate
+
+    def __init__(
+        self,
+        project: Project,
+        speaker_id: int,
+        audio_cache: AudioCache,
+        clip_cache: SceneClipCache,
+        history: RenderHistory,
+        ffmpeg: Optional[FFmpegWrapper]
+    ):
+        """
+        Args:
+            project: 予測するプロジェクト（UIで編集されない複製を渡す）
+            speaker_id: プロジェクトデフォルトの話者ID
+            audio_cache: 音声キャッシュ
+            clip_cache: シーン動画キャッシュ
+            history: 書き出し履歴
+            ffmpeg: 書き出しに使うffmpeg
+        """
+        super().__init__()
+        self.project = project
+        self.speaker_id = speaker_id
+        self.audio_cache = audio_cache
+        self.clip_cache = clip_cache
+        self.history = history
+        self.ffmpeg = ffmpeg
+
+    def run(self):
+        """予測処理"""
+        estimate = self.project.estimate_render_time(
+            self.speaker_id,
+            self.audio_cache,
+            self.clip_cache,
+            self.history,
+            self.ffmpeg
+        )
+        self.finished.emit(estimate)
 
 
 class ProjectWindow(QMainWindow):
     """プロジェクトウィンドウ"""
 
+    # 設定の変更から書き出し時間を予測するまでの待ち時間（ミリ秒）
+    ESTIMATE_DELAY_MS = 300
+
     def __init__(
         self,
         voicevox_client: VoiceVoxClient,
@@ -194,11 +140,22 @@ class ProjectWindow(QMainWindow):
             self.ffmpeg = None
 
         self.audio_cache = AudioCache()
+        self.clip_cache = SceneClipCache()
+        self.proxy_cache = MediaProxyCache(self.ffmpeg) if self.ffmpeg else None
+        self.render_history = RenderHistory()
         self.project = Project()
         self.current_scene: Optional[Scene] = None
         self.generation_thread: Optional[VideoGenerationThread] = None
+        self.estimate_thread: Optional[RenderEstimateThread] = None
+        self.estimate_pending = False  # 予測中に設定が変わり、やり直しが必要か
         self.speaker_styles: dict = {}  # 話者選択用
 
+        # 入力のたびに予測しないよう、変更が落ち着いてから予測する
+        self.estimate_timer = QTimer(self)
+        self.estimate_timer.setSingleShot(True)
+        self.estimate_timer.setInterval(self.ESTIMATE_DELAY_MS)
+        self.estimate_timer.timeout.connect(self.start_render_estimate)
+
         self.setWindowTitle("InsightMovie - 新規プロジェクト")
         self.setMinimumSize(1100, 750)
         self.resize(1300, 950)  # 初期サイズ（リサイズ可能）
@@ -208,6 +165,7 @@ class ProjectWindow(QMainWindow):
 
         self.setup_menu_bar()
         self.setup_ui()
+        self.load_render_settings()
         self.load_scene_list()
 
     def setup_menu_bar(self):
@@ -685,8 +643,71 @@ class ProjectWindow(QMainWindow):
         self.fps_spin.setValue(30)
         layout.addWidget(self.fps_spin)
 
+        # エンコードプロファイル
+        layout.addWidget(QLabel("画質:"))
+        self.profile_combo = QComboBox()
+        self.profile_combo.addItem("ドラフト（高速・確認用）", "draft")
+        self.profile_combo.addItem("標準", "balanced")
+        self.profile_combo.addItem("最終（高画質）", "final")
+        self.profile_combo.setCurrentIndex(1)
+        self.profile_combo.setToolTip("ドラフトは半分の解像度で高速に書き出します（タイミング確認用）")
+        layout.addWidget(self.profile_combo)
+
+        # 中間コーデック
+        self.intermediate_check = QCheckBox("最終エンコード1回")
+        self.intermediate_check.setToolTip(
+            "シーン動画を可逆の中間コーデックで作り、結合時にだけ\n"
+            "選択した画質でエンコードします（画質が安定、一時ファイルは大きくなります）"
+        )
+        layout.addWidget(self.intermediate_check)
+
+        # 並列レンダリング数
+        layout.addWidget(QLabel("並列数:"))
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(0, os.cpu_count() or 1)
+        self.workers_spin.setSpecialValueText("自動")
+        self.workers_spin.setValue(0)
+        self.workers_spin.setToolTip("同時に生成するシーン数（自動: CPUコア数から決定）")
+        layout.addWidget(self.workers_spin)
+
+        # ストリーミング書き出し
+        self.streaming_check = QCheckBox("中間ファイルなし")
+        self.streaming_check.setToolTip(
+            "シーン動画を一時ファイルに書かず、パイプ経由で最終ファイルだけを書き出します\n"
+            "（ネットワークドライブなどディスクが遅い環境向け）"
+        )
+        layout.addWidget(self.streaming_check)
+
         layout.addStretch()
 
+        # 書き出し時間の予測
+        self.estimate_label = QLabel("")
+        self.estimate_label.setToolTip("過去の書き出し時間から予測した所要時間です（履歴がない場合は目安）")
+        layout.addWidget(self.estimate_label)
+
+        # 設定を変えたら予測し直す
+        self.resolution_combo.currentIndexChanged.connect(self.update_render_estimate)
+        self.fps_spin.valueChanged.connect(self.update_render_estimate)
+        self.profile_combo.currentIndexChanged.connect(self.update_render_estimate)
+        self.intermediate_check.toggled.connect(self.update_render_estimate)
+        self.workers_spin.valueChanged.connect(self.update_render_estimate)
+
+        # 再開ボタン（前回の書き出しが途中で失敗した場合のみ有効）
+        self.resume_btn = QPushButton("書き出しを再開")
+        self.resume_btn.setMinimumHeight(44)
+        self.resume_btn.setToolTip("前回失敗した書き出しを、完了済みのシーンを飛ばして続きから再開します")
+        self.resume_btn.clicked.connect(self.resume_export)
+        layout.addWidget(self.resume_btn)
+        self.update_resume_button()
+
+        # 中止ボタン（書き出し中のみ有効）
+        self.cancel_btn = QPushButton("中止")
+        self.cancel_btn.setMinimumHeight(44)
+        self.cancel_btn.setToolTip("書き出しを中止します（完了済みのシーンは「書き出しを再開」で再利用できます）")
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self.cancel_export)
+        layout.addWidget(self.cancel_btn)
+
         # 書き出しボタン
         export_btn = QPushButton("動画を書き出し")
         export_btn.setProperty("class", "success")
@@ -800,6 +821,8 @@ class ProjectWindow(QMainWindow):
         if self.project.scenes:
             self.scene_list.setCurrentRow(0)
 
+        self.update_render_estimate()
+
     def on_scene_selected(self, current: QListWidgetItem, previous: QListWidgetItem):
         """シーン選択時"""
         if not current:
@@ -1125,38 +1148,185 @@ class ProjectWindow(QMainWindow):
         if not output_path:
             return
 
-        # 設定を反映
+        self.apply_export_settings(output_path)
+        self.start_generation()
+
+    def resume_export(self):
+        """前回失敗した書き出しを再開"""
+        if not self.ffmpeg:
+            QMessageBox.warning(self, "エラー", "ffmpegが利用できません")
+            return
+
+        if not self.project.output.output_path:
+            return
+
+        self.apply_export_settings(self.project.output.output_path)
+        self.start_generation(resume=True)
+
+    def update_resume_button(self):
+        """再開できる書き出しがあるかに応じて再開ボタンを切り替え"""
+        output_path = self.project.output.output_path
+        can_resume = bool(output_path) and JobManifest.for_output(
+            output_path,
+            self.project.settings.workspace_dir
+        ).exists()
+        self.resume_btn.setEnabled(can_resume)
+
+    def update_render_estimate(self):
+        """書き出し時間の予測を予約（変更が続く間は待ち、最後の変更の後に1回だけ予測する）"""
+        self.estimate_timer.start()
+
+    def start_render_estimate(self):
+        """書き出し時間の予測をバックグラウンドで開始（パネルの設定で予測し、プロジェクトは変更しない）"""
+        if self.estimate_thread and self.estimate_thread.isRunning():
+            # 実行中の予測が終わってからやり直す
+            self.estimate_pending = True
+            return
+        self.estimate_pending = False
+
+        project = copy.copy(self.project)
+        project.scenes = copy.deepcopy(self.project.scenes)
+        project.output = copy.deepcopy(self.project.output)
+        project.settings = copy.deepcopy(self.project.settings)
+        self.apply_render_settings(project)
+
+        self.estimate_thread = RenderEstimateThread(
+            project,
+            self.speaker_id,
+            self.audio_cache,
+            self.clip_cache,
+            self.render_history,
+            self.ffmpeg
+        )
+        self.estimate_thread.finished.connect(self.on_render_estimated)
+        self.estimate_thread.start()
+
+    def on_render_estimated(self, estimate):
+        """書き出し時間の予測完了時"""
+        if self.estimate_pending:
+            # 予測中に設定が変わったため、古い結果は表示せずに予測し直す
+            # （結果の通知はスレッドの終了直前に届くため、終了を待ってから始める）
+            self.estimate_thread.wait()
+            self.start_render_estimate()
+            return
+
+        text = f"予測 約{estimate.format_total()}"
+        if estimate.cache_hits:
+            text += f"（キャッシュ {estimate.cache_hits}/{len(estimate.scenes)}）"
+        self.estimate_label.setText(text)
+
+    def apply_export_settings(self, output_path: str):
+        """
+        書き出しパネルの設定をプロジェクトに反映
+
+        Args:
+            output_path: 書き出し先の動画ファイルパス
+        """
+        self.apply_render_settings(self.project)
+        self.project.output.output_path = output_path
+
+    def load_render_settings(self):
+        """プロジェクトのレンダリング設定を書き出しパネルに表示（変更通知は出さない）"""
+        widgets = [
+            self.resolution_combo, self.fps_spin, self.profile_combo,
+            self.intermediate_check, self.workers_spin, self.streaming_check
+        ]
+        for widget in widgets:
+            widget.blockSignals(True)
+        try:
+            output = self.project.output
+            self.resolution_combo.setCurrentIndex(0 if output.resolution == "1080x1920" else 1)
+            self.fps_spin.setValue(output.fps)
+            profile_index = self.profile_combo.findData(output.profile.name)
+            self.profile_combo.setCurrentIndex(profile_index if profile_index >= 0 else 1)
+            self.intermediate_check.setChecked(output.profile.intermediate)
+            self.workers_spin.setValue(self.project.settings.render_workers)
+            self.streaming_check.setChecked(self.project.settings.streaming_export)
+        finally:
+            for widget in widgets:
+                widget.blockSignals(False)
+
+    def apply_render_settings(self, project: Project):
+        """
+        書き出しパネルのレンダリング設定（出力先以外）をプロジェクトに反映
+
+        Args:
+            project: 反映先（書き出し時は self.project、予測ではそのコピー）
+        """
         resolution_text = self.resolution_combo.currentText()
         if "1080x1920" in resolution_text:
-            self.project.output.resolution = "1080x1920"
+            project.output.resolution = "1080x1920"
         else:
-            self.project.output.resolution = "1920x1080"
+            project.output.resolution = "1920x1080"
 
-        self.project.output.fps = self.fps_spin.value()
-        self.project.output.output_path = output_path
+        project.output.fps = self.fps_spin.value()
+        project.settings.render_workers = self.workers_spin.value()
+        project.settings.streaming_export = self.streaming_check.isChecked()
+
+        # プロファイル（同名ならプロジェクト側のカスタマイズを保持）
+        profile_name = self.profile_combo.currentData()
+        if project.output.profile.name != profile_name:
+            project.output.profile = get_encoding_profile(profile_name)
+        project.output.profile.intermediate = self.intermediate_check.isChecked()
 
-        # 生成スレッド開始
+    def start_generation(self, resume: bool = False):
+        """
+        動画生成スレッドを開始
+
+        Args:
+            resume: 前回失敗した書き出しから再開するか
+        """
         self.generation_thread = VideoGenerationThread(
             self.project,
             self.voicevox,
             self.audio_cache,
             self.ffmpeg,
-            self.speaker_id
+            self.speaker_id,
+            clip_cache=self.clip_cache,
+            proxy_cache=self.proxy_cache,
+            resume=resume,
+            history=self.render_history
         )
 
         self.generation_thread.progress.connect(self.log)
+        self.generation_thread.progress_event.connect(self.on_generation_progress)
         self.generation_thread.finished.connect(self.on_generation_finished)
 
         self.progress_bar.setVisible(True)
-        self.progress_bar.setRange(0, 0)  # Indeterminate
+        self.progress_bar.setRange(0, 0)  # 最初の進捗が届くまでは不確定表示
+        self.cancel_btn.setEnabled(True)
+        self.resume_btn.setEnabled(False)
 
         self.log("動画生成を開始します...")
         self.generation_thread.start()
 
+    def on_generation_progress(self, progress: RenderProgress):
+        """動画生成の進捗を表示"""
+        if self.progress_bar.maximum() == 0:
+            self.progress_bar.setRange(0, 1000)
+        self.progress_bar.setValue(int(progress.percent * 10))
+
+        if progress.stage == "concat":
+            stage_text = "結合中"
+        else:
+            stage_text = f"シーン {progress.completed_scenes}/{progress.scene_count}"
+        self.progress_bar.setFormat(
+            f"{progress.percent:.0f}%  {stage_text}  残り {progress.format_eta()}"
+        )
+
+    def cancel_export(self):
+        """書き出しを中止"""
+        if self.generation_thread and self.generation_thread.isRunning():
+            self.cancel_btn.setEnabled(False)
+            self.generation_thread.cancel()
+
     def on_generation_finished(self, success: bool, message: str):
         """動画生成完了時"""
         self.progress_bar.setVisible(False)
+        self.cancel_btn.setEnabled(False)
         self.log(message)
+        self.update_resume_button()
+        self.update_render_estimate()
 
         if success:
             QMessageBox.information(self, "完了", message)
@@ -1203,8 +1373,10 @@ class ProjectWindow(QMainWindow):
         if reply == QMessageBox.Yes:
             self.project = Project()
             self.current_scene = None
+            self.load_render_settings()
             self.load_scene_list()
             self.update_window_title()
+            self.update_resume_button()
             self.log("新規プロジェクトを作成しました")
 
     def open_project(self):
@@ -1222,8 +1394,10 @@ class ProjectWindow(QMainWindow):
         try:
             self.project = Project(file_path)
             self.current_scene = None
+            self.load_render_settings()
             self.load_scene_list()
             self.update_window_title()
+            self.update_resume_button()
             self.log(f"プロジェクトを開きました: {Path(file_path).name}")
         except Exception as e:
             QMessageBox.warning(self, "エラー", f"プロジェクトを開けませんでした:\n{e}")
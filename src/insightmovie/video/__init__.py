@@ -2,13 +2,49 @@
 Video Generation Module
 動画生成モジュール
 """
-from .ffmpeg_wrapper import FFmpegWrapper, FFmpegNotFoundError
+from .ffmpeg_wrapper import (
+    FFmpegWrapper, FFmpegNotFoundError, FFmpegCancelledError, FFmpegProgress, FFmpegCapabilities,
+    FFmpegResult, set_async_concurrency
+)
 from .scene_generator import SceneGenerator
 from .video_composer import VideoComposer
+from .probe_cache import MediaProbeCache
+from .clip_cache import SceneClipCache
+from .proxy_cache import MediaProxyCache
+from .encoder_policy import EncoderPolicy, VideoEncoder
+from .streaming_muxer import StreamingMuxer, SegmentSpool
+from .render_progress import RenderProgress, RenderProgressTracker
+from .workspace import RenderWorkspace
+from .job_manifest import JobManifest
+from .render_job import RenderJob, compute_worker_count
+from .render_history import RenderHistory
+from .render_estimator import RenderEstimator, RenderEstimate, SceneEstimate
 
 __all__ = [
     'FFmpegWrapper',
     'FFmpegNotFoundError',
+    'FFmpegCancelledError',
+    'FFmpegProgress',
+    'FFmpegCapabilities',
+    'FFmpegResult',
+    'set_async_concurrency',
     'SceneGenerator',
     'VideoComposer',
+    'MediaProbeCache',
+    'SceneClipCache',
+    'MediaProxyCache',
+    'EncoderPolicy',
+    'VideoEncoder',
+    'StreamingMuxer',
+    'SegmentSpool',
+    'RenderProgress',
+    'RenderProgressTracker',
+    'RenderWorkspace',
+    'JobManifest',
+    'RenderJob',
+    'compute_worker_count',
+    'RenderHistory',
+    'RenderEstimator',
+    'RenderEstimate',
+    'SceneEstimate',
 ]
@@ -0,0 +1,117 @@
+"""
+ASS Subtitle
+libass（ass フィルター）で字幕を描画するためのASSファイル生成（drawtext のないビルド向け）
+"""
+import re
+import struct
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional
+
+
+# libass が改行・空白の指定（\N, \n, \h）として読む組み合わせ
+OVERRIDE_ESCAPE_PATTERN = re.compile(r'\\(?=[Nnh])')
+
+# 表示されない結合文字（"\" の直後に置き、指定として読まれないようにする）
+WORD_JOINER = '\u2060'
+
+
+@lru_cache(maxsize=16)
+def font_family_name(font_path: str) -> Optional[str]:
+    """
+    フォントファイル（TTF/OTF/TTC）のファミリー名を取得
+
+    libass はフォントをファイルではなくファミリー名で選ぶため、name テーブルの
+    nameID 1 を読む（TTCは最初のフォント、英語名を優先）。
+
+    Args:
+        font_path: フォントファイルパス
+
+    Returns:
+        ファミリー名、読めない場合はNone
+    """
+    try:
+        data = Path(font_path).read_bytes()
+
+        offset = 0
+        if data[:4] == b'ttcf':
+            offset = struct.unpack('>I', data[12:16])[0]
+
+        num_tables = struct.unpack('>H', data[offset + 4:offset + 6])[0]
+        name_offset = None
+        for i in range(num_tables):
+            record = offset + 12 + 16 * i
+            if data[record:record + 4] == b'name':
+                name_offset = struct.unpack('>I', data[record + 8:record + 12])[0]
+                break
+        if name_offset is None:
+            return None
+
+        _, count, strings_offset = struct.unpack('>HHH', data[name_offset:name_offset + 6])
+        candidates = []
+        for i in range(count):
+            record = name_offset + 6 + 12 * i
+            platform_id, _, language_id, name_id, length, string_offset = struct.unpack(
+                '>HHHHHH', data[record:record + 12]
+            )
+            if name_id != 1:
+                continue
+            start = name_offset + strings_offset + string_offset
+            raw = data[start:start + length]
+            if platform_id == 3:
+                # Windows（UTF-16BE）：英語名を最優先
+                candidates.append((0 if language_id == 0x409 else 1, raw.decode('utf-16-be', errors='replace')))
+            elif platform_id == 1:
+                candidates.append((2, raw.decode('latin-1')))
+        if not candidates:
+            return None
+        return min(candidates, key=lambda candidate: candidate[0])[1]
+    except (OSError, struct.error, IndexError):
+        return None
+
+
+def build_ass_script(
+    lines: List[str],
+    width: int,
+    height: int,
+    center_y: int,
+    font_size: int,
+    font_name: Optional[str]
+) -> str:
+    """
+    1つの字幕をシーン全体に表示するASSを作成
+
+    Args:
+        lines: 字幕の各行
+        width, height: 解像度（ASSの座標系をピクセルに合わせる）
+        center_y: 字幕の中心のy座標
+        font_size: フォントサイズ（ピクセル）
+        font_name: フォントのファミリー名（Noneならlibassの既定）
+
+    Returns:
+        ASSファイルの内容
+    """
+    # libass に "\\" のエスケープはないため、"\" はそのまま残し、\N などとして
+    # 読まれる組み合わせだけ区切る。{} はエスケープし、行は \N でつなぐ
+    escaped = '\\N'.join(
+        OVERRIDE_ESCAPE_PATTERN.sub(lambda match: '\\' + WORD_JOINER, line)
+        .replace('{', '\\{').replace('}', '\\}')
+        for line in lines
+    )
+    return (
+        "[Script Info]\n"
+        "ScriptType: v4.00+\n"
+        f"PlayResX: {width}\n"
+        f"PlayResY: {height}\n"
+        "WrapStyle: 2\n"
+        "\n"
+        "[V4+ Styles]\n"
+        "Format: Name, Fontname, Fontsize, PrimaryColour, OutlineColour, BackColour, "
+        "BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV\n"
+        f"Style: Default,{font_name or 'sans-serif'},{font_size},"
+        "&H00FFFFFF,&H00000000,&H00000000,1,0,0,5,0,0,0\n"
+        "\n"
+        "[Events]\n"
+        "Format: Layer, Start, End, Style, Text\n"
+        f"Dialogue: 0,0:00:00.00,9:59:59.99,Default,{{\\pos({width // 2},{center_y})}}{escaped}\n"
+    )
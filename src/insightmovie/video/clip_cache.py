@@ -0,0 +1,372 @@
+"""
+Scene Clip Cache
+シーン動画キャッシュ（内容ベースのフィンガープリントで再利用）
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Collection, Dict, Iterable, Optional, Tuple
+
+from ..project import Scene
+
+
+# 先頭・末尾からハッシュを取るバイト数（大きな動画を全読みしないため）
+SAMPLE_BYTES = 1024 * 1024
+
+# シーン生成処理の出力が変わる変更を入れたら上げる
+CLIP_FORMAT_VERSION = 2
+
+# キャッシュ全体の上限サイズ（デフォルト 4GB）
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024 * 1024
+
+# この時間更新されていない一時ファイルは、異常終了した書き出しの残りとみなす（秒）
+STALE_TEMP_SECONDS = 60 * 60
+
+
+_identity_lock = threading.Lock()
+_identity_memo: Dict[Tuple[str, int, int], str] = {}
+
+
+def file_identity(path: Optional[str]) -> Optional[dict]:
+    """
+    ファイルの同一性情報を取得（サイズ・更新時刻・内容ハッシュ）
+
+    内容ハッシュは先頭と末尾 SAMPLE_BYTES ずつから計算し、
+    (パス, サイズ, 更新時刻) が同じ間はプロセス内で再計算しない。
+
+    Args:
+        path: ファイルパス
+
+    Returns:
+        同一性情報の辞書、ファイルがない場合はNone
+    """
+    if not path:
+        return None
+
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    memo_key = (str(Path(path).absolute()), stat.st_size, stat.st_mtime_ns)
+    with _identity_lock:
+        digest = _identity_memo.get(memo_key)
+
+    if digest is None:
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            sha.update(f.read(SAMPLE_BYTES))
+            if stat.st_size > SAMPLE_BYTES * 2:
+                f.seek(-SAMPLE_BYTES, os.SEEK_END)
+                sha.update(f.read(SAMPLE_BYTES))
+            elif stat.st_size > SAMPLE_BYTES:
+                sha.update(f.read())
+        digest = sha.hexdigest()
+        with _identity_lock:
+            _identity_memo[memo_key] = digest
+
+    return {
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'hash': digest,
+    }
+
+
+def evict_oldest(cache_dir: Path, max_bytes: int, keep: Collection[Path] = ()):
+    """
+    キャッシュが上限サイズを超えた分を、最後に使われた時刻（更新時刻）が古い順に削除
+
+    生成中の一時ファイル（名前に .tmp を含む）は対象にしない。
+
+    Args:
+        cache_dir: キャッシュディレクトリ
+        max_bytes: キャッシュ全体の上限サイズ
+        keep: 削除しないファイル（直前に生成したもの・書き出し中のジョブが使うもの）
+    """
+    entries = []
+    for path in cache_dir.iterdir():
+        if ".tmp" in path.name or not path.is_file():
+            continue
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries, key=lambda e: e[0]):
+        if total <= max_bytes:
+            break
+        if path in keep:
+            continue
+        try:
+            path.unlink()
+            total -= size
+        except OSError:
+            pass
+
+
+def remove_stale_temp(cache_dir: Path, max_age: float = STALE_TEMP_SECONDS) -> int:
+    """
+    異常終了した書き出しが残した一時ファイル（名前に .tmp を含む）を削除
+
+    生成中のファイルは書き込みのたびに更新時刻が進むため、max_age 以上
+    更新されていないものだけを対象にする。
+
+    Args:
+        cache_dir: キャッシュディレクトリ
+        max_age: 残りとみなすまでの時間（秒）
+
+    Returns:
+        削除したファイル数
+    """
+    removed = 0
+    threshold = time.time() - max_age
+    for path in cache_dir.iterdir():
+        if ".tmp" not in path.name:
+            continue
+        try:
+            if path.is_file() and path.stat().st_mtime < threshold:
+                path.unlink()
+                removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+class SceneClipCache:
+    """シーン動画キャッシュ管理クラス"""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            cache_dir: キャッシュディレクトリ（Noneなら一時ディレクトリ）
+            max_bytes: キャッシュ全体の上限サイズ（超えたら古いものから削除）
+        """
+        self.max_bytes = max_bytes
+
+        if cache_dir:
+            self.cache_dir = Path(cache_dir)
+        else:
+            import tempfile
+            self.cache_dir = Path(tempfile.gettempdir()) / "insightmovie_cache" / "clips"
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # 書き出し中のジョブが使うシーン動画 → pin された回数（削除の対象にしない）
+        self._pins: Dict[Path, int] = {}
+
+        # 上限が下がっている場合に備えて起動時にも整理
+        remove_stale_temp(self.cache_dir)
+        self._evict()
+
+    @staticmethod
+    def get_fingerprint(
+        scene: Scene,
+        duration: float,
+        resolution: str,
+        fps: int,
+        audio_path: Optional[str],
+        font_path: Optional[str],
+        encoder_settings: dict
+    ) -> str:
+        """
+        シーン動画のフィンガープリントを生成
+
+        出力に影響するすべての入力（メディア・字幕・会話音声・長さ・
+        解像度・fps・フォント・エンコード設定）を含める。
+
+        Args:
+            scene: シーンデータ
+            duration: シーンの長さ（秒）
+            resolution: 解像度 "WxH"
+            fps: フレームレート
+            audio_path: 会話音声ファイルパス（Noneなら無音）
+            font_path: 字幕用フォントパス
+            encoder_settings: SceneGenerator.encoder_settings() の値
+
+        Returns:
+            フィンガープリント（ハッシュ値）
+        """
+        content = {
+            'version': CLIP_FORMAT_VERSION,
+            'media_type': scene.media_type.value,
+            'media': file_identity(scene.media_path) if scene.has_media else None,
+            'keep_original_audio': scene.keep_original_audio,
+            'subtitle': scene.subtitle_text if scene.has_subtitle else "",
+            'audio': file_identity(audio_path),
+            'duration': round(duration, 3),
+            'resolution': resolution,
+            'fps': fps,
+            'font': file_identity(font_path) if scene.has_subtitle else None,
+            'encoder': encoder_settings,
+        }
+        serialized = json.dumps(content, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+    def get_clip_path(self, fingerprint: str, suffix: str = ".mp4") -> Path:
+        """
+        キャッシュ動画のパスを取得
+
+        Args:
+            fingerprint: フィンガープリント
+            suffix: 拡張子（SceneGenerator.clip_suffix）
+
+        Returns:
+            キャッシュファイルパス
+        """
+        return self.cache_dir / f"{fingerprint}{suffix}"
+
+    def get_temp_path(self, fingerprint: str, suffix: str = ".mp4") -> Path:
+        """
+        キャッシュディレクトリ内の一時ファイルのパスを取得
+
+        Args:
+            fingerprint: フィンガープリント
+            suffix: 拡張子（SceneGenerator.clip_suffix）
+
+        Returns:
+            一時ファイルパス（別のドライブからコピーする場合の書き込み先）
+        """
+        return self.cache_dir / f"{fingerprint}.{threading.get_ident()}.tmp{suffix}"
+
+    def lookup(self, fingerprint: str, suffix: str = ".mp4", pin: bool = False) -> Optional[str]:
+        """
+        キャッシュ済み動画を検索
+
+        Args:
+            fingerprint: フィンガープリント
+            suffix: 拡張子（SceneGenerator.clip_suffix）
+            pin: 見つかった動画を unpin() まで削除の対象から外すか
+
+        Returns:
+            キャッシュファイルパス、存在しない場合はNone
+        """
+        clip_path = self.get_clip_path(fingerprint, suffix)
+        with self._lock:
+            try:
+                if clip_path.stat().st_size > 0:
+                    # 最近使ったものとして更新時刻を進める（LRU）
+                    os.utime(clip_path)
+                    if pin:
+                        self._add_pin(clip_path)
+                    return str(clip_path)
+            except OSError:
+                pass
+        return None
+
+    def contains(self, fingerprint: str, suffix: str = ".mp4") -> bool:
+        """
+        キャッシュ済み動画があるかを確認（lookup() と違い、最後に使われた時刻は進めない）
+
+        Args:
+            fingerprint: フィンガープリント
+            suffix: 拡張子（SceneGenerator.clip_suffix）
+
+        Returns:
+            再利用できる動画があればTrue
+        """
+        try:
+            return self.get_clip_path(fingerprint, suffix).stat().st_size > 0
+        except OSError:
+            return False
+
+    def commit(self, fingerprint: str, temp_path: str, suffix: str = ".mp4", pin: bool = False) -> str:
+        """
+        生成した動画をキャッシュに移して確定
+
+        Args:
+            fingerprint: フィンガープリント
+            temp_path: 生成した動画（書き出しジョブの作業ディレクトリ内など）
+            suffix: 拡張子（SceneGenerator.clip_suffix）
+            pin: 確定した動画を unpin() まで削除の対象から外すか
+
+        Returns:
+            キャッシュファイルパス
+        """
+        clip_path = self.get_clip_path(fingerprint, suffix)
+        if pin:
+            # 置き換えた直後に他のジョブの整理で消されないよう、先に pin しておく
+            self.pin(str(clip_path))
+        try:
+            try:
+                os.replace(temp_path, clip_path)
+            except OSError:
+                # 作業ディレクトリが別のドライブにある場合は、一時ファイルにコピーしてから置き換える
+                staging_path = self.get_temp_path(fingerprint, suffix)
+                try:
+                    shutil.copyfile(temp_path, staging_path)
+                    os.replace(staging_path, clip_path)
+                finally:
+                    staging_path.unlink(missing_ok=True)
+                os.unlink(temp_path)
+        except BaseException:
+            if pin:
+                self.unpin([str(clip_path)])
+            raise
+        self._evict(keep=clip_path)
+        return str(clip_path)
+
+    def pin(self, clip_path: str):
+        """
+        シーン動画を unpin() まで削除の対象から外す
+
+        書き出しジョブが結合を終えるまで、使うシーン動画を残すために使う
+        （キャッシュ外のパスを渡しても何もしない）。
+
+        Args:
+            clip_path: シーン動画のパス
+        """
+        with self._lock:
+            self._add_pin(Path(clip_path))
+
+    def _add_pin(self, clip_path: Path):
+        """pin の回数を増やす（_lock を保持して呼ぶ）"""
+        self._pins[clip_path] = self._pins.get(clip_path, 0) + 1
+
+    def unpin(self, clip_paths: Iterable[str]):
+        """
+        pin() / lookup() / commit() で pin したシーン動画を削除の対象に戻す
+
+        書き出しジョブが結合を終えた後に呼ぶ。上限を超えていればここで整理する。
+
+        Args:
+            clip_paths: pin したシーン動画のパス（pin した回数分）
+        """
+        with self._lock:
+            for clip_path in map(Path, clip_paths):
+                count = self._pins.get(clip_path, 0) - 1
+                if count > 0:
+                    self._pins[clip_path] = count
+                else:
+                    self._pins.pop(clip_path, None)
+        self._evict()
+
+    def _evict(self, keep: Optional[Path] = None):
+        """
+        上限サイズを超えた分を、最後に使われた時刻が古い順に削除（pin 中のものは残す）
+
+        Args:
+            keep: 削除しないファイル（直前に確定したもの）
+        """
+        with self._lock:
+            protected = set(self._pins)
+            if keep is not None:
+                protected.add(keep)
+            evict_oldest(self.cache_dir, self.max_bytes, protected)
+
+    @property
+    def total_bytes(self) -> int:
+        """キャッシュの合計サイズ"""
+        return sum(p.stat().st_size for p in self.cache_dir.iterdir() if p.is_file())
+
+    def clear_cache(self):
+        """すべてのキャッシュを削除"""
+        for cache_file in self.cache_dir.iterdir():
+            if cache_file.is_file():
+                cache_file.unlink()
@@ -0,0 +1,153 @@
+"""
+Encoder Policy
+使用するエンコーダー・字幕描画方法の選択（ffmpegのビルドごとの対応機能から決定）
+"""
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .ffmpeg_wrapper import FFmpegCapabilities
+from ..project import EncodingProfile
+
+
+# 字幕の描画方法
+SUBTITLE_DRAWTEXT = "drawtext"  # drawbox + drawtext（従来）
+SUBTITLE_ASS = "ass"  # drawbox + libass（drawtext のないビルド向け）
+
+
+@dataclass(frozen=True)
+class VideoEncoder:
+    """映像エンコーダーの定義"""
+    name: str  # ffmpegのエンコーダー名
+    codec: str  # 出力のコーデック名（ストリームコピー可否の判定用）
+    supports_tune: bool = False  # -tune（stillimage など）が使えるか
+
+    def args(self, profile: EncodingProfile, tune: Optional[str] = None) -> List[str]:
+        """
+        プロファイルの品質・速度に相当する引数
+
+        Args:
+            profile: エンコードプロファイル（x264の preset / crf を基準に読み替える）
+            tune: プロファイルの tune の代わりに使う値（対応していなければ無視）
+
+        Returns:
+            ffmpeg引数リスト（-c:v と -pix_fmt を含む）
+        """
+        args = ["-c:v", self.name, "-pix_fmt", "yuv420p"]
+        if self.name == "libx264":
+            args.extend(["-preset", profile.preset, "-crf", str(profile.crf)])
+        elif self.name == "libx265":
+            # 同程度の画質になる crf は x264 より約5高い
+            args.extend(["-preset", profile.preset, "-crf", str(min(51, profile.crf + 5)), "-tag:v", "hvc1"])
+        elif self.name == "libopenh264":
+            # CRFがないため、crf から 1080p 相当のビットレートに読み替える（crf 6 ごとに半分）
+            bitrate_kbps = int(6000 * 2 ** ((23 - profile.crf) / 6))
+            args.extend(["-b:v", f"{bitrate_kbps}k"])
+        else:
+            # mpeg4 など：crf を量子化スケール（2〜31）に読み替える
+            args.extend(["-q:v", str(max(2, min(31, round((profile.crf - 5) / 4.5))))])
+
+        tune = tune or profile.tune
+        if tune and self.supports_tune:
+            args.extend(["-tune", tune])
+        return args
+
+    def lossless_args(self) -> Optional[List[str]]:
+        """
+        可逆・最速で符号化する引数（中間コーデック用）
+
+        Returns:
+            ffmpeg引数リスト、可逆に対応していなければNone
+        """
+        if self.name == "libx264":
+            return ["-c:v", "libx264", "-preset", "ultrafast", "-qp", "0", "-pix_fmt", "yuv420p"]
+        if self.name == "libx265":
+            return ["-c:v", "libx265", "-preset", "ultrafast", "-x265-params", "lossless=1", "-pix_fmt", "yuv420p"]
+        return None
+
+
+# 速度と画質のバランスがよい順（どれもなければ最後のものを使う）
+VIDEO_ENCODERS = [
+    VideoEncoder("libx264", "h264", supports_tune=True),
+    VideoEncoder("libopenh264", "h264"),
+    VideoEncoder("libx265", "hevc"),
+    VideoEncoder("mpeg4", "mpeg4"),
+]
+
+# 中間コーデックの最後の候補（ffmpeg組み込みの可逆コーデック、.mov に格納できる）
+FALLBACK_LOSSLESS_ARGS = ["-c:v", "utvideo", "-pix_fmt", "yuv420p"]
+
+
+class EncoderPolicy:
+    """
+    エンコーダー・字幕描画方法の選択
+
+    ffmpegの対応機能から、映像エンコーダー（libx264 → libopenh264 →
+    libx265 → mpeg4 の順）と字幕の描画方法（drawtext → libass）を決める。
+    対応機能が分からない場合は従来どおり libx264 と drawtext を使う。
+    """
+
+    def __init__(self, capabilities: Optional[FFmpegCapabilities] = None):
+        """
+        Args:
+            capabilities: ffmpegの対応機能（Noneなら従来の設定）
+        """
+        self.capabilities = capabilities
+        known = bool(capabilities and capabilities.encoders)
+
+        self.video_encoder = VIDEO_ENCODERS[0]
+        if known:
+            self.video_encoder = next(
+                (encoder for encoder in VIDEO_ENCODERS if capabilities.has_encoder(encoder.name)),
+                VIDEO_ENCODERS[-1]
+            )
+
+        self.subtitle_renderer: Optional[str] = SUBTITLE_DRAWTEXT
+        if capabilities and capabilities.filters and not capabilities.has_filter("drawtext"):
+            self.subtitle_renderer = SUBTITLE_ASS if capabilities.has_filter("ass") else None
+
+    def video_args(self, profile: EncodingProfile, tune: Optional[str] = None) -> List[str]:
+        """
+        選択したエンコーダーでプロファイルの品質・速度に相当する引数
+
+        Args:
+            profile: エンコードプロファイル
+            tune: プロファイルの tune の代わりに使う値
+
+        Returns:
+            ffmpeg引数リスト
+        """
+        return self.video_encoder.args(profile, tune)
+
+    def lossless_video_args(self) -> List[str]:
+        """
+        中間コーデック（可逆・最速）の引数
+
+        Returns:
+            ffmpeg引数リスト（x264/x265 の可逆、どちらもなければ utvideo）
+        """
+        args = self.video_encoder.lossless_args()
+        if args:
+            return args
+        for encoder in VIDEO_ENCODERS:
+            if self.capabilities and self.capabilities.has_encoder(encoder.name) and encoder.lossless_args():
+                return encoder.lossless_args()
+        return list(FALLBACK_LOSSLESS_ARGS)
+
+    def supports_tune(self, lossless: bool = False) -> bool:
+        """
+        -tune（stillimage など）が使えるか
+
+        Args:
+            lossless: 中間コーデックで符号化する場合
+
+        Returns:
+            使えるならTrue（x264のみ）
+        """
+        if lossless:
+            return self.lossless_video_args()[1] == "libx264"
+        return self.video_encoder.supports_tune
+
+    def describe(self) -> str:
+        """選択結果を表示用の文字列にする"""
+        subtitle = self.subtitle_renderer or "なし（字幕を描画できません）"
+        return f"エンコーダー: {self.video_encoder.name} / 字幕: {subtitle}"
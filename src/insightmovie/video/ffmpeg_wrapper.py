@@ -2,11 +2,25 @@
 FFmpeg Wrapper
 ffmpeg ラッパー
 """
+import asyncio
+import json
+import os
+import re
 import subprocess
 import shutil
 import sys
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, List
+from typing import Callable, Dict, Iterator, Optional, List, Set, Tuple
+
+import psutil
+
+from .probe_cache import MediaProbeCache
 
 # Windowsでコンソールウィンドウを非表示にするフラグ
 if sys.platform == 'win32':
@@ -20,13 +34,412 @@ class FFmpegNotFoundError(Exception):
     pass
 
 
+class FFmpegCancelledError(Exception):
+    """cancel() 後にffmpegを起動しようとしたエラー"""
+    pass
+
+
+# -progress で出力されるキー（これ以外の行は通常のエラー出力として扱う）
+PROGRESS_KEYS = {
+    'frame', 'fps', 'bitrate', 'total_size', 'out_time_us', 'out_time_ms', 'out_time',
+    'dup_frames', 'drop_frames', 'speed', 'progress',
+}
+
+
+# 非同期API（*_async）で同時に実行するffmpegの上限（イベントループごとに共有）
+_async_limit = max(1, (os.cpu_count() or 1) // 2)
+_async_semaphores: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]' = \
+    weakref.WeakKeyDictionary()
+
+
+def set_async_concurrency(limit: int):
+    """
+    非同期APIで同時に実行するffmpegの数を設定
+
+    すでにffmpegを実行したイベントループには反映されないため、
+    バッチ処理の開始前に呼ぶ。
+
+    Args:
+        limit: 同時実行数（1以上）
+    """
+    global _async_limit
+    _async_limit = max(1, limit)
+
+
+def _async_semaphore() -> asyncio.Semaphore:
+    """実行中のイベントループで共有するセマフォを取得"""
+    loop = asyncio.get_running_loop()
+    semaphore = _async_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(_async_limit)
+        _async_semaphores[loop] = semaphore
+    return semaphore
+
+
+@dataclass
+class FFmpegProgress:
+    """ffmpegの進捗（-progress の1ブロック分）"""
+    frame: int = 0
+    fps: float = 0.0
+    out_time: float = 0.0  # 出力済みの長さ（秒）
+    speed: float = 0.0  # 実時間に対するエンコード速度（倍）
+    done: bool = False  # 最後のブロック（progress=end）か
+
+    @classmethod
+    def from_fields(cls, fields: Dict[str, str]) -> 'FFmpegProgress':
+        """
+        -progress の key=value から作成
+
+        Args:
+            fields: 1ブロック分の key=value
+
+        Returns:
+            FFmpegProgress（値がない・"N/A" の項目は0）
+        """
+        def number(key: str, cast=float):
+            try:
+                return cast(fields.get(key, '0').rstrip('x'))
+            except ValueError:
+                return cast(0)
+
+        # out_time_ms も実際はマイクロ秒
+        out_time_us = number('out_time_us', int) or number('out_time_ms', int)
+        return cls(
+            frame=number('frame', int),
+            fps=number('fps'),
+            out_time=max(0.0, out_time_us / 1_000_000),
+            speed=number('speed'),
+            done=fields.get('progress') == 'end',
+        )
+
+
+# Config に保存する検出結果の形式を変えたら上げる
+FFMPEG_CACHE_FORMAT = 1
+
+
+@dataclass
+class FFmpegCapabilities:
+    """ffmpegのバージョンと対応機能（エンコーダー・フィルター・ハードウェアアクセラレーション）"""
+    version: str = ""  # ffmpeg -version の1行目
+    encoders: List[str] = field(default_factory=list)
+    filters: List[str] = field(default_factory=list)
+    hwaccels: List[str] = field(default_factory=list)
+
+    def has_encoder(self, name: str) -> bool:
+        """エンコーダーが使えるか"""
+        return name in self.encoders
+
+    def has_filter(self, name: str) -> bool:
+        """フィルターが使えるか"""
+        return name in self.filters
+
+    def to_dict(self) -> dict:
+        """辞書に変換"""
+        return {
+            'version': self.version,
+            'encoders': self.encoders,
+            'filters': self.filters,
+            'hwaccels': self.hwaccels,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'FFmpegCapabilities':
+        """辞書から作成"""
+        return cls(
+            version=data.get('version', ""),
+            encoders=list(data.get('encoders', [])),
+            filters=list(data.get('filters', [])),
+            hwaccels=list(data.get('hwaccels', [])),
+        )
+
+
+# 書き出しの処理段階（FFmpegResult.step、どこに時間がかかっているかの集計用）
+STEP_SCALE = "scale"  # メディアの縮小・切り出し（基本動画の生成）
+STEP_SUBTITLE = "subtitle"  # 字幕の焼き込み
+STEP_MUX = "mux"  # 音声の合成・多重化
+STEP_SINGLE_PASS = "single_pass"  # 1パス生成（縮小・字幕・音声をまとめて）
+STEP_STREAM_COPY = "stream_copy"  # ストリームコピーでの切り出し・読み出し
+STEP_PROXY = "proxy"  # 縮小済みメディアの作成
+STEP_CONCAT = "concat"  # 結合・最終エンコード
+
+STEP_LABELS = {
+    STEP_SCALE: "縮小・切り出し",
+    STEP_SUBTITLE: "字幕焼き込み",
+    STEP_MUX: "音声合成・多重化",
+    STEP_SINGLE_PASS: "1パス生成",
+    STEP_STREAM_COPY: "ストリームコピー",
+    STEP_PROXY: "プロキシ作成",
+    STEP_CONCAT: "結合・最終エンコード",
+}
+
+# 実行結果に残すエラー出力の末尾の行数
+STDERR_TAIL_LINES = 64
+
+# 非同期実行でCPU時間・メモリ使用量を読む間隔（秒）
+USAGE_SAMPLE_INTERVAL = 0.2
+
+# run_to_pipe() で標準出力を読んで渡す単位（バイト）
+PIPE_CHUNK_BYTES = 64 * 1024
+
+# 改行のない出力をためる上限（超えた分は行として区切る）
+MAX_LINE_BYTES = 4096
+
+# エラーの原因の手がかりにならない行（統計表示・操作案内・バナー）
+NOISE_LINE_PATTERN = re.compile(
+    r'^(?:(?:frame|size)=.*\btime=|Press \[q\]|ffmpeg version |\s+(?:built with|configuration:|lib\w+\s+\d+\.))'
+)
+
+
+class StderrTail:
+    """
+    ffmpegのエラー出力の末尾だけを保持するリングバッファ
+
+    統計表示などエラーの手がかりにならない行は捨て、残りも最後の
+    STDERR_TAIL_LINES 行だけを保持する（長時間の書き出しでもメモリが増えない）。
+    """
+
+    def __init__(self, max_lines: int = STDERR_TAIL_LINES):
+        """
+        Args:
+            max_lines: 保持する行数
+        """
+        self._lines: deque = deque(maxlen=max_lines)
+        self.dropped = 0  # 古い順に捨てた行数（統計表示などは数えない）
+
+    def add(self, line: str) -> bool:
+        """
+        1行を追加
+
+        Args:
+            line: エラー出力の1行
+
+        Returns:
+            保持したらTrue（エラーの手がかりにならない行はFalse）
+        """
+        if NOISE_LINE_PATTERN.match(line):
+            return False
+        if len(self._lines) == self._lines.maxlen:
+            self.dropped += 1
+        self._lines.append(line)
+        return True
+
+    def __bool__(self) -> bool:
+        return bool(self._lines)
+
+    def text(self) -> str:
+        """保持している行（捨てた行があれば先頭にその行数）"""
+        lines = list(self._lines)
+        if self.dropped:
+            lines.insert(0, f"...（{self.dropped}行省略）")
+        return '\n'.join(lines)
+
+
+def split_output(buffer: bytes, chunk: bytes) -> Tuple[List[str], bytes]:
+    """
+    読み込んだ出力を行に分割（ffmpegの進捗表示の \\r も行の区切りとする）
+
+    改行のないまま MAX_LINE_BYTES を超えた分も1行として区切り、
+    行の途中をためこみ続けないようにする。
+
+    Args:
+        buffer: 前回までの行の途中
+        chunk: 新たに読み込んだデータ
+
+    Returns:
+        (空行を除いた行のリスト, 次に持ち越す行の途中)
+    """
+    *raw_lines, buffer = re.split(rb'[\r\n]', buffer + chunk)
+    while len(buffer) > MAX_LINE_BYTES:
+        raw_lines.append(buffer[:MAX_LINE_BYTES])
+        buffer = buffer[MAX_LINE_BYTES:]
+    lines = [raw_line.decode('utf-8', errors='replace').rstrip() for raw_line in raw_lines]
+    return [line for line in lines if line], buffer
+
+
+def read_lines(stream, on_line: Callable[[str], None]):
+    """
+    出力を少しずつ読みながら1行ずつ通知（出力全体はメモリに持たない）
+
+    Args:
+        stream: 読み込むストリーム（バイナリ、パイプ）
+        on_line: 行の通知先
+    """
+    buffer = b''
+    while True:
+        chunk = stream.read1(65536)
+        if not chunk:
+            break
+        lines, buffer = split_output(buffer, chunk)
+        for line in lines:
+            on_line(line)
+    line = buffer.decode('utf-8', errors='replace').rstrip()
+    if line:
+        on_line(line)
+
+
+def _log_options(progress: bool, stats: bool = False) -> List[str]:
+    """
+    エラー出力を必要なものだけにするオプション
+
+    Args:
+        progress: -progress で進捗をエラー出力に書かせるか
+        stats: 統計表示（-stats）を残すか
+
+    Returns:
+        ffmpeg引数リスト（コマンドラインの先頭に入れる）
+    """
+    options = ["-hide_banner"]
+    if progress:
+        options.extend(["-progress", "pipe:2"])
+    if progress or not stats:
+        options.append("-nostats")
+    return options
+
+
+@dataclass
+class FFmpegResult:
+    """
+    ffmpeg 1回分の実行結果
+
+    成功したときだけ真になるため、従来の True/False と同じように判定できる。
+    CPU時間・最大メモリ使用量は取得できない環境ではNone。
+    非同期実行のメモリ使用量は実行中に定期的に読んだ値の最大で、実際の最大より小さいことがある。
+    """
+    argv: List[str]  # 実行したコマンドライン（ffmpegのパスを含む）
+    returncode: Optional[int] = None  # 終了コード（起動できなかった場合はNone）
+    wall_seconds: float = 0.0  # 実行時間（秒）
+    user_seconds: Optional[float] = None  # ユーザーCPU時間（秒）
+    system_seconds: Optional[float] = None  # システムCPU時間（秒）
+    peak_rss: Optional[int] = None  # 最大メモリ使用量（バイト）
+    peak_rss_sampled: bool = False  # peak_rss が定期的に読んだ値の最大か（表示は概算）
+    stderr_tail: str = ""  # エラー出力の末尾（進捗の行を除く）
+    step: str = ""  # 書き出しの処理段階（STEP_*）
+    cancelled: bool = False  # cancel() で終了させたか
+    timed_out: bool = False  # 制限時間を超えて終了させたか
+    stdout: Optional[bytes] = field(default=None, repr=False)  # 標準出力（run_to_bytes のデータ）
+
+    def __bool__(self) -> bool:
+        return self.returncode == 0 and not self.cancelled and not self.timed_out
+
+    @property
+    def cpu_seconds(self) -> Optional[float]:
+        """ユーザー + システムCPU時間（秒）"""
+        if self.user_seconds is None or self.system_seconds is None:
+            return None
+        return self.user_seconds + self.system_seconds
+
+    def summary(self) -> str:
+        """
+        表示用の1行の要約
+
+        Returns:
+            例: "字幕焼き込み: 1.23秒 / CPU 3.40秒 / 最大メモリ 120MB"
+        """
+        parts = [f"{STEP_LABELS.get(self.step, self.step or 'ffmpeg')}: {self.wall_seconds:.2f}秒"]
+        if self.cpu_seconds is not None:
+            parts.append(f"CPU {self.cpu_seconds:.2f}秒")
+        if self.peak_rss is not None:
+            approximate = "約" if self.peak_rss_sampled else ""
+            parts.append(f"最大メモリ {approximate}{self.peak_rss / (1024 * 1024):.0f}MB")
+        if not self:
+            parts.append("中止" if self.cancelled or self.timed_out else f"終了コード {self.returncode}")
+        return " / ".join(parts)
+
+
+def wait_with_usage(process: subprocess.Popen) -> Tuple[Optional[float], Optional[float], Optional[int]]:
+    """
+    プロセスの終了を待ち、CPU時間と最大メモリ使用量を取得
+
+    POSIXでは wait4 で回収して rusage を読む（process.returncode も設定する）。
+    それ以外では終了直前の値を psutil で読む。
+
+    Args:
+        process: 出力を読み終えたプロセス
+
+    Returns:
+        (ユーザーCPU秒, システムCPU秒, 最大メモリ使用量（バイト）)、取得できない値はNone
+    """
+    if hasattr(os, 'wait4'):
+        try:
+            _, status, usage = os.wait4(process.pid, 0)
+        except ChildProcessError:
+            # cancel() の poll() などで先に回収された
+            process.wait()
+            return None, None, None
+        process.returncode = os.waitstatus_to_exitcode(status)
+        # ru_maxrss は macOS ではバイト、Linux ではKB
+        scale = 1 if sys.platform == 'darwin' else 1024
+        return usage.ru_utime, usage.ru_stime, usage.ru_maxrss * scale
+
+    usage = sample_usage(process.pid)
+    process.wait()
+    return usage
+
+
+def sample_usage(pid: int) -> Tuple[Optional[float], Optional[float], Optional[int]]:
+    """
+    psutil でプロセスのCPU時間とメモリ使用量を読む
+
+    メモリは Windows では最大ワーキングセット、それ以外では読んだ時点のRSS
+    （最大値が必要な場合は実行中に繰り返し読む）。終了して回収待ちのプロセスでは
+    CPU時間だけが読める。
+
+    Args:
+        pid: プロセスID
+
+    Returns:
+        (ユーザーCPU秒, システムCPU秒, メモリ使用量（バイト）)、読めない場合はNone
+    """
+    try:
+        ps_process = psutil.Process(pid)
+        with ps_process.oneshot():
+            cpu_times = ps_process.cpu_times()
+            memory = ps_process.memory_info()
+    except psutil.Error:
+        return None, None, None
+    peak_rss = getattr(memory, 'peak_wset', None) or memory.rss or None
+    return cpu_times.user, cpu_times.system, peak_rss
+
+
+def _feed_progress_line(line: str, fields: Dict[str, str], callback: Callable[[FFmpegProgress], None]) -> bool:
+    """
+    -progress の行を取り込む（ブロックの終わりで callback を呼ぶ）
+
+    Args:
+        line: エラー出力の1行
+        fields: 読み込み中のブロック（ブロックの終わりで空にする）
+        callback: 進捗の通知先
+
+    Returns:
+        進捗の行ならTrue（それ以外は通常のエラー出力）
+    """
+    key, sep, value = line.partition('=')
+    if not sep or key not in PROGRESS_KEYS:
+        return False
+    fields[key] = value
+    if key == 'progress':
+        callback(FFmpegProgress.from_fields(fields))
+        fields.clear()
+    return True
+
+
 class FFmpegWrapper:
     """ffmpegラッパークラス"""
 
-    def __init__(self, ffmpeg_path: Optional[str] = None):
+    # cancel() で終了要求を送ってから強制終了するまでの猶予（秒）
+    TERMINATE_GRACE_SECONDS = 0.5
+
+    def __init__(
+        self,
+        ffmpeg_path: Optional[str] = None,
+        probe_cache: Optional[MediaProbeCache] = None,
+        capabilities: Optional[FFmpegCapabilities] = None
+    ):
         """
         Args:
             ffmpeg_path: ffmpegの実行パス（Noneなら自動検出）
+            probe_cache: メディア情報のキャッシュ（Noneなら一時ディレクトリに作成）
+            capabilities: 検出済みの対応機能（Noneなら最初に使うときに調べる）
         """
         self.ffmpeg_path = ffmpeg_path or self.find_ffmpeg()
         if not self.ffmpeg_path:
@@ -34,6 +447,82 @@ class FFmpegWrapper:
                 "ffmpegが見つかりません。インストールまたはパスを指定してください。"
             )
 
+        # ffprobe（なければ ffmpeg -i の出力から解析する）
+        self.ffprobe_path = self.find_ffprobe(self.ffmpeg_path)
+        self.probe_cache = probe_cache or MediaProbeCache()
+        self._capabilities = capabilities
+        self._encoder_policy = None
+
+        # 実行中のffmpegプロセス（cancel() で終了させる）
+        self._processes: Set[subprocess.Popen] = set()
+        self._async_processes: Set[Tuple[asyncio.AbstractEventLoop, asyncio.subprocess.Process]] = set()
+        self._process_lock = threading.Lock()
+        self._cancelled = False
+
+        # report_progress() / collect_results() で設定した、スレッドごとの通知先
+        self._local = threading.local()
+
+    @classmethod
+    def from_config(
+        cls,
+        config,
+        ffmpeg_path: Optional[str] = None,
+        probe_cache: Optional[MediaProbeCache] = None
+    ) -> 'FFmpegWrapper':
+        """
+        設定に保存した検出結果を使ってffmpegを用意
+
+        前回検出したffmpegのサイズ・更新時刻が変わっていなければ、検索も
+        対応機能の調査もせずに再利用する。変わっていれば検出し直して保存する。
+
+        Args:
+            config: アプリケーション設定（Config）
+            ffmpeg_path: ffmpegの実行パス（Noneなら前回の検出結果か自動検出）
+            probe_cache: メディア情報のキャッシュ
+
+        Returns:
+            FFmpegWrapper
+
+        Raises:
+            FFmpegNotFoundError: ffmpegが見つからない場合
+        """
+        cached = config.ffmpeg_cache or {}
+        path = ffmpeg_path or cached.get('path')
+        if (
+            path
+            and cached.get('format') == FFMPEG_CACHE_FORMAT
+            and cached.get('path') == path
+            and cls._binary_identity(path) == (cached.get('size'), cached.get('mtime_ns'))
+        ):
+            return cls(path, probe_cache, capabilities=FFmpegCapabilities.from_dict(cached))
+
+        ffmpeg = cls(ffmpeg_path, probe_cache)
+        identity = cls._binary_identity(ffmpeg.ffmpeg_path)
+        if identity:
+            size, mtime_ns = identity
+            config.ffmpeg_cache = {
+                'format': FFMPEG_CACHE_FORMAT,
+                'path': ffmpeg.ffmpeg_path,
+                'size': size,
+                'mtime_ns': mtime_ns,
+                **ffmpeg.capabilities.to_dict(),
+            }
+        return ffmpeg
+
+    @staticmethod
+    def _binary_identity(path: str) -> Optional[Tuple[int, int]]:
+        """
+        実行ファイルの (サイズ, 更新時刻) を取得
+
+        Returns:
+            (サイズ, 更新時刻ns)、ファイルがない場合はNone
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
     @staticmethod
     def find_ffmpeg() -> Optional[str]:
         """
@@ -93,6 +582,23 @@ class FFmpegWrapper:
 
         return None
 
+    @staticmethod
+    def find_ffprobe(ffmpeg_path: str) -> Optional[str]:
+        """
+        ffprobeを検出（ffmpegと同じディレクトリを優先）
+
+        Args:
+            ffmpeg_path: ffmpegのパス
+
+        Returns:
+            ffprobeのパス、見つからない場合はNone
+        """
+        ffmpeg_file = Path(ffmpeg_path)
+        sibling = ffmpeg_file.with_name(f"ffprobe{ffmpeg_file.suffix}")
+        if sibling.exists():
+            return str(sibling)
+        return shutil.which("ffprobe")
+
     def check_available(self) -> bool:
         """
         ffmpegが利用可能かチェック
@@ -119,32 +625,297 @@ class FFmpegWrapper:
         Returns:
             バージョン文字列、取得失敗時はNone
         """
+        return self.capabilities.version or None
+
+    @property
+    def capabilities(self) -> FFmpegCapabilities:
+        """対応機能（最初に使うときに調べ、以降は再利用）"""
+        if self._capabilities is None:
+            self._capabilities = self.detect_capabilities()
+        return self._capabilities
+
+    @property
+    def encoder_policy(self):
+        """対応機能から選んだエンコーダー・字幕描画方法（EncoderPolicy、1回だけ決める）"""
+        if self._encoder_policy is None:
+            from .encoder_policy import EncoderPolicy
+            self._encoder_policy = EncoderPolicy(self.capabilities)
+        return self._encoder_policy
+
+    def detect_capabilities(self) -> FFmpegCapabilities:
+        """
+        ffmpegのバージョンと対応機能を調べる
+
+        Returns:
+            FFmpegCapabilities（調べられなかった項目は空）
+        """
+        def list_output(option: str) -> str:
+            try:
+                result = subprocess.run(
+                    [self.ffmpeg_path, "-hide_banner", option],
+                    capture_output=True,
+                    text=True,
+                    encoding='utf-8',
+                    errors='replace',
+                    timeout=10,
+                    creationflags=SUBPROCESS_FLAGS
+                )
+                return result.stdout if result.returncode == 0 else ""
+            except Exception:
+                return ""
+
+        version_lines = list_output("-version").splitlines()
+        return FFmpegCapabilities(
+            version=version_lines[0] if version_lines else "",
+            encoders=self._parse_encoders(list_output("-encoders")),
+            filters=self._parse_filters(list_output("-filters")),
+            hwaccels=self._parse_hwaccels(list_output("-hwaccels")),
+        )
+
+    @staticmethod
+    def _parse_encoders(output: str) -> List[str]:
+        """ffmpeg -encoders の出力からエンコーダー名を取り出す（" V....D libx264  説明"）"""
+        _, _, body = output.partition("------")
+        encoders = []
+        for line in body.splitlines():
+            parts = line.split()
+            if len(parts) >= 2 and len(parts[0]) == 6:
+                encoders.append(parts[1])
+        return encoders
+
+    @staticmethod
+    def _parse_filters(output: str) -> List[str]:
+        """ffmpeg -filters の出力からフィルター名を取り出す（" TSC drawtext  V->V  説明"）"""
+        filters = []
+        for line in output.splitlines():
+            parts = line.split()
+            if len(parts) >= 3 and len(parts[0]) == 3 and '->' in parts[2]:
+                filters.append(parts[1])
+        return filters
+
+    @staticmethod
+    def _parse_hwaccels(output: str) -> List[str]:
+        """ffmpeg -hwaccels の出力から方式名を取り出す（見出しの次の行から1行1つ）"""
+        lines = [line.strip() for line in output.splitlines()]
+        return [line for line in lines[1:] if line]
+
+    @property
+    def cancelled(self) -> bool:
+        """cancel() されているか"""
+        return self._cancelled
+
+    def cancel(self):
+        """
+        実行中のffmpegをすべて終了させ、reset_cancel() まで新しい起動を拒否する
+
+        別スレッド（UIやシグナルハンドラ）から呼ばれる。終了要求を送ってすぐに戻り、
+        応答しないプロセスの強制終了は補助スレッドで行う（呼び出し元を待たせない）。
+        """
+        with self._process_lock:
+            self._cancelled = True
+            processes = list(self._processes)
+            async_processes = list(self._async_processes)
+
+        # 非同期APIのプロセスは各イベントループ上で終了させる
+        for loop, process in async_processes:
+            try:
+                loop.call_soon_threadsafe(self._terminate_async, process)
+            except RuntimeError:
+                pass  # イベントループが終了済み
+
+        running = [process for process in processes if process.poll() is None]
+        for process in running:
+            process.terminate()
+
+        if running:
+            threading.Thread(target=self._kill_after_grace, args=(running,), daemon=True).start()
+
+    def _kill_after_grace(self, processes: List[subprocess.Popen]):
+        """
+        終了要求に応じないプロセスを猶予後に強制終了（cancel() の補助スレッドで実行）
+
+        Args:
+            processes: 終了要求を送ったプロセス
+        """
+        deadline = time.monotonic() + self.TERMINATE_GRACE_SECONDS
+        for process in processes:
+            try:
+                process.wait(timeout=max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    def reset_cancel(self):
+        """cancel() を解除して再びffmpegを起動できるようにする"""
+        with self._process_lock:
+            self._cancelled = False
+
+    def _popen(self, cmd: List[str], **kwargs) -> subprocess.Popen:
+        """
+        ffmpegを起動して実行中プロセスとして登録
+
+        Args:
+            cmd: コマンドライン
+            **kwargs: subprocess.Popen に渡す引数
+
+        Returns:
+            起動したプロセス
+
+        Raises:
+            FFmpegCancelledError: cancel() されている場合
+        """
+        with self._process_lock:
+            if self._cancelled:
+                raise FFmpegCancelledError("ffmpegの実行はキャンセルされました")
+            # 終了済みのプロセスは登録から外す
+            self._processes = {p for p in self._processes if p.poll() is None}
+            process = subprocess.Popen(cmd, creationflags=SUBPROCESS_FLAGS, **kwargs)
+            self._processes.add(process)
+        return process
+
+    @contextmanager
+    def report_progress(self, callback: Callable[[FFmpegProgress], None]) -> Iterator[None]:
+        """
+        このスレッドで実行するffmpegの進捗を通知する
+
+        with ブロック内の run_command() / run_to_bytes() は -progress 付きで実行され、
+        ffmpegが進捗を出力するたび（約0.5秒ごと）に callback が呼ばれる。
+
+        Args:
+            callback: 進捗の通知先（ffmpegを実行したスレッドで呼ばれる）
+        """
+        previous = getattr(self._local, 'progress_callback', None)
+        self._local.progress_callback = callback
         try:
-            result = subprocess.run(
-                [self.ffmpeg_path, "-version"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-                creationflags=SUBPROCESS_FLAGS
-            )
-            if result.returncode == 0:
-                # 最初の行からバージョンを抽出
-                first_line = result.stdout.split('\n')[0]
-                return first_line
-            return None
-        except Exception:
-            return None
+            yield
+        finally:
+            self._local.progress_callback = previous
+
+    @contextmanager
+    def collect_results(self) -> Iterator[List[FFmpegResult]]:
+        """
+        このスレッドで実行するffmpegの実行結果を集める
+
+        with ブロック内の run_command() / run_to_bytes() の FFmpegResult が
+        返したリストに追加される（入れ子の場合は外側のリストにも追加される）。
+
+        Yields:
+            実行結果のリスト
+        """
+        previous = getattr(self._local, 'results', None)
+        results: List[FFmpegResult] = []
+        self._local.results = results
+        try:
+            yield results
+        finally:
+            self._local.results = previous
+            if previous is not None:
+                previous.extend(results)
+
+    def _collect(self, result: FFmpegResult):
+        """collect_results() の中であれば実行結果を追加"""
+        results = getattr(self._local, 'results', None)
+        if results is not None:
+            results.append(result)
+
+    def _execute(
+        self,
+        cmd: List[str],
+        step: str = "",
+        stdout_sink: Optional[Callable[[bytes], bool]] = None
+    ) -> FFmpegResult:
+        """
+        ffmpegを実行して終了を待つ（cancel() できる形で実行し、時間・CPU・メモリを計測）
+
+        report_progress() の中では -progress 付きで実行する。進捗はエラー出力に書かせ
+        （標準出力は run_to_bytes のデータに使うため）、届いた順に解析する。
+        エラー出力は少しずつ読み、手がかりになる行の末尾だけを StderrTail に残す。
+
+        Args:
+            cmd: コマンドライン
+            step: 書き出しの処理段階（STEP_*）
+            stdout_sink: 標準出力を読んだ分ずつ渡す先（Noneなら読み切ってbytesで返す）。
+                         Falseを返したらffmpegを止める
+
+        Returns:
+            実行結果（stdout_sink を指定しない場合、標準出力はbytes）
+        """
+        callback = getattr(self._local, 'progress_callback', None)
+        cmd = [cmd[0], *_log_options(progress=bool(callback)), *cmd[1:]]
+
+        result = FFmpegResult(argv=[str(arg) for arg in cmd], step=step)
+        started_at = time.monotonic()
+        try:
+            process = self._popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except FFmpegCancelledError:
+            result.cancelled = True
+            self._collect(result)
+            return result
+
+        # 標準出力は別スレッドで読み切る（パイプが詰まってffmpegが止まらないように）
+        stdout_chunks: List[bytes] = []
+
+        def pump_stdout():
+            accepting = True
+            for chunk in iter(lambda: process.stdout.read1(PIPE_CHUNK_BYTES), b''):
+                if accepting and not stdout_sink(chunk):
+                    # 受け取れなくなったらffmpegを止め、残りは読み捨てる
+                    accepting = False
+                    if process.returncode is None:
+                        process.kill()
 
-    def run_command(self, args: List[str], show_output: bool = False) -> bool:
+        if stdout_sink is None:
+            reader = threading.Thread(target=lambda: stdout_chunks.append(process.stdout.read()), daemon=True)
+        else:
+            reader = threading.Thread(target=pump_stdout, daemon=True)
+        reader.start()
+
+        stderr_tail = StderrTail()
+        fields: Dict[str, str] = {}
+
+        def on_line(line: str):
+            if callback and _feed_progress_line(line, fields, callback):
+                return
+            stderr_tail.add(line)
+
+        try:
+            read_lines(process.stderr, on_line)
+            usage = wait_with_usage(process)
+            reader.join()
+        finally:
+            with self._process_lock:
+                self._processes.discard(process)
+
+        result.returncode = process.returncode
+        result.wall_seconds = time.monotonic() - started_at
+        result.user_seconds, result.system_seconds, result.peak_rss = usage
+        result.stderr_tail = stderr_tail.text()
+        result.stdout = b''.join(stdout_chunks) if stdout_sink is None else None
+        result.cancelled = self._cancelled
+        self._collect(result)
+        return result
+
+    @staticmethod
+    def _print_failure(result: FFmpegResult):
+        """失敗した実行結果を表示（cancel()・タイムアウトで終了させた場合は表示しない）"""
+        if result.cancelled or result.timed_out:
+            return
+        print(f"\n✗ ffmpegエラー (終了コード: {result.returncode})")
+        print(f"コマンド: {' '.join(result.argv[:10])}")
+        if result.stderr_tail:
+            print(f"エラー詳細:")
+            print(result.stderr_tail[-1000:])  # 最後の1000文字を表示
+
+    def run_command(self, args: List[str], show_output: bool = False, step: str = "") -> FFmpegResult:
         """
         ffmpegコマンドを実行
 
         Args:
             args: ffmpegの引数リスト
             show_output: 出力を表示するか
+            step: 書き出しの処理段階（STEP_*、集計用）
 
         Returns:
-            成功したらTrue
+            実行結果（成功したときだけ真。cancel() で終了させた場合は偽）
         """
         cmd = [self.ffmpeg_path] + args
 
@@ -152,41 +923,378 @@ class FFmpegWrapper:
             if show_output:
                 print(f"\nffmpegコマンド実行:")
                 print(f"  {' '.join([str(arg) for arg in cmd[:5]])} ... ({len(cmd)}個の引数)")
-                result = subprocess.run(cmd, check=True, capture_output=True, text=True, creationflags=SUBPROCESS_FLAGS)
-                if result.stdout:
-                    print(f"stdout: {result.stdout[:200]}")
-                if result.stderr:
-                    # ffmpegは情報をstderrに出力するので、エラーでなければ表示しない
-                    if result.returncode != 0:
-                        print(f"stderr: {result.stderr[:500]}")
-            else:
-                result = subprocess.run(
-                    cmd,
-                    capture_output=True,
-                    text=True,
-                    check=True,
-                    creationflags=SUBPROCESS_FLAGS
-                )
-            return result.returncode == 0
-        except subprocess.CalledProcessError as e:
-            print(f"\n✗ ffmpegエラー (終了コード: {e.returncode})")
-            print(f"コマンド: {' '.join([str(arg) for arg in cmd[:10]])}")
-            if hasattr(e, 'stderr') and e.stderr:
-                print(f"エラー詳細:")
-                print(e.stderr[-1000:])  # 最後の1000文字を表示
-            if hasattr(e, 'stdout') and e.stdout:
-                print(f"出力:")
-                print(e.stdout[-500:])
-            return False
+            result = self._execute(cmd, step)
+            if not result:
+                self._print_failure(result)
+            elif show_output:
+                print(f"  {result.summary()}")
+            return result
         except Exception as e:
             print(f"\n✗ 実行エラー: {e}")
             import traceback
             traceback.print_exc()
+            result = FFmpegResult(argv=[str(arg) for arg in cmd], stderr_tail=str(e), step=step)
+            self._collect(result)
+            return result
+
+    def run_to_bytes(self, args: List[str], step: str = "") -> Optional[bytes]:
+        """
+        ffmpegコマンドを実行し、標準出力（pipe:1 への出力）を受け取る
+
+        実行結果（FFmpegResult）は collect_results() で受け取る。
+
+        Args:
+            args: ffmpegの引数リスト（出力先は "pipe:1"）
+            step: 書き出しの処理段階（STEP_*、集計用）
+
+        Returns:
+            出力データ、失敗時はNone
+        """
+        cmd = [self.ffmpeg_path] + args
+
+        try:
+            result = self._execute(cmd, step)
+            if not result:
+                self._print_failure(result)
+                return None
+            return result.stdout
+        except Exception as e:
+            print(f"\n✗ 実行エラー: {e}")
+            self._collect(FFmpegResult(argv=[str(arg) for arg in cmd], stderr_tail=str(e), step=step))
+            return None
+
+    def run_to_pipe(self, args: List[str], sink: Callable[[bytes], bool], step: str = "") -> bool:
+        """
+        ffmpegコマンドを実行し、標準出力（pipe:1 への出力）を読んだ分ずつ sink に渡す
+
+        出力全体をメモリに溜めない。sink がFalseを返したらffmpegを止めて失敗とする
+        （受け取り側の都合で止めたため、エラーは表示しない）。
+        実行結果（FFmpegResult）は collect_results() で受け取る。
+
+        Args:
+            args: ffmpegの引数リスト（出力先は "pipe:1"）
+            sink: データの受け取り先（ffmpegの出力を読むスレッドから呼ばれる）
+            step: 書き出しの処理段階（STEP_*、集計用）
+
+        Returns:
+            成功したらTrue
+        """
+        cmd = [self.ffmpeg_path] + args
+        rejected = []
+
+        def write(chunk: bytes) -> bool:
+            if sink(chunk):
+                return True
+            rejected.append(True)
+            return False
+
+        try:
+            result = self._execute(cmd, step, stdout_sink=write)
+            if not result:
+                if not rejected:
+                    self._print_failure(result)
+                return False
+            return True
+        except Exception as e:
+            print(f"\n✗ 実行エラー: {e}")
+            self._collect(FFmpegResult(argv=[str(arg) for arg in cmd], stderr_tail=str(e), step=step))
             return False
 
+    def start_process(self, args: List[str]) -> subprocess.Popen:
+        """
+        標準入力をパイプにしてffmpegを起動（呼び出し側がデータを書き込む）
+
+        Args:
+            args: ffmpegの引数リスト（入力は "pipe:0"）
+
+        Returns:
+            起動したプロセス（stderrはパイプ、cancel() の対象になる）
+
+        Raises:
+            FFmpegCancelledError: cancel() されている場合
+        """
+        cmd = [self.ffmpeg_path] + args
+        return self._popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE
+        )
+
+    async def run_command_async(
+        self,
+        args: List[str],
+        timeout: Optional[float] = None,
+        stderr_callback: Optional[Callable[[str], None]] = None,
+        progress_callback: Optional[Callable[[FFmpegProgress], None]] = None,
+        step: str = ""
+    ) -> FFmpegResult:
+        """
+        ffmpegコマンドを非同期に実行（同時実行数は set_async_concurrency() で制限）
+
+        1つのイベントループから多数のエンコードを並行して進めるためのAPI。
+        実行中のタスクをキャンセルするとffmpegも終了させる。
+
+        Args:
+            args: ffmpegの引数リスト
+            timeout: 制限時間（秒、Noneなら無制限。超えたら終了させて失敗扱い）
+            stderr_callback: エラー出力を1行ずつ受け取る関数（進捗の行は除く）
+            progress_callback: 進捗の通知先（-progress 付きで実行する）
+            step: 書き出しの処理段階（STEP_*、集計用）
+
+        Returns:
+            実行結果（成功したときだけ真。タイムアウト・cancel() で終了させた場合は偽）
+        """
+        cmd = [self.ffmpeg_path] + args
+        result = await self._communicate_async(cmd, timeout, stderr_callback, progress_callback, step)
+        if not result:
+            self._print_failure(result)
+        return result
+
+    async def run_to_bytes_async(
+        self,
+        args: List[str],
+        timeout: Optional[float] = None,
+        stderr_callback: Optional[Callable[[str], None]] = None,
+        progress_callback: Optional[Callable[[FFmpegProgress], None]] = None,
+        step: str = ""
+    ) -> Optional[bytes]:
+        """
+        ffmpegコマンドを非同期に実行し、標準出力（pipe:1 への出力）を受け取る
+
+        Args:
+            args: ffmpegの引数リスト（出力先は "pipe:1"）
+            timeout: 制限時間（秒、Noneなら無制限）
+            stderr_callback: エラー出力を1行ずつ受け取る関数（進捗の行は除く）
+            progress_callback: 進捗の通知先
+            step: 書き出しの処理段階（STEP_*、集計用）
+
+        Returns:
+            出力データ、失敗時はNone
+        """
+        cmd = [self.ffmpeg_path] + args
+        result = await self._communicate_async(cmd, timeout, stderr_callback, progress_callback, step)
+        if not result:
+            self._print_failure(result)
+            return None
+        return result.stdout
+
+    async def _communicate_async(
+        self,
+        cmd: List[str],
+        timeout: Optional[float],
+        stderr_callback: Optional[Callable[[str], None]],
+        progress_callback: Optional[Callable[[FFmpegProgress], None]],
+        step: str = ""
+    ) -> FFmpegResult:
+        """
+        ffmpegを非同期に実行して終了を待つ（エラー出力は読みながら通知）
+
+        プロセスの回収はイベントループが行い rusage を読めないため、実行中に
+        USAGE_SAMPLE_INTERVAL ごとに psutil で読み、メモリ使用量は最大値を残す
+        （CPU時間はエラー出力が閉じた時点の値）。
+
+        Args:
+            cmd: コマンドライン
+            timeout: 制限時間（秒）
+            stderr_callback: エラー出力の通知先
+            progress_callback: 進捗の通知先
+            step: 書き出しの処理段階
+
+        Returns:
+            実行結果（標準出力はbytes）
+        """
+        # エラー出力を受け取る関数があれば統計表示は残す
+        options = _log_options(progress=bool(progress_callback), stats=bool(stderr_callback))
+        cmd = [cmd[0], *options, *cmd[1:]]
+        result = FFmpegResult(argv=[str(arg) for arg in cmd], step=step)
+
+        stderr_tail = StderrTail()
+        fields: Dict[str, str] = {}
+
+        def on_line(line: str):
+            if progress_callback and _feed_progress_line(line, fields, progress_callback):
+                return
+            stderr_tail.add(line)
+            if stderr_callback:
+                stderr_callback(line)
+
+        usage: List[Optional[float]] = [None, None, None]
+
+        def sample():
+            user_seconds, system_seconds, rss = sample_usage(process.pid)
+            if user_seconds is not None:
+                usage[0], usage[1] = user_seconds, system_seconds
+            if rss is not None:
+                usage[2] = max(usage[2] or 0, rss)
+
+        async def sample_while_running():
+            while process.returncode is None:
+                sample()
+                await asyncio.sleep(USAGE_SAMPLE_INTERVAL)
+
+        async def read_stderr():
+            await self._read_lines_async(process.stderr, on_line)
+            # 終了直後のCPU時間（メモリはこの時点では読めないことが多い）
+            sample()
+
+        async with _async_semaphore():
+            started_at = time.monotonic()
+            try:
+                process = await self._spawn_async(cmd)
+            except FFmpegCancelledError:
+                result.cancelled = True
+                return result
+
+            sampler = asyncio.ensure_future(sample_while_running())
+            try:
+                stdout, _, _ = await asyncio.wait_for(
+                    asyncio.gather(process.stdout.read(), read_stderr(), process.wait()),
+                    timeout
+                )
+            except asyncio.TimeoutError:
+                print(f"\n✗ ffmpegがタイムアウトしました（{timeout}秒）")
+                await self._stop_async(process)
+                result.timed_out = True
+                result.returncode = process.returncode
+                result.wall_seconds = time.monotonic() - started_at
+                result.stderr_tail = stderr_tail.text()
+                return result
+            except asyncio.CancelledError:
+                await self._stop_async(process)
+                raise
+            finally:
+                sampler.cancel()
+                with self._process_lock:
+                    self._async_processes.discard((asyncio.get_running_loop(), process))
+
+        result.returncode = process.returncode
+        result.wall_seconds = time.monotonic() - started_at
+        result.user_seconds, result.system_seconds, result.peak_rss = usage
+        result.peak_rss_sampled = result.peak_rss is not None
+        result.stderr_tail = stderr_tail.text()
+        result.stdout = stdout
+        result.cancelled = self._cancelled
+        return result
+
+    async def _spawn_async(self, cmd: List[str]) -> asyncio.subprocess.Process:
+        """
+        ffmpegを非同期に起動して実行中プロセスとして登録
+
+        Raises:
+            FFmpegCancelledError: cancel() されている場合
+        """
+        # 起動を待つ間はロックを持たない（同じループの他のタスクが止まるため）
+        if self._cancelled:
+            raise FFmpegCancelledError("ffmpegの実行はキャンセルされました")
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            creationflags=SUBPROCESS_FLAGS
+        )
+        with self._process_lock:
+            self._async_processes.add((asyncio.get_running_loop(), process))
+            cancelled = self._cancelled
+        if cancelled:
+            # 起動中に cancel() された
+            self._terminate_async(process)
+        return process
+
+    @staticmethod
+    async def _read_lines_async(stream: asyncio.StreamReader, on_line: Callable[[str], None]):
+        """
+        出力を少しずつ読みながら1行ずつ通知（read_lines() の非同期版）
+
+        Args:
+            stream: 読み込むストリーム
+            on_line: 行の通知先
+        """
+        buffer = b''
+        while True:
+            chunk = await stream.read(65536)
+            if not chunk:
+                break
+            lines, buffer = split_output(buffer, chunk)
+            for line in lines:
+                on_line(line)
+        line = buffer.decode('utf-8', errors='replace').rstrip()
+        if line:
+            on_line(line)
+
+    def _terminate_async(self, process: asyncio.subprocess.Process):
+        """
+        非同期APIのプロセスに終了要求を送り、猶予後も動いていれば強制終了
+        （プロセスを起動したイベントループ上で呼ぶ）
+        """
+        if process.returncode is not None:
+            return
+        try:
+            process.terminate()
+        except ProcessLookupError:
+            return
+        asyncio.get_running_loop().call_later(self.TERMINATE_GRACE_SECONDS, self._kill_async, process)
+
+    @staticmethod
+    def _kill_async(process: asyncio.subprocess.Process):
+        """非同期APIのプロセスを強制終了（終了済みなら何もしない）"""
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+
+    async def _stop_async(self, process: asyncio.subprocess.Process):
+        """
+        非同期APIのプロセスを終了させて終了を待つ（タイムアウト・タスクのキャンセル時）
+
+        Args:
+            process: 終了させるプロセス
+        """
+        if process.returncode is None:
+            try:
+                process.terminate()
+            except ProcessLookupError:
+                pass
+            try:
+                await asyncio.wait_for(process.wait(), self.TERMINATE_GRACE_SECONDS)
+            except asyncio.TimeoutError:
+                self._kill_async(process)
+                await process.wait()
+
+    def probe(self, media_path: str, use_cache: bool = True) -> Optional[dict]:
+        """
+        メディアファイルの情報を取得（(パス, サイズ, 更新時刻) ごとにキャッシュ）
+
+        Args:
+            media_path: メディアファイルパス
+            use_cache: キャッシュを使うか（作業中の一時ファイルはFalse）
+
+        Returns:
+            メディア情報の辞書、取得失敗時はNone
+            - duration: 長さ（秒）
+            - has_audio: 音声ストリームがあるか
+            - video_codec, pix_fmt, width, height, sar, fps, rotation: 最初の映像ストリーム
+            - streams: ストリームごとの情報のリスト
+        """
+        if use_cache:
+            info = self.probe_cache.get(media_path)
+            if info is not None:
+                return info
+
+        if self.ffprobe_path:
+            info = self._probe_with_ffprobe(media_path)
+        else:
+            info = self._probe_with_ffmpeg(media_path)
+
+        if info is not None and use_cache:
+            self.probe_cache.put(media_path, info)
+        return info
+
     def get_video_info(self, video_path: str) -> Optional[dict]:
         """
-        動画ファイルの情報を取得
+        動画ファイルの情報を取得（probe() と同じ）
 
         Args:
             video_path: 動画ファイルパス
@@ -194,10 +1302,155 @@ class FFmpegWrapper:
         Returns:
             動画情報の辞書、取得失敗時はNone
         """
+        return self.probe(video_path)
+
+    def _probe_with_ffprobe(self, media_path: str) -> Optional[dict]:
+        """
+        ffprobeのJSON出力からメディア情報を取得
+
+        Args:
+            media_path: メディアファイルパス
+
+        Returns:
+            メディア情報の辞書、取得失敗時はNone
+        """
+        try:
+            cmd = [
+                self.ffprobe_path,
+                "-v", "error",
+                "-print_format", "json",
+                "-show_format",
+                "-show_streams",
+                media_path
+            ]
+
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                encoding='utf-8',
+                errors='replace',
+                creationflags=SUBPROCESS_FLAGS
+            )
+            if result.returncode != 0:
+                print(f"メディア情報取得エラー: {result.stderr.strip()}")
+                return None
+
+            return self.parse_probe_json(json.loads(result.stdout))
+        except Exception as e:
+            print(f"メディア情報取得エラー: {e}")
+            return None
+
+    @staticmethod
+    def parse_probe_json(data: dict) -> Optional[dict]:
+        """
+        ffprobeのJSON出力をメディア情報の辞書に変換
+
+        Args:
+            data: ffprobe -show_format -show_streams の出力
+
+        Returns:
+            メディア情報の辞書、長さが分からない場合はNone
+        """
+        def to_float(value) -> Optional[float]:
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return None
+
+        def to_rate(value) -> Optional[float]:
+            # "30000/1001" 形式（"0/0" は不明）
+            try:
+                num, den = (float(v) for v in str(value).split('/'))
+            except ValueError:
+                return None
+            return num / den if num > 0 and den > 0 else None
+
+        streams = []
+        for stream in data.get('streams', []):
+            entry = {
+                'index': stream.get('index'),
+                'codec_type': stream.get('codec_type'),
+                'codec_name': stream.get('codec_name'),
+            }
+            if stream.get('codec_type') == 'video':
+                entry['width'] = stream.get('width')
+                entry['height'] = stream.get('height')
+                entry['pix_fmt'] = stream.get('pix_fmt')
+                entry['fps'] = to_rate(stream.get('avg_frame_rate')) or to_rate(stream.get('r_frame_rate'))
+                entry['sar'] = stream.get('sample_aspect_ratio')
+                entry['rotation'] = FFmpegWrapper._stream_rotation(stream)
+                # カバーアートなどの静止画（音楽ファイルに付く）
+                entry['attached_pic'] = bool(stream.get('disposition', {}).get('attached_pic'))
+            elif stream.get('codec_type') == 'audio':
+                entry['sample_rate'] = int(stream.get('sample_rate') or 0) or None
+                entry['channels'] = stream.get('channels')
+            entry['duration'] = to_float(stream.get('duration'))
+            streams.append({key: value for key, value in entry.items() if value is not None})
+
+        duration = to_float(data.get('format', {}).get('duration'))
+        if duration is None:
+            durations = [stream['duration'] for stream in streams if 'duration' in stream]
+            duration = max(durations) if durations else None
+        if duration is None:
+            return None
+
+        info = {
+            'duration': duration,
+            'has_audio': any(stream['codec_type'] == 'audio' for stream in streams),
+            'streams': streams,
+        }
+
+        video = next(
+            (stream for stream in streams if stream['codec_type'] == 'video' and not stream.get('attached_pic')),
+            None
+        )
+        if video:
+            info['video_codec'] = video.get('codec_name')
+            info['rotation'] = video.get('rotation', 0)
+            for key in ('pix_fmt', 'width', 'height', 'fps'):
+                if key in video:
+                    info[key] = video[key]
+            # "0:1" は未設定
+            if video.get('sar') and not video['sar'].startswith('0:'):
+                info['sar'] = video['sar']
+        return info
+
+    @staticmethod
+    def _stream_rotation(stream: dict) -> int:
+        """
+        映像ストリームの回転（表示時に時計回りに回す角度: 0/90/180/270）
+
+        Args:
+            stream: ffprobeのストリーム情報
+
+        Returns:
+            回転角度
+        """
+        rotation = None
+        for side_data in stream.get('side_data_list', []):
+            if 'rotation' in side_data:
+                # displaymatrix は反時計回りの角度
+                rotation = -float(side_data['rotation'])
+                break
+        if rotation is None:
+            rotation = float(stream.get('tags', {}).get('rotate', 0) or 0)
+        return int(round(rotation / 90.0)) * 90 % 360
+
+    def _probe_with_ffmpeg(self, media_path: str) -> Optional[dict]:
+        """
+        ffmpeg -i の出力からメディア情報を取得（ffprobeがない場合）
+
+        Args:
+            media_path: メディアファイルパス
+
+        Returns:
+            メディア情報の辞書、取得失敗時はNone
+        """
         try:
             cmd = [
                 self.ffmpeg_path,
-                "-i", video_path,
+                "-i", media_path,
                 "-hide_banner"
             ]
 
@@ -205,21 +1458,116 @@ class FFmpegWrapper:
                 cmd,
                 capture_output=True,
                 text=True,
+                encoding='utf-8',
+                errors='replace',
                 creationflags=SUBPROCESS_FLAGS
             )
 
             # ffmpegは動画情報をstderrに出力する
             output = result.stderr
 
-            # 長さを抽出（簡易版）
             import re
             duration_match = re.search(r'Duration: (\d{2}):(\d{2}):(\d{2}\.\d{2})', output)
-            if duration_match:
-                hours, minutes, seconds = duration_match.groups()
-                duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
-                return {'duration': duration}
+            if not duration_match:
+                return None
 
-            return None
+            hours, minutes, seconds = duration_match.groups()
+            duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+            streams = []
+            for index, (codec_type, codec_name) in enumerate(
+                re.findall(r'Stream #\d+:\d+.*?: (Video|Audio|Subtitle|Data): (\w+)', output)
+            ):
+                streams.append({'index': index, 'codec_type': codec_type.lower(), 'codec_name': codec_name})
+
+            info = {
+                'duration': duration,
+                'has_audio': any(stream['codec_type'] == 'audio' for stream in streams),
+                'streams': streams,
+            }
+
+            # 最初の映像ストリームの形式（ストリームコピー可否の判定用）
+            video_match = re.search(r'Stream #\d+:\d+.*: Video: (\w+)[^,]*, (\w+)(.*)', output)
+            if video_match:
+                info['video_codec'] = video_match.group(1)
+                info['pix_fmt'] = video_match.group(2)
+                rest = video_match.group(3)
+                size_match = re.search(r'\b(\d{2,5})x(\d{2,5})\b', rest)
+                if size_match:
+                    info['width'] = int(size_match.group(1))
+                    info['height'] = int(size_match.group(2))
+                sar_match = re.search(r'\[SAR (\d+):(\d+)', rest)
+                if sar_match:
+                    info['sar'] = f"{sar_match.group(1)}:{sar_match.group(2)}"
+                fps_match = re.search(r'([\d.]+) fps', rest)
+                if fps_match:
+                    info['fps'] = float(fps_match.group(1))
+
+                # "displaymatrix: rotation of -90.00 degrees"（反時計回り）/ 古い形式の "rotate : 90"
+                rotation = 0.0
+                matrix_match = re.search(r'rotation of (-?[\d.]+) degrees', output)
+                rotate_match = re.search(r'^\s*rotate\s*:\s*(-?\d+)', output, re.MULTILINE)
+                if matrix_match:
+                    rotation = -float(matrix_match.group(1))
+                elif rotate_match:
+                    rotation = float(rotate_match.group(1))
+                info['rotation'] = int(round(rotation / 90.0)) * 90 % 360
+            return info
         except Exception as e:
             print(f"動画情報取得エラー: {e}")
             return None
+
+    def get_keyframes(self, video_path: str) -> Optional[List[Tuple[int, float]]]:
+        """
+        最初の映像ストリームのキーフレーム一覧を取得（デコードせずパケットだけ読む）
+
+        Args:
+            video_path: 動画ファイルパス
+
+        Returns:
+            (デコード順のパケット番号, 表示時刻（秒）) のリスト、取得失敗時はNone
+        """
+        try:
+            cmd = [
+                self.ffmpeg_path,
+                "-hide_banner",
+                "-i", video_path,
+                "-map", "0:v:0",
+                "-c", "copy",
+                "-f", "framecrc",
+                "-"
+            ]
+
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                creationflags=SUBPROCESS_FLAGS
+            )
+            if result.returncode != 0:
+                return None
+
+            # framecrc: "#tb 0: 1/15360" の後に
+            # "0, dts, pts, duration, size, crc[, F=0x0]" が続く（キーフレームは F= なし）
+            import re
+            time_base = None
+            keyframes = []
+            index = 0
+            for line in result.stdout.splitlines():
+                tb_match = re.match(r'#tb 0: (\d+)/(\d+)', line)
+                if tb_match:
+                    time_base = int(tb_match.group(1)) / int(tb_match.group(2))
+                    continue
+                if line.startswith('#') or time_base is None:
+                    continue
+                fields = [field.strip() for field in line.split(',')]
+                if len(fields) < 6:
+                    continue
+                is_key = not any(field.startswith('F=') and int(field[2:], 16) & 1 == 0 for field in fields[6:])
+                if is_key:
+                    keyframes.append((index, int(fields[2]) * time_base))
+                index += 1
+            return keyframes
+        except Exception as e:
+            print(f"キーフレーム取得エラー: {e}")
+            return None
@@ -0,0 +1,169 @@
+"""
+Job Manifest
+書き出しジョブの進行状況（完了したシーン動画）の記録と再開
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from .workspace import RenderWorkspace
+
+
+class JobManifest:
+    """
+    書き出しジョブのマニフェスト
+
+    完了したシーン動画をフィンガープリントとともに記録し、失敗した書き出しを
+    途中から再開できるようにする。キャッシュを使わないシーン動画は
+    マニフェストと同じディレクトリに移して保持し、書き出しが成功したら削除する。
+    """
+
+    FILE_NAME = "manifest.json"
+    RESUME_DIR_NAME = "resume"
+
+    # マニフェストの形式を変えたら上げる
+    FORMAT_VERSION = 1
+
+    def __init__(self, directory: Path, output_path: str):
+        """
+        Args:
+            directory: マニフェストと完了済みシーン動画を置くディレクトリ
+            output_path: 書き出し先の動画ファイルパス
+        """
+        self.directory = Path(directory)
+        self.output_path = output_path
+        self.scene_count = 0
+        self.scenes: Dict[int, dict] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_output(cls, output_path: str, root_dir: Optional[str] = None) -> 'JobManifest':
+        """
+        書き出し先ごとのマニフェストを取得
+
+        Args:
+            output_path: 書き出し先の動画ファイルパス
+            root_dir: 作業ディレクトリの親ディレクトリ（ProjectSettings.workspace_dir）
+
+        Returns:
+            JobManifest（ファイルは読み込まない）
+        """
+        key = hashlib.sha256(str(Path(output_path).absolute()).encode('utf-8')).hexdigest()[:16]
+        directory = RenderWorkspace.resolve_root(root_dir) / cls.RESUME_DIR_NAME / key
+        return cls(directory, output_path)
+
+    @property
+    def manifest_path(self) -> Path:
+        """マニフェストファイルのパス"""
+        return self.directory / self.FILE_NAME
+
+    def exists(self) -> bool:
+        """再開できるマニフェストがあるか"""
+        return self.manifest_path.exists()
+
+    @property
+    def completed_count(self) -> int:
+        """完了済みシーン数"""
+        return len(self.scenes)
+
+    def load(self) -> bool:
+        """
+        マニフェストを読み込む
+
+        Returns:
+            再開できるマニフェストを読み込めたらTrue
+        """
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return False
+
+        if data.get('version') != self.FORMAT_VERSION:
+            return False
+
+        self.scene_count = data.get('scene_count', 0)
+        self.scenes = {int(index): entry for index, entry in data.get('scenes', {}).items()}
+        return True
+
+    def reset(self, scene_count: int):
+        """
+        新しい書き出しとして記録をやり直す（前回の完了済みシーン動画は削除）
+
+        Args:
+            scene_count: プロジェクトのシーン数
+        """
+        self.discard()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.scene_count = scene_count
+        self.scenes = {}
+        with self._lock:
+            self._save()
+
+    def lookup(self, index: int, fingerprint: str) -> Optional[str]:
+        """
+        完了済みのシーン動画を検索
+
+        Args:
+            index: シーン番号（1始まり）
+            fingerprint: 現在の設定でのフィンガープリント
+
+        Returns:
+            シーン動画のパス、未完了か内容が変わった場合はNone
+        """
+        entry = self.scenes.get(index)
+        if not entry or entry.get('fingerprint') != fingerprint:
+            return None
+
+        clip_path = Path(entry.get('path', ''))
+        if clip_path.exists() and clip_path.stat().st_size > 0:
+            return str(clip_path)
+        return None
+
+    def keep_clip(self, index: int, clip_path: str) -> str:
+        """
+        作業ディレクトリのシーン動画をマニフェストのディレクトリに移す
+
+        Args:
+            index: シーン番号（1始まり）
+            clip_path: 作業ディレクトリに生成したシーン動画
+
+        Returns:
+            移動後のパス
+        """
+        kept_path = self.directory / f"scene_{index:03d}{Path(clip_path).suffix}"
+        shutil.move(clip_path, kept_path)
+        return str(kept_path)
+
+    def record(self, index: int, fingerprint: str, clip_path: str):
+        """
+        シーン動画の完了を記録（ワーカースレッドから呼ばれる）
+
+        Args:
+            index: シーン番号（1始まり）
+            fingerprint: シーン動画のフィンガープリント
+            clip_path: 完了したシーン動画のパス
+        """
+        with self._lock:
+            self.scenes[index] = {'fingerprint': fingerprint, 'path': clip_path}
+            self._save()
+
+    def discard(self):
+        """マニフェストと保持しているシーン動画を削除"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.scenes = {}
+
+    def _save(self):
+        """マニフェストを書き込む（途中で落ちても壊れないよう置き換えで保存）"""
+        data = {
+            'version': self.FORMAT_VERSION,
+            'output_path': self.output_path,
+            'scene_count': self.scene_count,
+            'scenes': {str(index): entry for index, entry in sorted(self.scenes.items())},
+        }
+        temp_path = self.manifest_path.with_name(f"{self.FILE_NAME}.tmp")
+        temp_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding='utf-8')
+        os.replace(temp_path, self.manifest_path)
@@ -0,0 +1,135 @@
+"""
+Media Probe Cache
+メディア情報（ffprobeの解析結果）のキャッシュ
+"""
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from .clip_cache import evict_oldest
+
+
+# 解析結果の形式を変えたら上げる
+PROBE_FORMAT_VERSION = 1
+
+# キャッシュ全体の上限サイズ（デフォルト 16MB）
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+
+class MediaProbeCache:
+    """
+    メディア情報のキャッシュ管理クラス
+
+    (パス, サイズ, 更新時刻) をキーに解析結果をJSONで保存し、
+    ファイルが変わらない限り書き出しのたびに解析し直さないようにする。
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Args:
+            cache_dir: キャッシュディレクトリ（Noneなら一時ディレクトリ）
+            max_bytes: キャッシュ全体の上限サイズ（起動時に超えた分を古いものから削除）
+        """
+        self.max_bytes = max_bytes
+
+        if cache_dir:
+            self.cache_dir = Path(cache_dir)
+        else:
+            import tempfile
+            self.cache_dir = Path(tempfile.gettempdir()) / "insightmovie_cache" / "probes"
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # 同じプロセス内ではファイルも読まない
+        self._lock = threading.Lock()
+        self._memo: Dict[Tuple[str, int, int], dict] = {}
+
+        # 1件が小さいため、書き出しのたびではなく起動時にまとめて整理
+        evict_oldest(self.cache_dir, self.max_bytes)
+
+    @staticmethod
+    def _identity(media_path: str) -> Optional[Tuple[str, int, int]]:
+        """
+        (絶対パス, サイズ, 更新時刻) を取得
+
+        Returns:
+            同一性のタプル、ファイルがない場合はNone
+        """
+        try:
+            stat = os.stat(media_path)
+        except OSError:
+            return None
+        return (str(Path(media_path).absolute()), stat.st_size, stat.st_mtime_ns)
+
+    def _entry_path(self, identity: Tuple[str, int, int]) -> Path:
+        """キャッシュファイルのパス"""
+        content = json.dumps([PROBE_FORMAT_VERSION, *identity], ensure_ascii=False)
+        cache_key = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{cache_key}.json"
+
+    def get(self, media_path: str) -> Optional[dict]:
+        """
+        キャッシュ済みのメディア情報を取得
+
+        Args:
+            media_path: メディアファイルパス
+
+        Returns:
+            メディア情報の辞書、未解析かファイルが変わっている場合はNone
+        """
+        identity = self._identity(media_path)
+        if identity is None:
+            return None
+
+        with self._lock:
+            info = self._memo.get(identity)
+        if info is not None:
+            return dict(info)
+
+        entry_path = self._entry_path(identity)
+        try:
+            info = json.loads(entry_path.read_text(encoding='utf-8'))
+            # 最近使ったものとして更新時刻を進める（LRU）
+            os.utime(entry_path)
+        except (OSError, ValueError):
+            return None
+
+        with self._lock:
+            self._memo[identity] = info
+        return dict(info)
+
+    def put(self, media_path: str, info: dict):
+        """
+        メディア情報を保存
+
+        Args:
+            media_path: メディアファイルパス
+            info: 解析結果
+        """
+        identity = self._identity(media_path)
+        if identity is None:
+            return
+
+        with self._lock:
+            self._memo[identity] = dict(info)
+
+        entry_path = self._entry_path(identity)
+        temp_path = entry_path.with_name(f"{entry_path.stem}.{threading.get_ident()}.tmp")
+        try:
+            temp_path.write_text(json.dumps(info, ensure_ascii=False), encoding='utf-8')
+            os.replace(temp_path, entry_path)
+        except OSError as e:
+            print(f"メディア情報キャッシュの保存エラー: {e}")
+
+    def clear(self):
+        """すべてのキャッシュを削除"""
+        with self._lock:
+            self._memo.clear()
+        for entry_path in self.cache_dir.glob("*.json"):
+            try:
+                entry_path.unlink()
+            except OSError:
+                pass
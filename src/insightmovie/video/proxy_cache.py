@@ -0,0 +1,230 @@
+"""
+Media Proxy Cache
+出力解像度ごとの縮小済みメディア（プロキシ）キャッシュ
+"""
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from .clip_cache import file_identity, evict_oldest, remove_stale_temp
+from .ffmpeg_wrapper import FFmpegWrapper, STEP_PROXY
+from ..project import MediaType, EncodingProfile
+
+
+# プロキシの生成方法を変えたら上げる
+PROXY_FORMAT_VERSION = 2
+
+# 動画プロキシの画質（最終エンコードでの劣化を抑えるため高画質・高速）
+PROXY_VIDEO_PROFILE = EncodingProfile(name='proxy', preset='veryfast', crf=16)
+
+# キャッシュ全体の上限サイズ（デフォルト 2GB）
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+
+class MediaProxyCache:
+    """縮小済みメディアのキャッシュ管理クラス"""
+
+    def __init__(
+        self,
+        ffmpeg: FFmpegWrapper,
+        cache_dir: Optional[str] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        """
+        Args:
+            ffmpeg: FFmpegWrapperインスタンス
+            cache_dir: キャッシュディレクトリ（Noneなら一時ディレクトリ）
+            max_bytes: キャッシュ全体の上限サイズ（超えたら古いものから削除）
+        """
+        self.ffmpeg = ffmpeg
+        self.max_bytes = max_bytes
+
+        if cache_dir:
+            self.cache_dir = Path(cache_dir)
+        else:
+            import tempfile
+            self.cache_dir = Path(tempfile.gettempdir()) / "insightmovie_cache" / "proxies"
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+
+        # 上限が下がっている場合に備えて起動時にも整理
+        remove_stale_temp(self.cache_dir)
+        self._evict()
+
+    def get_cache_key(
+        self,
+        media_path: str,
+        width: int,
+        height: int,
+        fps: int,
+        lossless: bool = False
+    ) -> Optional[str]:
+        """
+        (元メディアの同一性, 解像度, fps, 可逆か) からキャッシュキーを生成
+
+        Args:
+            media_path: 元メディアのパス
+            width, height: 出力解像度
+            fps: 出力フレームレート
+            lossless: 可逆プロキシか
+
+        Returns:
+            キャッシュキー（ハッシュ値）、元メディアがない場合はNone
+        """
+        identity = file_identity(media_path)
+        if identity is None:
+            return None
+
+        content = {
+            'version': PROXY_FORMAT_VERSION,
+            'media': identity,
+            'size': f"{width}x{height}",
+            'fps': fps,
+            'lossless': lossless,
+        }
+        serialized = json.dumps(content, sort_keys=True)
+        return hashlib.sha256(serialized.encode('utf-8')).hexdigest()
+
+    def get_proxy(
+        self,
+        media_path: str,
+        media_type: MediaType,
+        width: int,
+        height: int,
+        fps: int,
+        lossless: bool = False
+    ) -> Optional[str]:
+        """
+        縮小・パディング済みのプロキシを取得（なければ生成）
+
+        Args:
+            media_path: 元メディアのパス
+            media_type: メディアタイプ（画像/動画）
+            width, height: 出力解像度
+            fps: 出力フレームレート
+            lossless: 動画を可逆で保存するか（中間コーデック使用時）
+
+        Returns:
+            プロキシファイルパス、生成できない場合はNone（元メディアを使う）
+        """
+        cache_key = self.get_cache_key(media_path, width, height, fps, lossless)
+        if cache_key is None:
+            return None
+
+        if media_type == MediaType.IMAGE:
+            suffix = ".png"
+        else:
+            suffix = ".mov" if lossless else ".mp4"
+        proxy_path = self.cache_dir / f"{cache_key}{suffix}"
+
+        # 同じメディアを使う複数シーンが並列に生成しないよう、キーごとにロック
+        with self._lock:
+            key_lock = self._key_locks.setdefault(cache_key, threading.Lock())
+
+        with key_lock:
+            if proxy_path.exists():
+                # 最近使ったものとして更新時刻を進める（LRU）
+                os.utime(proxy_path)
+                return str(proxy_path)
+
+            print(f"  プロキシを生成: {Path(media_path).name} → {width}x{height}@{fps}")
+            temp_path = proxy_path.with_name(f"{cache_key}.tmp{suffix}")
+            if not self._create_proxy(media_path, media_type, str(temp_path), width, height, fps, lossless):
+                if temp_path.exists():
+                    temp_path.unlink()
+                return None
+            os.replace(temp_path, proxy_path)
+
+        self._evict(keep=proxy_path)
+        return str(proxy_path)
+
+    def _create_proxy(
+        self,
+        media_path: str,
+        media_type: MediaType,
+        output_path: str,
+        width: int,
+        height: int,
+        fps: int,
+        lossless: bool = False
+    ) -> bool:
+        """
+        プロキシを生成
+
+        Args:
+            media_path: 元メディアのパス
+            media_type: メディアタイプ
+            output_path: 出力先パス
+            width, height: 出力解像度
+            fps: 出力フレームレート
+            lossless: 動画を可逆（中間コーデック + PCM）で保存するか
+
+        Returns:
+            成功したらTrue
+        """
+        scale_pad = (
+            f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+            f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1"
+        )
+
+        if media_type == MediaType.IMAGE:
+            # 画像は可逆のPNGで1枚だけ保存
+            args = [
+                "-i", media_path,
+                "-vf", scale_pad,
+                "-frames:v", "1",
+                "-y",
+                output_path
+            ]
+        elif lossless:
+            # 中間コーデック使用時は劣化させない（非可逆エンコードは最終の1回だけ）
+            args = [
+                "-i", media_path,
+                "-vf", f"{scale_pad},fps={fps}",
+                *self.ffmpeg.encoder_policy.lossless_video_args(),
+                "-c:a", "pcm_s16le",
+                "-ar", "44100",
+                "-y",
+                output_path
+            ]
+        else:
+            # 動画は高画質で保存（最終エンコードでの劣化を抑える）
+            args = [
+                "-i", media_path,
+                "-vf", f"{scale_pad},fps={fps}",
+                *self.ffmpeg.encoder_policy.video_args(PROXY_VIDEO_PROFILE),
+                "-c:a", "aac",
+                "-b:a", "192k",
+                "-ar", "44100",
+                "-y",
+                output_path
+            ]
+
+        return self.ffmpeg.run_command(args, step=STEP_PROXY)
+
+    def _evict(self, keep: Optional[Path] = None):
+        """
+        上限サイズを超えた分を、最後に使われた時刻が古い順に削除
+
+        Args:
+            keep: 削除しないファイル（直前に生成したもの）
+        """
+        with self._lock:
+            evict_oldest(self.cache_dir, self.max_bytes, () if keep is None else (keep,))
+
+    @property
+    def total_bytes(self) -> int:
+        """キャッシュの合計サイズ"""
+        return sum(p.stat().st_size for p in self.cache_dir.iterdir() if p.is_file())
+
+    def clear_cache(self):
+        """すべてのキャッシュを削除"""
+        for cache_file in self.cache_dir.iterdir():
+            if cache_file.is_file():
+                cache_file.unlink()
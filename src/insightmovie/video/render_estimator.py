@@ -0,0 +1,312 @@
+"""
+Render Estimator
+書き出し時間の予測（過去の書き出し履歴から処理段階ごとに推定）
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from .clip_cache import SceneClipCache
+from .ffmpeg_wrapper import FFmpegWrapper
+from .render_history import (
+    RenderHistory, STAGE_AUDIO, STAGE_SCENE, STAGE_CONCAT, work_units, profile_key
+)
+from .render_job import DEFAULT_FFMPEG_THREADS, compute_worker_count
+from .render_progress import format_seconds
+from .scene_generator import SceneGenerator
+from ..project import Project, Scene, DurationMode
+from ..voicevox import AudioCache
+
+
+# 履歴がないときの既定値（作業量1あたり、マシン全体を使った場合の秒数。preset=medium 基準）
+DEFAULT_SCENE_RATES = {
+    "image": 0.25,
+    "video": 0.5,
+    "none": 0.15,
+}
+
+# x264 preset ごとの速度の目安（medium = 1.0）
+PRESET_FACTORS = {
+    "ultrafast": 0.25,
+    "superfast": 0.35,
+    "veryfast": 0.5,
+    "faster": 0.7,
+    "fast": 0.85,
+    "medium": 1.0,
+    "slow": 1.6,
+    "slower": 2.5,
+    "veryslow": 4.0,
+}
+
+# 中間コーデック（ultrafast の可逆）でシーンを作る場合の速度の目安
+INTERMEDIATE_SCENE_FACTOR = 0.3
+
+# 結合の既定値（ストリームコピー / 最終エンコード、作業量1あたりの秒数）
+DEFAULT_COPY_CONCAT_RATE = 0.01
+DEFAULT_FINAL_ENCODE_RATE = 0.15
+
+# 会話音声の合成の既定値（固定の秒数 + 1文字あたりの秒数）
+DEFAULT_AUDIO_COST = (0.3, 0.04)
+
+# キャッシュから再利用するシーンの所要時間
+CACHE_HIT_SECONDS = 0.05
+
+# 回帰に使う最少件数（未満なら平均の比率、0件なら既定値）
+MIN_FIT_SAMPLES = 3
+
+
+@dataclass
+class SceneEstimate:
+    """1シーンの予測"""
+    index: int  # シーン番号（1始まり）
+    seconds: float  # このシーンの生成にかかる時間（並列実行時の1シーン分）
+    cache_hit: bool  # キャッシュから再利用できる見込みか
+    needs_synthesis: bool  # 会話音声の合成が必要か
+
+
+@dataclass
+class RenderEstimate:
+    """書き出し全体の予測"""
+    total_seconds: float  # 書き出し全体の所要時間
+    concat_seconds: float  # 結合（・最終エンコード）の所要時間
+    workers: int  # 並列レンダリング数
+    from_history: bool  # 履歴から推定したか（Falseなら既定値のみ）
+    scenes: List[SceneEstimate] = field(default_factory=list)
+
+    @property
+    def cache_hits(self) -> int:
+        """キャッシュから再利用できる見込みのシーン数"""
+        return sum(1 for scene in self.scenes if scene.cache_hit)
+
+    def format_total(self) -> str:
+        """全体の所要時間を表示用の文字列にする"""
+        return format_seconds(self.total_seconds)
+
+
+class RenderEstimator:
+    """
+    書き出し時間の予測クラス
+
+    処理段階（音声合成・シーン生成・結合）ごとに、履歴の「作業量 → マシン全体を
+    使った場合の秒数（実測秒数 ÷ 並列数）」を直線で近似する。シーン生成は
+    メディアタイプとプロファイルが同じ記録だけを使い、記録がなければ既定値を使う。
+    """
+
+    def __init__(self, history: Optional[RenderHistory] = None):
+        """
+        Args:
+            history: 書き出し履歴（Noneなら既定値だけで予測）
+        """
+        self.history = history
+        self._models: Dict[Tuple[str, str, str], Optional[Tuple[float, float]]] = {}
+
+    def estimate(
+        self,
+        project: Project,
+        speaker_id: int,
+        audio_cache: Optional[AudioCache] = None,
+        clip_cache: Optional[SceneClipCache] = None,
+        ffmpeg: Optional[FFmpegWrapper] = None
+    ) -> RenderEstimate:
+        """
+        プロジェクトの書き出し時間を予測
+
+        Args:
+            project: 書き出すプロジェクト
+            speaker_id: プロジェクトデフォルトの話者ID
+            audio_cache: 音声キャッシュ（合成済みか・音声の長さの判定に使用）
+            clip_cache: シーン動画キャッシュ（再利用できるかの判定に使用）
+            ffmpeg: 書き出しに使うffmpeg（選ばれるエンコーダーをフィンガープリントに反映）
+
+        Returns:
+            RenderEstimate
+        """
+        profile = project.output.profile
+        resolution = project.output.render_resolution
+        fps = project.output.fps
+        key = profile_key(profile)
+
+        scene_count = max(1, len(project.scenes))
+        if project.settings.render_workers > 0:
+            workers = min(project.settings.render_workers, scene_count)
+        else:
+            workers = compute_worker_count(scene_count, profile.threads or DEFAULT_FFMPEG_THREADS)
+
+        generator = SceneGenerator(ffmpeg, project.settings.font_path, profile=profile)
+        from_history = False
+        scene_costs = []
+        scenes = []
+        total_work = 0.0
+
+        for i, scene in enumerate(project.scenes, 1):
+            duration, audio_path, needs_synthesis = self._scene_duration(scene, speaker_id, audio_cache)
+            work = work_units(duration, resolution, fps)
+            total_work += work
+
+            cache_hit = False
+            if clip_cache and not needs_synthesis:
+                fingerprint = SceneClipCache.get_fingerprint(
+                    scene, duration, resolution, fps, audio_path,
+                    generator.font_path, generator.encoder_settings()
+                )
+                # 予測だけでLRUの順序を変えないよう、更新時刻を進めない確認を使う
+                cache_hit = clip_cache.contains(fingerprint, generator.clip_suffix)
+
+            cost = 0.0
+            if needs_synthesis:
+                audio_cost, fitted = self._predict(STAGE_AUDIO, "", "", len(scene.narration_text))
+                cost += audio_cost
+                from_history = from_history or fitted
+            if cache_hit:
+                cost += CACHE_HIT_SECONDS / workers
+            else:
+                scene_cost, fitted = self._predict(STAGE_SCENE, scene.media_type.value, key, work)
+                cost += scene_cost
+                from_history = from_history or fitted
+
+            scene_costs.append(cost)
+            scenes.append(SceneEstimate(
+                index=i,
+                seconds=cost * workers,
+                cache_hit=cache_hit,
+                needs_synthesis=needs_synthesis,
+            ))
+
+        concat_seconds, fitted = self._predict(STAGE_CONCAT, "", key, total_work)
+        from_history = from_history or fitted
+
+        return RenderEstimate(
+            total_seconds=sum(scene_costs) + concat_seconds,
+            concat_seconds=concat_seconds,
+            workers=workers,
+            from_history=from_history,
+            scenes=scenes,
+        )
+
+    @staticmethod
+    def _scene_duration(
+        scene: Scene,
+        speaker_id: int,
+        audio_cache: Optional[AudioCache]
+    ) -> Tuple[float, Optional[str], bool]:
+        """
+        シーンの長さを見積もる（RenderJob._prepare_audio と同じ規則）
+
+        Args:
+            scene: シーンデータ
+            speaker_id: プロジェクトデフォルトの話者ID
+            audio_cache: 音声キャッシュ
+
+        Returns:
+            (シーンの長さ, 音声ファイルパス or None, 音声合成が必要か)
+        """
+        if not scene.has_narration:
+            return scene.fixed_seconds, None, False
+
+        scene_speaker_id = scene.speaker_id if scene.speaker_id is not None else speaker_id
+        if not audio_cache or not audio_cache.exists(scene.narration_text, scene_speaker_id):
+            # 合成するまで長さは分からないため、前回の長さを使う
+            return scene.fixed_seconds, None, True
+
+        audio_path = str(audio_cache.get_cache_path(scene.narration_text, scene_speaker_id))
+        duration = audio_cache.get_duration(scene.narration_text, scene_speaker_id)
+        if scene.duration_mode == DurationMode.AUTO and duration:
+            return duration + 2.0, audio_path, False
+        return scene.fixed_seconds, audio_path, False
+
+    def _predict(self, stage: str, media_type: str, key: str, work: float) -> Tuple[float, bool]:
+        """
+        作業量から所要時間（マシン全体を使った場合の秒数）を予測
+
+        Args:
+            stage: 処理段階
+            media_type: メディアタイプ（シーン生成のみ）
+            key: プロファイルの識別名（音声合成では使わない）
+            work: 作業量
+
+        Returns:
+            (秒数, 履歴から推定したか)
+        """
+        model = self._model(stage, media_type, key)
+        if model:
+            intercept, slope = model
+            return intercept + slope * work, True
+        return self._default_cost(stage, media_type, key, work), False
+
+    def _model(self, stage: str, media_type: str, key: str) -> Optional[Tuple[float, float]]:
+        """
+        履歴から (切片, 傾き) を求める（同じ条件の結果はキャッシュ）
+
+        Returns:
+            (切片, 傾き)、履歴がない場合はNone
+        """
+        cache_key = (stage, media_type, key)
+        if cache_key in self._models:
+            return self._models[cache_key]
+
+        model = None
+        if self.history:
+            samples = self.history.samples(
+                stage,
+                media_type=media_type if stage == STAGE_SCENE else None,
+                profile=key if stage != STAGE_AUDIO else None
+            )
+            points = [(work, seconds / max(1, workers)) for work, seconds, workers in samples if work > 0]
+            model = self._fit(points)
+
+        self._models[cache_key] = model
+        return model
+
+    @staticmethod
+    def _fit(points: List[Tuple[float, float]]) -> Optional[Tuple[float, float]]:
+        """
+        最小二乗法で y = 切片 + 傾き * x を求める
+
+        件数が少ない・作業量がばらついていない場合は比率（切片0）にする。
+
+        Args:
+            points: (作業量, 秒数) のリスト
+
+        Returns:
+            (切片, 傾き)、点がない場合はNone
+        """
+        if not points:
+            return None
+
+        n = len(points)
+        sum_x = sum(x for x, _ in points)
+        sum_y = sum(y for _, y in points)
+        mean_x = sum_x / n
+        mean_y = sum_y / n
+        var_x = sum((x - mean_x) ** 2 for x, _ in points)
+
+        if n >= MIN_FIT_SAMPLES and var_x > 1e-9:
+            slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+            intercept = mean_y - slope * mean_x
+            if slope > 0 and intercept >= 0:
+                return intercept, slope
+
+        return 0.0, sum_y / sum_x
+
+    @staticmethod
+    def _default_cost(stage: str, media_type: str, key: str, work: float) -> float:
+        """
+        履歴がない場合の既定の所要時間
+
+        Returns:
+            秒数（マシン全体を使った場合）
+        """
+        if stage == STAGE_AUDIO:
+            fixed, per_char = DEFAULT_AUDIO_COST
+            return fixed + per_char * work
+
+        preset = key.split("/")[0]
+        preset_factor = PRESET_FACTORS.get(preset, 1.0)
+        intermediate = key.endswith("/intermediate")
+
+        if stage == STAGE_CONCAT:
+            if intermediate:
+                return DEFAULT_FINAL_ENCODE_RATE * preset_factor * work
+            return DEFAULT_COPY_CONCAT_RATE * work
+
+        scene_factor = INTERMEDIATE_SCENE_FACTOR if intermediate else preset_factor
+        return DEFAULT_SCENE_RATES.get(media_type, DEFAULT_SCENE_RATES["image"]) * scene_factor * work
@@ -0,0 +1,178 @@
+"""
+Render History
+書き出しにかかった時間の履歴（処理段階ごと、SQLiteに保存）
+"""
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from ..project import EncodingProfile
+
+
+# 処理段階
+STAGE_AUDIO = "audio"  # 会話音声の合成（作業量 = 文字数）
+STAGE_SCENE = "scene"  # シーン動画の生成（作業量 = 基準画質に換算した動画の秒数）
+STAGE_CONCAT = "concat"  # 結合・最終エンコード（作業量 = 同上）
+
+# 履歴の上限件数（古いものから削除）
+MAX_ROWS = 5000
+
+# 作業量の基準（1080p・30fps の動画1秒を 1.0 とする）
+REFERENCE_PIXELS = 1920 * 1080
+REFERENCE_FPS = 30
+
+
+def work_units(duration: float, resolution: str, fps: int) -> float:
+    """
+    動画の作業量を基準画質の秒数に換算
+
+    Args:
+        duration: 動画の長さ（秒）
+        resolution: 解像度 "WxH"
+        fps: フレームレート
+
+    Returns:
+        作業量（1080p・30fps なら秒数と同じ）
+    """
+    width, height = (int(v) for v in resolution.split("x"))
+    return duration * (width * height / REFERENCE_PIXELS) * (fps / REFERENCE_FPS)
+
+
+def profile_key(profile: EncodingProfile) -> str:
+    """
+    処理時間に影響するプロファイル設定の識別名（履歴の絞り込み用）
+
+    Args:
+        profile: エンコードプロファイル
+
+    Returns:
+        識別名（例: "medium/crf23" / "medium/crf23/intermediate"）
+    """
+    key = f"{profile.preset}/crf{profile.crf}"
+    if profile.intermediate:
+        key += "/intermediate"
+    return key
+
+
+class RenderHistory:
+    """書き出し時間の履歴管理クラス"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Args:
+            db_path: SQLiteファイルのパス（Noneなら一時ディレクトリ）
+        """
+        if db_path:
+            self.db_path = Path(db_path)
+        else:
+            import tempfile
+            self.db_path = Path(tempfile.gettempdir()) / "insightmovie_cache" / "render_history.sqlite3"
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS timings ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " recorded_at REAL NOT NULL,"
+                " stage TEXT NOT NULL,"
+                " media_type TEXT NOT NULL DEFAULT '',"
+                " profile TEXT NOT NULL DEFAULT '',"
+                " work REAL NOT NULL,"
+                " seconds REAL NOT NULL,"
+                " workers INTEGER NOT NULL DEFAULT 1"
+                ")"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS timings_stage ON timings (stage, media_type, profile)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """接続を開き、ブロックを抜けたらコミットして閉じる（呼び出しごとに使い捨て）"""
+        conn = sqlite3.connect(str(self.db_path), timeout=5.0)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def record(
+        self,
+        stage: str,
+        work: float,
+        seconds: float,
+        media_type: str = "",
+        profile: str = "",
+        workers: int = 1
+    ):
+        """
+        処理時間を記録（ワーカースレッドから呼ばれる）
+
+        Args:
+            stage: 処理段階（STAGE_*）
+            work: 作業量（段階ごとの単位）
+            seconds: かかった時間（秒）
+            media_type: メディアタイプ（シーン生成のみ）
+            profile: プロファイルの識別名（profile_key()）
+            workers: 同時に処理していたワーカー数
+        """
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    "INSERT INTO timings (recorded_at, stage, media_type, profile, work, seconds, workers)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (time.time(), stage, media_type, profile, work, seconds, workers)
+                )
+                conn.execute(
+                    "DELETE FROM timings WHERE id <= (SELECT MAX(id) FROM timings) - ?",
+                    (MAX_ROWS,)
+                )
+        except sqlite3.Error as e:
+            print(f"書き出し履歴の記録エラー: {e}")
+
+    def samples(
+        self,
+        stage: str,
+        media_type: Optional[str] = None,
+        profile: Optional[str] = None,
+        limit: int = 200
+    ) -> List[Tuple[float, float, int]]:
+        """
+        最近の記録を取得
+
+        Args:
+            stage: 処理段階
+            media_type: メディアタイプで絞り込む（Noneなら全て）
+            profile: プロファイルで絞り込む（Noneなら全て）
+            limit: 最大件数（新しい順）
+
+        Returns:
+            (作業量, 秒数, ワーカー数) のリスト
+        """
+        query = "SELECT work, seconds, workers FROM timings WHERE stage = ?"
+        params: list = [stage]
+        if media_type is not None:
+            query += " AND media_type = ?"
+            params.append(media_type)
+        if profile is not None:
+            query += " AND profile = ?"
+            params.append(profile)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+
+        try:
+            with self._connect() as conn:
+                return [tuple(row) for row in conn.execute(query, params)]
+        except sqlite3.Error as e:
+            print(f"書き出し履歴の読み込みエラー: {e}")
+            return []
+
+    def clear(self):
+        """すべての履歴を削除"""
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM timings")
@@ -0,0 +1,858 @@
+"""
+Render Job
+動画書き出しジョブ（UIから独立した処理本体）
+"""
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import replace
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .clip_cache import SceneClipCache
+from .ffmpeg_wrapper import FFmpegWrapper, FFmpegResult, STEP_LABELS, STEP_STREAM_COPY
+from .job_manifest import JobManifest
+from .proxy_cache import MediaProxyCache
+from .render_history import RenderHistory, STAGE_AUDIO, STAGE_SCENE, STAGE_CONCAT, work_units, profile_key
+from .render_progress import RenderProgress, RenderProgressTracker
+from .scene_generator import SceneGenerator
+from .streaming_muxer import StreamingMuxer, SegmentSpool
+from .video_composer import VideoComposer
+from .workspace import RenderWorkspace
+from ..project import Project, Scene, DurationMode
+from ..voicevox import VoiceVoxClient, AudioCache, BatchSynthesizer
+
+
+# 1回のエンコードでffmpegに使わせるスレッド数の目安
+DEFAULT_FFMPEG_THREADS = 4
+
+
+class RenderCancelledError(Exception):
+    """書き出しがキャンセルされたエラー"""
+    pass
+
+
+def compute_worker_count(
+    scene_count: int,
+    ffmpeg_threads: int = DEFAULT_FFMPEG_THREADS,
+    cpu_count: Optional[int] = None
+) -> int:
+    """
+    並列レンダリングのワーカー数を算出
+
+    Args:
+        scene_count: シーン数
+        ffmpeg_threads: 1エンコードあたりのffmpegスレッド数
+        cpu_count: CPUコア数（Noneなら自動取得）
+
+    Returns:
+        ワーカー数（1以上、シーン数以下）
+    """
+    cpu_count = cpu_count or os.cpu_count() or 1
+    workers = max(1, cpu_count // max(1, ffmpeg_threads))
+    return max(1, min(workers, scene_count))
+
+
+def format_step_breakdown(results: List[FFmpegResult]) -> List[str]:
+    """
+    ffmpegの実行結果を処理段階ごとに集計（時間のかかった順）
+
+    並列に実行した分も足すため、合計は書き出しの経過時間より長くなる。
+
+    Args:
+        results: 実行結果のリスト
+
+    Returns:
+        表示用の行のリスト（例: "字幕焼き込み: 12.3秒 (8回, CPU 40.1秒, 最大メモリ 350MB)"）
+    """
+    by_step: Dict[str, List[FFmpegResult]] = {}
+    for result in results:
+        by_step.setdefault(result.step, []).append(result)
+
+    lines = []
+    for step, step_results in sorted(by_step.items(), key=lambda item: -sum(r.wall_seconds for r in item[1])):
+        wall_seconds = sum(result.wall_seconds for result in step_results)
+        cpu_seconds = [result.cpu_seconds for result in step_results if result.cpu_seconds is not None]
+        peak_rss = [result.peak_rss for result in step_results if result.peak_rss is not None]
+
+        details = [f"{len(step_results)}回"]
+        if cpu_seconds:
+            details.append(f"CPU {sum(cpu_seconds):.1f}秒")
+        if peak_rss:
+            details.append(f"最大メモリ {max(peak_rss) / (1024 * 1024):.0f}MB")
+        label = STEP_LABELS.get(step, step or "その他")
+        lines.append(f"{label}: {wall_seconds:.1f}秒 ({', '.join(details)})")
+    return lines
+
+
+class RenderJob:
+    """動画書き出しジョブ"""
+
+    def __init__(
+        self,
+        project: Project,
+        voicevox_client: VoiceVoxClient,
+        audio_cache: AudioCache,
+        ffmpeg: FFmpegWrapper,
+        speaker_id: int,
+        max_workers: Optional[int] = None,
+        progress_callback: Optional[Callable[[str], None]] = None,
+        clip_cache: Optional[SceneClipCache] = None,
+        proxy_cache: Optional[MediaProxyCache] = None,
+        streaming: Optional[bool] = None,
+        resume: bool = False,
+        progress_event_callback: Optional[Callable[[RenderProgress], None]] = None,
+        history: Optional[RenderHistory] = None
+    ):
+        """
+        Args:
+            project: 書き出すプロジェクト
+            voicevox_client: VOICEVOXクライアント
+            audio_cache: 音声キャッシュ
+            ffmpeg: FFmpegWrapperインスタンス
+            speaker_id: プロジェクトデフォルトの話者ID
+            max_workers: 同時にレンダリングするシーン数（Noneならプロジェクト設定→自動）
+            progress_callback: 進捗メッセージの通知先
+            clip_cache: シーン動画キャッシュ（Noneなら毎回すべて生成）
+            proxy_cache: 縮小済みメディアのキャッシュ（Noneなら毎回元メディアを縮小）
+            streaming: シーン動画をファイルに書かずパイプで書き出すか
+                       （Noneならプロジェクト設定）
+            resume: 前回失敗した書き出しのマニフェストから再開するか
+                    （完了済みのシーンは生成し直さない。ストリーミング書き出しは使わない）
+            progress_event_callback: 進捗イベント（割合・速度・残り時間）の通知先
+                                     （ワーカースレッドから呼ばれる）
+            history: 処理時間を記録する書き出し履歴（書き出し時間の予測に使う）
+        """
+        self.project = project
+        self.voicevox = voicevox_client
+        self.audio_cache = audio_cache
+        self.ffmpeg = ffmpeg
+        self.speaker_id = speaker_id
+        self.progress_callback = progress_callback
+        self.progress_event_callback = progress_event_callback
+        self.tracker: Optional[RenderProgressTracker] = None
+        self.history = history
+        self.clip_cache = clip_cache
+        self.proxy_cache = proxy_cache
+        self.streaming = project.settings.streaming_export if streaming is None else streaming
+        self.resume = resume
+        if self.resume:
+            # 完了済みのシーン動画はファイルとして残っているため、ファイル経由で結合する
+            self.streaming = False
+        self._lock = threading.Lock()
+        self.workspace: Optional[RenderWorkspace] = None
+        self.manifest: Optional[JobManifest] = None
+
+        # 結合が終わるまでキャッシュの整理で消されないよう pin したシーン動画
+        self._pinned_clips: List[str] = []
+
+        # このジョブで実行したffmpegの実行結果（処理段階ごとの時間の内訳に使う）
+        self.ffmpeg_results: List[FFmpegResult] = []
+
+        # cancel() で完了する目印（完了待ちのループに混ぜて、すぐに抜けられるようにする）
+        self._cancel_future: Future = Future()
+
+        self.profile = project.output.profile
+        self.resolution = project.output.render_resolution
+        if self.streaming and self.profile.intermediate:
+            # ストリーミング書き出しはシーンごとに最終設定で1回だけエンコードするため、
+            # 中間コーデックは使わない
+            self.profile = replace(self.profile, intermediate=False)
+
+        scene_count = max(1, len(project.scenes))
+        workers = max_workers or project.settings.render_workers
+        if workers and workers > 0:
+            self.max_workers = min(workers, scene_count)
+            self.ffmpeg_threads = self.profile.threads or max(1, (os.cpu_count() or 1) // self.max_workers)
+        else:
+            self.ffmpeg_threads = self.profile.threads or DEFAULT_FFMPEG_THREADS
+            self.max_workers = compute_worker_count(scene_count, self.ffmpeg_threads)
+
+    def _emit(self, message: str):
+        """進捗メッセージを通知"""
+        if self.progress_callback:
+            self.progress_callback(message)
+        else:
+            print(message)
+
+    def _record(self, stage: str, work: float, seconds: float, media_type: str = "", workers: Optional[int] = None):
+        """
+        処理時間を書き出し履歴に記録
+
+        Args:
+            stage: 処理段階
+            work: 作業量
+            seconds: かかった時間（秒）
+            media_type: メディアタイプ（シーン生成のみ）
+            workers: 同時に処理していたワーカー数（Noneならジョブの並列数）
+        """
+        if self.history:
+            self.history.record(
+                stage,
+                work,
+                seconds,
+                media_type=media_type,
+                profile=profile_key(self.profile),
+                workers=workers or self.max_workers
+            )
+
+    def _record_scene(self, scene: Scene, duration: float, seconds: float):
+        """シーン動画の生成時間を書き出し履歴に記録"""
+        work = work_units(duration, self.resolution, self.project.output.fps)
+        self._record(STAGE_SCENE, work, seconds, media_type=scene.media_type.value)
+
+    def _add_results(self, results: List[FFmpegResult]):
+        """ffmpegの実行結果をジョブの記録に追加（ワーカースレッドから呼ばれる）"""
+        with self._lock:
+            self.ffmpeg_results.extend(results)
+
+    def _emit_step_breakdown(self):
+        """ffmpegの処理段階ごとの所要時間（延べ）を通知"""
+        lines = format_step_breakdown(self.ffmpeg_results)
+        if lines:
+            self._emit("ffmpeg処理時間の内訳（延べ）:")
+            for line in lines:
+                self._emit(f"  {line}")
+
+    def _emit_scene_done(self, i: int, completed: int, total: int):
+        """シーン完了のメッセージを全体の進捗・残り時間つきで通知"""
+        progress = self.tracker.snapshot(i)
+        self._emit(
+            f"✓ シーン {i} 完了 ({completed}/{total}) "
+            f"全体 {progress.percent:.0f}% / 残り {progress.format_eta()}"
+        )
+
+    @property
+    def cancelled(self) -> bool:
+        """cancel() されたか"""
+        return self._cancel_future.done()
+
+    def cancel(self):
+        """
+        書き出しを中止（別スレッドから呼ぶ）
+
+        実行中のffmpegを終了させ、未着手のシーンと音声合成を取り消す。
+        run() は応答待ちの音声合成を待たずに戻り、作業ディレクトリを削除する。
+        完了済みのシーンはマニフェストに残るため、後から再開できる。
+        """
+        with self._lock:
+            if self._cancel_future.done():
+                return
+            self._cancel_future.set_result(None)
+        self._emit("書き出しを中止しています...")
+        self.ffmpeg.cancel()
+
+    def _check_cancelled(self):
+        """
+        キャンセルされていれば中断
+
+        Raises:
+            RenderCancelledError: cancel() されている場合
+        """
+        if self.cancelled:
+            raise RenderCancelledError()
+
+    def _as_completed(self, futures: Iterable[Future]) -> Iterator[Future]:
+        """
+        as_completed と同じだが、キャンセルされたら残りを待たずに中断
+
+        Raises:
+            RenderCancelledError: cancel() された場合
+        """
+        futures = list(futures)
+        remaining = len(futures)
+        for future in as_completed([*futures, self._cancel_future]):
+            if future is self._cancel_future:
+                raise RenderCancelledError()
+            yield future
+            remaining -= 1
+            if remaining == 0:
+                return
+
+    def run(self) -> Tuple[bool, str]:
+        """
+        書き出しを実行
+
+        Returns:
+            (成功/失敗, メッセージ)
+        """
+        if self.cancelled:
+            return False, "書き出しをキャンセルしました"
+        self.ffmpeg.reset_cancel()
+        self.ffmpeg_results = []
+        self._pinned_clips = []
+
+        # 異常終了したジョブの作業ディレクトリを片付けてから、このジョブ専用の作業ディレクトリを作る
+        workspace_dir = self.project.settings.workspace_dir
+        removed = RenderWorkspace.sweep_stale(workspace_dir)
+        if removed:
+            self._emit(f"前回の作業ディレクトリを削除しました: {removed} 件")
+        self.workspace = RenderWorkspace(workspace_dir)
+
+        # 成功・失敗・例外のいずれでも中間ファイルを残さない
+        try:
+            if self.streaming:
+                return self._run_streaming()
+            return self._run_files()
+        except RenderCancelledError:
+            return False, "書き出しをキャンセルしました"
+        finally:
+            self.workspace.cleanup()
+            self.workspace = None
+            if self.clip_cache:
+                self.clip_cache.unpin(self._pinned_clips)
+                self._pinned_clips = []
+
+    def _run_files(self) -> Tuple[bool, str]:
+        """
+        シーン動画をファイルに生成してから結合する書き出し
+
+        Returns:
+            (成功/失敗, メッセージ)
+        """
+        try:
+            self._emit("動画生成を開始します...")
+
+            scenes = self.project.scenes
+            total = len(scenes)
+
+            # 完了したシーンをマニフェストに記録し、失敗しても途中から再開できるようにする
+            self.manifest = JobManifest.for_output(
+                self.project.output.output_path,
+                self.project.settings.workspace_dir
+            )
+            if self.resume and self.manifest.load():
+                self._emit(f"前回の書き出しを再開します（完了済み: {self.manifest.completed_count}/{total} シーン）")
+            else:
+                self.manifest.reset(total)
+
+            self._emit(
+                f"プロファイル: {self.profile.name} "
+                f"(preset={self.profile.preset}, crf={self.profile.crf}, {self.resolution})"
+            )
+            self._emit(self.ffmpeg.encoder_policy.describe())
+            self._emit(
+                f"並列レンダリング: ワーカー {self.max_workers} / "
+                f"ffmpegスレッド {self.ffmpeg_threads}"
+            )
+
+            # 各シーンを並列生成（結果はプロジェクト順に並べる）
+            scene_videos: List[Optional[str]] = [None] * total
+            failed_index: Optional[int] = None
+            completed = 0
+            self._reused = 0
+            self._resumed = 0
+            self.tracker = RenderProgressTracker(
+                [scene.fixed_seconds for scene in scenes],
+                final_encode=self.profile.intermediate,
+                callback=self.progress_event_callback
+            )
+
+            executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            try:
+                self._synthesize_narrations(executor)
+                futures = {
+                    executor.submit(self._render_scene, i, scene): i
+                    for i, scene in enumerate(scenes, 1)
+                }
+                for future in self._as_completed(futures):
+                    i = futures[future]
+                    video_path = future.result()
+                    if not video_path:
+                        failed_index = i
+                        break
+                    scene_videos[i - 1] = video_path
+                    completed += 1
+                    self.tracker.finish_scene(i)
+                    self._emit_scene_done(i, completed, total)
+            finally:
+                # 失敗時は未着手のシーンを取り消す（キャンセル時は応答待ちの音声合成を待たない）
+                executor.shutdown(
+                    wait=not self.cancelled,
+                    cancel_futures=failed_index is not None or self.cancelled
+                )
+
+            self._check_cancelled()
+            if failed_index is not None:
+                return False, (
+                    f"シーン {failed_index} の生成に失敗しました"
+                    f"（完了済み {self.manifest.completed_count}/{total} シーンから再開できます）"
+                )
+
+            if self._resumed:
+                self._emit(f"前回の書き出しから再開: {self._resumed}/{total} シーン")
+            if self.clip_cache:
+                self._emit(f"キャッシュ再利用: {self._reused}/{total} シーン")
+
+            # 動画を結合
+            if self.profile.intermediate:
+                self._emit("動画を結合・最終エンコード中...")
+            else:
+                self._emit("動画を結合中...")
+            composer = VideoComposer(self.ffmpeg, self.profile, self.workspace)
+
+            self.tracker.start_concat()
+            started_at = time.monotonic()
+            with self.ffmpeg.report_progress(lambda progress: self.tracker.update_concat(progress.out_time)), \
+                    self.ffmpeg.collect_results() as results:
+                success = composer.concat_videos(
+                    scene_videos,
+                    self.project.output.output_path
+                )
+            self._add_results(results)
+            self._check_cancelled()
+
+            if success:
+                total_work = sum(
+                    work_units(duration, self.resolution, self.project.output.fps)
+                    for duration in self.tracker.durations.values()
+                )
+                self._record(STAGE_CONCAT, total_work, time.monotonic() - started_at, workers=1)
+                # 書き出しが完了したので再開用の記録は不要
+                self.manifest.discard()
+                self._emit_step_breakdown()
+                return True, f"動画を保存しました: {self.project.output.output_path}"
+            return False, "動画の結合に失敗しました（シーン生成は完了済みのため再開できます）"
+
+        except RenderCancelledError:
+            raise
+        except Exception as e:
+            return False, f"エラー: {str(e)}"
+
+    def _run_streaming(self) -> Tuple[bool, str]:
+        """
+        ストリーミング書き出し（シーン動画を中間ファイルにしない）
+
+        各シーンをMPEG-TSで標準出力に生成し、1つのマルチプレクサに
+        プロジェクト順に流し込む。順番が来ているシーンはffmpegの出力をそのまま
+        書き込み、先に生成が進んだシーンは SegmentSpool に保持する（一定量を
+        超えた分だけ作業ディレクトリに書き出す）。キャッシュ済みのシーン動画は
+        読み出して使うが、新しい動画はキャッシュに保存しない。
+
+        Returns:
+            (成功/失敗, メッセージ)
+        """
+        muxer = None
+        spools: List[SegmentSpool] = []
+        try:
+            self._emit("動画生成を開始します（ストリーミング書き出し）...")
+
+            scenes = self.project.scenes
+            total = len(scenes)
+            if total == 0:
+                return False, "結合する動画がありません"
+            self._emit(
+                f"プロファイル: {self.profile.name} "
+                f"(preset={self.profile.preset}, crf={self.profile.crf}, {self.resolution})"
+            )
+            self._emit(self.ffmpeg.encoder_policy.describe())
+            self._emit(
+                f"並列レンダリング: ワーカー {self.max_workers} / "
+                f"ffmpegスレッド {self.ffmpeg_threads}"
+            )
+
+            executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            try:
+                # 1. 会話音声を用意し、各シーンの長さから開始時刻を確定
+                self._synthesize_narrations(executor)
+                audio_futures = [
+                    executor.submit(self._prepare_audio, i, scene)
+                    for i, scene in enumerate(scenes, 1)
+                ]
+                for _ in self._as_completed(audio_futures):
+                    pass
+                prepared = [future.result() for future in audio_futures]
+                generator = self._create_generator()
+                starts = []
+                output_durations = []
+                position = 0.0
+                for scene, (_, duration) in zip(scenes, prepared):
+                    starts.append(position)
+                    output_durations.append(generator.get_output_duration(scene, duration, self.project.output.fps))
+                    position += output_durations[-1]
+                self.tracker = RenderProgressTracker(
+                    output_durations,
+                    final_encode=False,
+                    callback=self.progress_event_callback
+                )
+
+                # 2. マルチプレクサを起動し、生成できたシーンから順に流し込む
+                muxer = StreamingMuxer(self.ffmpeg, self.project.output.output_path)
+                if not muxer.start():
+                    return False, "マルチプレクサの起動に失敗しました"
+
+                self._reused = 0
+                spools = [SegmentSpool(self.workspace) for _ in scenes]
+                # 先頭のシーンは最初からマルチプレクサに直接流し込む
+                spools[0].attach(muxer)
+                futures = {
+                    executor.submit(
+                        self._render_segment, i, scene, audio_path, duration, starts[i - 1], spools[i - 1]
+                    ): i
+                    for i, (scene, (audio_path, duration)) in enumerate(zip(scenes, prepared), 1)
+                }
+                finished = set()
+                next_index = 1
+                completed = 0
+                failed_index: Optional[int] = None
+                muxer_failed = False
+                for future in self._as_completed(futures):
+                    i = futures[future]
+                    if not future.result():
+                        if spools[i - 1].muxer_failed:
+                            muxer_failed = True
+                        else:
+                            failed_index = i
+                        break
+                    finished.add(i)
+                    completed += 1
+                    self.tracker.finish_scene(i)
+                    self._emit_scene_done(i, completed, total)
+
+                    # 前のシーンまで書き込み終えたら、次のシーンをマルチプレクサにつなぐ
+                    # （保持していた分を書き込み、以降は生成中のデータをそのまま流し込む）
+                    while next_index in finished:
+                        next_index += 1
+                        if next_index <= total and not spools[next_index - 1].attach(muxer):
+                            muxer_failed = True
+                            break
+                    if muxer_failed:
+                        break
+
+                self._check_cancelled()
+                if muxer_failed:
+                    return False, self._muxer_failure("マルチプレクサへの書き込みに失敗しました", muxer.abort())
+                if failed_index is not None:
+                    muxer.abort()
+                    return False, f"シーン {failed_index} の生成に失敗しました"
+            finally:
+                # 生成中のシーンは受け取りをやめて止め、保持していたデータを破棄する
+                for spool in spools:
+                    spool.discard()
+                # 失敗時は未着手のシーンを取り消す（キャンセル時は応答待ちの音声合成を待たない）
+                executor.shutdown(wait=not self.cancelled, cancel_futures=True)
+
+            if self.clip_cache:
+                self._emit(f"キャッシュ再利用: {self._reused}/{total} シーン")
+
+            self._emit("書き出しを完了中...")
+            self.tracker.start_concat()
+            result = muxer.finish()
+            self._add_results([result])
+            if result:
+                self._emit_step_breakdown()
+                return True, f"動画を保存しました: {self.project.output.output_path}"
+            muxer.abort()
+            self._check_cancelled()
+            return False, self._muxer_failure("動画の書き出しに失敗しました", result.stderr_tail)
+
+        except RenderCancelledError:
+            if muxer:
+                muxer.abort()
+            raise
+        except Exception as e:
+            if muxer:
+                muxer.abort()
+            return False, f"エラー: {str(e)}"
+
+    @staticmethod
+    def _muxer_failure(message: str, stderr_tail: str) -> str:
+        """
+        マルチプレクサの失敗メッセージ（エラー出力の末尾を付ける）
+
+        Args:
+            message: 失敗の内容
+            stderr_tail: マルチプレクサのエラー出力の末尾
+
+        Returns:
+            表示用メッセージ
+        """
+        if not stderr_tail:
+            return message
+        return f"{message}（マルチプレクサのエラー出力）:\n{stderr_tail[-1000:]}"
+
+    def _create_generator(self) -> SceneGenerator:
+        """ジョブの設定でSceneGeneratorを作成"""
+        return SceneGenerator(
+            self.ffmpeg,
+            self.project.settings.font_path,
+            threads=self.ffmpeg_threads,
+            proxy_cache=self.proxy_cache,
+            profile=self.profile,
+            workspace=self.workspace
+        )
+
+    def _render_segment(
+        self,
+        i: int,
+        scene: Scene,
+        audio_path: Optional[str],
+        total_duration: float,
+        start: float,
+        spool: SegmentSpool
+    ) -> bool:
+        """
+        1シーンをMPEG-TSセグメントとして生成（ワーカースレッドで実行）
+
+        Args:
+            i: シーン番号（1始まり）
+            scene: シーンデータ
+            audio_path: 会話音声ファイルパス
+            total_duration: シーンの長さ（無音含む）
+            start: 最終動画内でのシーン開始時刻（秒）
+            spool: セグメントの受け取り先
+
+        Returns:
+            成功したらTrue（マルチプレクサへの書き込みに失敗した場合は spool.muxer_failed）
+        """
+        prefix = f"[シーン {i}]"
+        try:
+            self._check_cancelled()
+            scene.audio_cache_path = audio_path
+            generator = self._create_generator()
+            output_args = StreamingMuxer.segment_args(start)
+
+            # キャッシュ済みのシーン動画があれば読み出すだけにする
+            if self.clip_cache:
+                fingerprint = SceneClipCache.get_fingerprint(
+                    scene,
+                    total_duration,
+                    self.resolution,
+                    self.project.output.fps,
+                    audio_path,
+                    generator.font_path,
+                    generator.encoder_settings()
+                )
+                cached_path = self.clip_cache.lookup(fingerprint, pin=True)
+                if cached_path:
+                    self._emit(f"{prefix} ✓ キャッシュ済み動画を再利用: {Path(cached_path).name}")
+                    scene.video_cache_path = cached_path
+                    with self._lock:
+                        self._reused += 1
+                        self._pinned_clips.append(cached_path)
+                    with self.ffmpeg.collect_results() as results:
+                        success = self.ffmpeg.run_to_pipe(
+                            ["-i", cached_path, "-c", "copy", *output_args], spool.write, step=STEP_STREAM_COPY
+                        )
+                    self._add_results(results)
+                    return success
+
+            self._emit(f"{prefix} 動画を生成中...")
+            started_at = time.monotonic()
+            with self.ffmpeg.report_progress(lambda progress: self.tracker.update_scene(i, progress.out_time)), \
+                    self.ffmpeg.collect_results() as results:
+                success = generator.generate_segment(
+                    scene,
+                    total_duration,
+                    self.resolution,
+                    self.project.output.fps,
+                    audio_path,
+                    output_args,
+                    spool.write
+                )
+            self._add_results(results)
+            if not success:
+                if not self.cancelled and not spool.rejected:
+                    self._emit(f"{prefix} ✗ 動画生成失敗")
+                return False
+
+            self._record_scene(scene, total_duration, time.monotonic() - started_at)
+            return True
+
+        except RenderCancelledError:
+            return False
+        except Exception as e:
+            self._emit(f"{prefix} ✗ エラー: {e}")
+            return False
+
+    def _synthesize_narrations(self, executor: ThreadPoolExecutor):
+        """
+        全シーンの会話音声をまとめて合成し、音声キャッシュにそろえる
+
+        シーンの生成では音声をキャッシュから読むだけになる。合成できなかった
+        音声は、シーンの生成時に1件ずつ合成し直す。
+
+        Args:
+            executor: 合成を実行するスレッドプール（完了待ちの間もキャンセルできるようにする）
+        """
+        items = [
+            (scene.narration_text, scene.speaker_id if scene.speaker_id is not None else self.speaker_id)
+            for scene in self.project.scenes
+            if scene.has_narration
+        ]
+        pending = self.audio_cache.missing(items)
+        if not pending:
+            return
+
+        self._emit(f"会話音声をまとめて生成中（VOICEVOX）: {len(pending)} 件...")
+        synthesizer = BatchSynthesizer(self.voicevox, self.audio_cache)
+        future = executor.submit(synthesizer.synthesize, pending, lambda: self.cancelled)
+        for _ in self._as_completed([future]):
+            pass
+        result = future.result()
+
+        for chars, seconds in result.timings:
+            self._record(STAGE_AUDIO, chars, seconds, workers=synthesizer.max_workers)
+        self._emit(f"✓ 会話音声の生成完了: {len(result.synthesized)} 件 ({result.seconds:.1f}秒)")
+        if result.failed:
+            self._emit(f"✗ 会話音声の生成に失敗: {len(result.failed)} 件（シーンの生成時に再試行します）")
+
+    def _prepare_audio(self, i: int, scene: Scene) -> Tuple[Optional[str], float]:
+        """
+        シーンの会話音声を用意し、シーンの長さを決定
+
+        Args:
+            i: シーン番号（1始まり）
+            scene: シーンデータ
+
+        Returns:
+            (音声ファイルパス or None, シーンの長さ（無音含む）)
+        """
+        prefix = f"[シーン {i}]"
+        total_duration = scene.fixed_seconds
+
+        if not scene.has_narration:
+            self._emit(f"{prefix} ナレーションなし（音声スキップ）")
+            return None, total_duration
+
+        self._check_cancelled()
+
+        # シーンごとの話者ID（指定がなければプロジェクトデフォルトを使用）
+        scene_speaker_id = scene.speaker_id if scene.speaker_id is not None else self.speaker_id
+
+        # キャッシュチェック
+        if self.audio_cache.exists(scene.narration_text, scene_speaker_id):
+            audio_path = self.audio_cache.get_cache_path(scene.narration_text, scene_speaker_id)
+            duration = self.audio_cache.get_duration(scene.narration_text, scene_speaker_id)
+            self._emit(f"{prefix} ✓ 音声をキャッシュから取得: {Path(audio_path).name} ({duration:.2f}秒)")
+        else:
+            # 新規生成
+            self._emit(f"{prefix} 音声を生成中（VOICEVOX）...")
+            started_at = time.monotonic()
+            audio_data = self.voicevox.generate_audio(scene.narration_text, scene_speaker_id)
+            if not audio_data:
+                raise RuntimeError("音声生成に失敗しました")
+            self._record(STAGE_AUDIO, len(scene.narration_text), time.monotonic() - started_at)
+
+            audio_path = self.audio_cache.save(scene.narration_text, scene_speaker_id, audio_data)
+            duration = AudioCache.get_audio_duration_from_bytes(audio_data)
+            self._emit(f"{prefix} ✓ 音声生成完了: {Path(audio_path).name} ({duration:.2f}秒)")
+
+        # 前後に無音パディングを追加するため+2秒
+        silence_padding = 2.0  # 前後1秒ずつ
+
+        if scene.duration_mode == DurationMode.AUTO:
+            # 音声長に合わせる（+無音パディング）
+            if duration:
+                total_duration = duration + silence_padding
+                scene.fixed_seconds = total_duration
+                self._emit(f"{prefix} シーン長さを音声に合わせる: {duration:.2f}秒 + 無音{silence_padding}秒 = {total_duration:.2f}秒")
+        else:
+            # 固定長使用
+            total_duration = scene.fixed_seconds
+            self._emit(f"{prefix} 固定長を使用: {total_duration:.2f}秒")
+
+        return str(audio_path), total_duration
+
+    def _render_scene(self, i: int, scene: Scene) -> Optional[str]:
+        """
+        1シーンを生成（ワーカースレッドで実行）
+
+        Args:
+            i: シーン番号（1始まり）
+            scene: シーンデータ
+
+        Returns:
+            生成したシーン動画のパス、失敗時はNone
+        """
+        prefix = f"[シーン {i}]"
+        try:
+            self._check_cancelled()
+            self._emit(f"{prefix} 処理開始 / 字幕: {scene.subtitle_text if scene.has_subtitle else 'なし'}")
+
+            audio_path, total_duration = self._prepare_audio(i, scene)
+            scene.audio_cache_path = audio_path
+            self.tracker.set_duration(i, total_duration)
+
+            self._check_cancelled()
+            generator = self._create_generator()
+            fingerprint = SceneClipCache.get_fingerprint(
+                scene,
+                total_duration,
+                self.resolution,
+                self.project.output.fps,
+                audio_path,
+                generator.font_path,
+                generator.encoder_settings()
+            )
+
+            # 前回の書き出しで完了していれば再利用
+            resumed_path = self.manifest.lookup(i, fingerprint)
+            if resumed_path:
+                self._emit(f"{prefix} ✓ 前回の書き出しで完了済み: {Path(resumed_path).name}")
+                if self.clip_cache:
+                    self.clip_cache.pin(resumed_path)
+                with self._lock:
+                    self._resumed += 1
+                    if self.clip_cache:
+                        self._pinned_clips.append(resumed_path)
+                return resumed_path
+
+            # キャッシュ済みのシーン動画があれば再利用
+            if self.clip_cache:
+                cached_path = self.clip_cache.lookup(fingerprint, generator.clip_suffix, pin=True)
+                if cached_path:
+                    self._emit(f"{prefix} ✓ キャッシュ済み動画を再利用: {Path(cached_path).name}")
+                    scene.video_cache_path = cached_path
+                    with self._lock:
+                        self._reused += 1
+                        self._pinned_clips.append(cached_path)
+                    self.manifest.record(i, fingerprint, cached_path)
+                    return cached_path
+
+            # 生成中のシーン動画は作業ディレクトリに置き、完成したものだけキャッシュに移す
+            scene_video_path = Path(self.workspace.new_file(generator.clip_suffix, f"scene_{i:03d}"))
+
+            # シーン動画生成
+            self._emit(f"{prefix} 動画を生成中...")
+            started_at = time.monotonic()
+            with self.ffmpeg.report_progress(lambda progress: self.tracker.update_scene(i, progress.out_time)), \
+                    self.ffmpeg.collect_results() as results:
+                success = generator.generate_scene(
+                    scene,
+                    str(scene_video_path),
+                    total_duration,
+                    self.resolution,
+                    self.project.output.fps,
+                    audio_path
+                )
+            self._add_results(results)
+
+            if not success or self.cancelled:
+                if not self.cancelled:
+                    self._emit(f"{prefix} ✗ 動画生成失敗")
+                if scene_video_path.exists():
+                    scene_video_path.unlink()
+                return None
+
+            self._record_scene(scene, total_duration, time.monotonic() - started_at)
+
+            if self.clip_cache:
+                scene.video_cache_path = self.clip_cache.commit(
+                    fingerprint, str(scene_video_path), generator.clip_suffix, pin=True
+                )
+                clip_path = scene.video_cache_path
+                with self._lock:
+                    self._pinned_clips.append(clip_path)
+            else:
+                # 作業ディレクトリは終了時に消えるため、再開用にマニフェスト側へ移す
+                clip_path = self.manifest.keep_clip(i, str(scene_video_path))
+            self.manifest.record(i, fingerprint, clip_path)
+            return clip_path
+
+        except RenderCancelledError:
+            return None
+        except Exception as e:
+            self._emit(f"{prefix} ✗ エラー: {e}")
+            return None
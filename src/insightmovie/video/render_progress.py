@@ -0,0 +1,189 @@
+"""
+Render Progress
+書き出しジョブの進捗（割合・速度・残り時間）の集計
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+
+# 結合が再エンコードでない（ストリームコピーの）場合の重み（シーン生成に比べてほぼ一瞬）
+COPY_CONCAT_WEIGHT = 0.02
+
+
+def format_seconds(seconds: float) -> str:
+    """
+    秒数を表示用の文字列にする
+
+    Args:
+        seconds: 秒数
+
+    Returns:
+        "45秒" / "3分20秒" / "1時間5分" 形式の文字列
+    """
+    minutes, seconds = divmod(int(seconds + 0.5), 60)
+    if minutes >= 60:
+        return f"{minutes // 60}時間{minutes % 60}分"
+    if minutes:
+        return f"{minutes}分{seconds:02d}秒"
+    return f"{seconds}秒"
+
+
+@dataclass
+class RenderProgress:
+    """書き出しの進捗イベント"""
+    stage: str  # "scenes"（シーン生成）/ "concat"（結合・最終エンコード）
+    completed_scenes: int
+    scene_count: int
+    percent: float  # 全体の進捗（0〜100）
+    speed: float  # 実時間1秒あたりに処理した動画の秒数（並列分を含む）
+    eta_seconds: Optional[float]  # 残り時間の見込み（まだ見積もれない場合はNone）
+    scene_index: Optional[int] = None  # 進捗が更新されたシーン（1始まり）
+
+    def format_eta(self) -> str:
+        """残り時間を表示用の文字列にする"""
+        if self.eta_seconds is None:
+            return "計算中"
+        return format_seconds(self.eta_seconds)
+
+
+class RenderProgressTracker:
+    """
+    シーンごとのffmpegの進捗を集計して RenderProgress を通知
+
+    作業量は「処理する動画の秒数」で数える。シーン生成は各シーンの長さ、
+    結合は最終エンコードがあれば全体の長さ（なければごく小さい重み）とし、
+    経過時間と処理済みの秒数から残り時間を見積もる。
+    """
+
+    def __init__(
+        self,
+        scene_durations: List[float],
+        final_encode: bool,
+        callback: Optional[Callable[[RenderProgress], None]] = None
+    ):
+        """
+        Args:
+            scene_durations: 各シーンの長さの見込み（秒、音声を用意したら set_duration() で更新）
+            final_encode: 結合時に再エンコードするか（中間コーデック使用時）
+            callback: 進捗イベントの通知先
+        """
+        self.durations: Dict[int, float] = {
+            i: max(0.0, duration) for i, duration in enumerate(scene_durations, 1)
+        }
+        self.final_encode = final_encode
+        self.callback = callback
+
+        self._done: Dict[int, float] = {}
+        self._finished = set()
+        self._concat_done = 0.0
+        self._stage = "scenes"
+        self._started_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def scene_count(self) -> int:
+        """シーン数"""
+        return len(self.durations)
+
+    @property
+    def completed_scenes(self) -> int:
+        """完了したシーン数"""
+        return len(self._finished)
+
+    def set_duration(self, index: int, duration: float):
+        """
+        シーンの長さを確定（会話音声の長さで決まる場合）
+
+        Args:
+            index: シーン番号（1始まり）
+            duration: シーンの長さ（秒）
+        """
+        with self._lock:
+            self.durations[index] = max(0.0, duration)
+
+    def update_scene(self, index: int, out_time: float):
+        """
+        シーンのエンコード位置を更新（ffmpegの進捗から呼ばれる）
+
+        Args:
+            index: シーン番号（1始まり）
+            out_time: 出力済みの長さ（秒）
+        """
+        with self._lock:
+            duration = self.durations.get(index, 0.0)
+            # 複数回に分けて生成する場合も後戻りさせない
+            self._done[index] = max(self._done.get(index, 0.0), min(out_time, duration))
+        self._publish(index)
+
+    def finish_scene(self, index: int):
+        """
+        シーンの完了を記録（キャッシュから再利用した場合も含む）
+
+        Args:
+            index: シーン番号（1始まり）
+        """
+        with self._lock:
+            self._done[index] = self.durations.get(index, 0.0)
+            self._finished.add(index)
+        self._publish(index)
+
+    def start_concat(self):
+        """結合段階に移る"""
+        with self._lock:
+            self._stage = "concat"
+            self._concat_done = 0.0
+        self._publish()
+
+    def update_concat(self, out_time: float):
+        """
+        結合のエンコード位置を更新
+
+        Args:
+            out_time: 出力済みの長さ（秒）
+        """
+        with self._lock:
+            self._concat_done = max(self._concat_done, min(out_time, self._media_seconds()))
+        self._publish()
+
+    def snapshot(self, scene_index: Optional[int] = None) -> RenderProgress:
+        """
+        現在の進捗を取得
+
+        Args:
+            scene_index: 更新されたシーン番号
+
+        Returns:
+            RenderProgress
+        """
+        with self._lock:
+            media_seconds = self._media_seconds()
+            concat_weight = 1.0 if self.final_encode else COPY_CONCAT_WEIGHT
+            total = media_seconds * (1.0 + concat_weight)
+            done = sum(self._done.values()) + self._concat_done * concat_weight
+            stage = self._stage
+            completed = len(self._finished)
+
+        elapsed = time.monotonic() - self._started_at
+        percent = min(100.0, done / total * 100.0) if total > 0 else 0.0
+        speed = done / elapsed if elapsed > 0 else 0.0
+        eta = (total - done) / speed if speed > 0 else None
+        return RenderProgress(
+            stage=stage,
+            completed_scenes=completed,
+            scene_count=self.scene_count,
+            percent=percent,
+            speed=speed,
+            eta_seconds=eta,
+            scene_index=scene_index,
+        )
+
+    def _media_seconds(self) -> float:
+        """全シーンの長さの合計（ロック内で呼ぶ）"""
+        return sum(self.durations.values())
+
+    def _publish(self, scene_index: Optional[int] = None):
+        """進捗イベントを通知"""
+        if self.callback:
+            self.callback(self.snapshot(scene_index))
@@ -2,25 +2,136 @@
 Scene Generator
 1シーン動画生成
 """
-import tempfile
+import math
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Callable, List, Optional, Tuple
 
-from .ffmpeg_wrapper import FFmpegWrapper
-from ..project import Scene, MediaType
+from .ass_subtitle import build_ass_script, font_family_name
+from .encoder_policy import EncoderPolicy, SUBTITLE_DRAWTEXT, SUBTITLE_ASS
+from .ffmpeg_wrapper import (
+    FFmpegWrapper, STEP_SCALE, STEP_SUBTITLE, STEP_MUX, STEP_SINGLE_PASS, STEP_STREAM_COPY
+)
+from .proxy_cache import MediaProxyCache
+from .workspace import RenderWorkspace, make_temp_path
+from ..project import Scene, MediaType, EncodingProfile
 
 
 class SceneGenerator:
     """1シーン動画生成クラス"""
 
-    def __init__(self, ffmpeg: FFmpegWrapper, font_path: Optional[str] = None):
+    # すべてのシーン動画で揃えるストリーム構成
+    # （結合時に -c copy だけで済むよう、タイムベース・SAR・音声形式を統一）
+    VIDEO_TIMESCALE = 90000
+    AUDIO_CODEC_ARGS = ["-c:a", "aac", "-b:a", "192k", "-ar", "44100", "-ac", "2"]
+
+    # 中間コーデック（プロファイルの intermediate 有効時）
+    # 可逆・最速の映像（EncoderPolicy.lossless_video_args()）とPCM音声（.mov）で作り、
+    # 非可逆のエンコードは結合時の1回だけにする
+    INTERMEDIATE_AUDIO_ARGS = ["-c:a", "pcm_s16le", "-ar", "44100", "-ac", "2"]
+
+    # 静止画シーン用のエンコード引数（GOP長は fps × この秒数）
+    STILL_IMAGE_GOP_SECONDS = 10
+
+    # 動画プロキシを作るのは、元動画がシーンで使う長さのこの倍数以下の場合のみ
+    # （長い素材の一部だけ使うシーンで全体を変換しないため）
+    VIDEO_PROXY_MAX_RATIO = 2.0
+
+    def __init__(
+        self,
+        ffmpeg: FFmpegWrapper,
+        font_path: Optional[str] = None,
+        single_pass: bool = True,
+        threads: int = 0,
+        still_image_fast_path: bool = True,
+        proxy_cache: Optional[MediaProxyCache] = None,
+        profile: Optional[EncodingProfile] = None,
+        stream_copy: bool = True,
+        workspace: Optional[RenderWorkspace] = None
+    ):
         """
         Args:
             ffmpeg: FFmpegWrapperインスタンス
             font_path: 字幕用フォントパス（Noneならシステムフォント）
+            single_pass: 映像・字幕・音声を1回のffmpeg実行で生成するか
+                         （Falseなら従来の3ステップ処理）
+            threads: 1エンコードあたりのffmpegスレッド数（0ならプロファイルの値→自動）
+            still_image_fast_path: 画像シーンを1フレームだけ処理して複製する
+                                   静止画モードで生成するか（1パス生成時のみ）
+            proxy_cache: 縮小済みメディアのキャッシュ（Noneなら毎回元メディアを縮小）
+            profile: エンコードプロファイル（Noneなら balanced）
+            stream_copy: 出力と同じ形式（H.264/yuv420p/解像度/fps）の動画シーンを
+                         キーフレーム単位のストリームコピーで切り出すか（1パス生成時のみ）
+            workspace: 中間ファイルを置く作業ディレクトリ（Noneならシステムの一時ディレクトリ）
         """
         self.ffmpeg = ffmpeg
+        # エンコーダー・字幕描画方法（ffmpegなしで使う場合は従来の設定）
+        self.policy = ffmpeg.encoder_policy if ffmpeg else EncoderPolicy()
         self.font_path = font_path or self._find_default_font()
+        self.single_pass = single_pass
+        self.profile = profile or EncodingProfile()
+        self.intermediate = self.profile.intermediate
+        self.threads = threads or self.profile.threads
+        self.still_image_fast_path = still_image_fast_path
+        self.proxy_cache = proxy_cache
+        self.stream_copy = stream_copy
+        self.workspace = workspace
+
+    def _video_codec_args(self) -> List[str]:
+        """
+        映像エンコードの共通引数
+
+        Returns:
+            ffmpeg引数リスト
+        """
+        args = self._video_encoder_args()
+        args.extend(["-video_track_timescale", str(self.VIDEO_TIMESCALE)])
+        if self.threads > 0:
+            args.extend(["-threads", str(self.threads)])
+        return args
+
+    def _video_encoder_args(self) -> List[str]:
+        """
+        映像コーデックと品質の引数（中間コーデック使用時は可逆設定）
+
+        Returns:
+            ffmpeg引数リスト
+        """
+        if self.intermediate:
+            return self.policy.lossless_video_args()
+        return self.policy.video_args(self.profile)
+
+    def _audio_codec_args(self) -> List[str]:
+        """
+        音声エンコードの引数（中間コーデック使用時はPCM）
+
+        Returns:
+            ffmpeg引数リスト
+        """
+        if self.intermediate:
+            return list(self.INTERMEDIATE_AUDIO_ARGS)
+        return list(self.AUDIO_CODEC_ARGS)
+
+    @property
+    def clip_suffix(self) -> str:
+        """シーン動画の拡張子（PCM音声を入れる中間コーデックは .mov）"""
+        return ".mov" if self.intermediate else ".mp4"
+
+    def encoder_settings(self) -> dict:
+        """
+        出力内容に影響するエンコード設定（キャッシュのフィンガープリント用）
+
+        Returns:
+            設定の辞書
+        """
+        return {
+            'video': self._video_encoder_args(),
+            'audio': self._audio_codec_args(),
+            'timescale': self.VIDEO_TIMESCALE,
+            'single_pass': self.single_pass,
+            'still_image_fast_path': self.still_image_fast_path,
+            'stream_copy': self.stream_copy,
+            'subtitle_renderer': self.policy.subtitle_renderer,
+        }
 
     @staticmethod
     def _find_default_font() -> str:
@@ -118,6 +229,39 @@ class SceneGenerator:
             # 解像度をパース
             width, height = map(int, resolution.split('x'))
 
+            if self.single_pass:
+                video_info = self._probe_stream_copy(scene, duration, width, height, fps)
+                if video_info:
+                    print(f"\n[1/1] ストリームコピーで切り出し（映像は再エンコードしない）...")
+                    success = self._generate_stream_copy(
+                        scene,
+                        output_path,
+                        duration,
+                        fps,
+                        audio_path,
+                        video_info
+                    )
+                    if success:
+                        print(f"\n✓ シーン動画生成完了: {Path(output_path).name}")
+                        return True
+                    print(f"  ストリームコピーできないため再エンコードします")
+
+                print(f"\n[1/1] 1パス生成（映像・字幕・音声）...")
+                success = self._generate_single_pass(
+                    scene,
+                    output_path,
+                    duration,
+                    width,
+                    height,
+                    fps,
+                    audio_path
+                )
+                if success:
+                    print(f"\n✓ シーン動画生成完了: {Path(output_path).name}")
+                else:
+                    print(f"\n✗ シーン動画生成失敗")
+                return success
+
             # 一時ファイル
             temp_video = None
             has_original_audio = False  # 元動画の音声があるか
@@ -185,9 +329,14 @@ class SceneGenerator:
             if has_original_audio:
                 # 元動画の音声を残す場合：会話音声は追加せず、動画をそのまま使用
                 print(f"  元動画の音声を使用（会話音声は追加しない）")
-                import shutil
-                shutil.copy(temp_video, output_path)
-                success = True
+                video_info = self.ffmpeg.probe(temp_video, use_cache=False)
+                if video_info and not video_info.get('has_audio', True):
+                    # 元動画に音声がない場合は無音トラックを付与
+                    success = self._add_silent_audio(temp_video, output_path)
+                else:
+                    import shutil
+                    shutil.copy(temp_video, output_path)
+                    success = True
             elif audio_path:
                 print(f"  音声ファイル: {Path(audio_path).name}")
                 success = self._add_audio(temp_video, audio_path, output_path)
@@ -196,11 +345,9 @@ class SceneGenerator:
                 else:
                     print(f"  ✗ 音声合成失敗")
             else:
-                # 音声なし：そのままコピー
-                print(f"  音声なし（動画のみコピー）")
-                import shutil
-                shutil.copy(temp_video, output_path)
-                success = True
+                # 音声なし：結合時にストリーム構成が揃うよう無音トラックを付与
+                print(f"  音声なし（無音トラックを付与）")
+                success = self._add_silent_audio(temp_video, output_path)
 
             # 一時ファイル削除
             if Path(temp_video).exists():
@@ -219,6 +366,577 @@ class SceneGenerator:
             traceback.print_exc()
             return False
 
+    def generate_segment(
+        self,
+        scene: Scene,
+        duration: float,
+        resolution: str,
+        fps: int,
+        audio_path: Optional[str],
+        output_args: List[str],
+        sink: Callable[[bytes], bool]
+    ) -> bool:
+        """
+        1シーンを標準出力に生成し、読んだ分ずつ sink に渡す（ストリーミング書き出し用）
+
+        Args:
+            scene: シーンデータ
+            duration: シーンの長さ（秒）
+            resolution: 解像度 "WxH"
+            fps: フレームレート
+            audio_path: 音声ファイルパス（Noneなら無音）
+            output_args: 出力形式と出力先（StreamingMuxer.segment_args() の値）
+            sink: データの受け取り先（SegmentSpool.write など）
+
+        Returns:
+            成功したらTrue
+        """
+        width, height = map(int, resolution.split('x'))
+        args = self._build_single_pass_args(scene, duration, width, height, fps, audio_path)
+        if args is None:
+            return False
+        return self.ffmpeg.run_to_pipe(args + output_args, sink, step=STEP_SINGLE_PASS)
+
+    def get_output_duration(self, scene: Scene, duration: float, fps: int) -> float:
+        """
+        生成されるシーン動画の実際の長さ（フレーム境界に切り上げ）
+
+        元音声を残す動画シーンは元動画の長さになる。
+
+        Args:
+            scene: シーンデータ
+            duration: シーンの長さ（秒）
+            fps: フレームレート
+
+        Returns:
+            長さ（秒）
+        """
+        if scene.has_media and scene.media_type == MediaType.VIDEO and scene.keep_original_audio:
+            video_info = self.ffmpeg.probe(scene.media_path)
+            if video_info and video_info.get('duration', 0) > 0:
+                duration = video_info['duration']
+        return math.ceil(duration * fps - 1e-6) / fps
+
+    def _probe_stream_copy(
+        self,
+        scene: Scene,
+        duration: float,
+        width: int,
+        height: int,
+        fps: int
+    ) -> Optional[dict]:
+        """
+        動画シーンを再エンコードせずにストリームコピーできるか判定
+
+        元動画が出力と同じ H.264 / yuv420p / 解像度 / SAR / fps で、
+        字幕の焼き込みやループ再生が不要な場合のみコピーできる。
+
+        Args:
+            scene: シーンデータ
+            duration: シーンの長さ（秒）
+            width, height: 解像度
+            fps: フレームレート
+
+        Returns:
+            元動画の情報（コピー可能な場合）、不可ならNone
+        """
+        if not self.stream_copy or self.intermediate:
+            return None
+        if not (scene.has_media and scene.media_type == MediaType.VIDEO) or scene.has_subtitle:
+            return None
+
+        info = self.ffmpeg.probe(scene.media_path)
+        if not info:
+            return None
+        compatible = (
+            # キーフレームでの切り出し（h264_mp4toannexb）はH.264同士のみ
+            info.get('video_codec') == 'h264'
+            and self.policy.video_encoder.codec == 'h264'
+            and info.get('pix_fmt') == 'yuv420p'
+            and info.get('width') == width
+            and info.get('height') == height
+            and info.get('sar', '1:1') == '1:1'
+            and abs(info.get('fps', 0) - fps) < 0.01
+            and info.get('rotation', 0) == 0
+        )
+        if not compatible:
+            return None
+        if not scene.keep_original_audio and info['duration'] < duration:
+            # 短い動画はループ再生が必要
+            return None
+        return info
+
+    def _generate_stream_copy(
+        self,
+        scene: Scene,
+        output_path: str,
+        duration: float,
+        fps: int,
+        audio_path: Optional[str],
+        video_info: dict,
+        silence_padding: float = 1.0
+    ) -> bool:
+        """
+        キーフレーム単位のストリームコピーで動画シーンを生成
+
+        先頭から切り出し位置直前のキーフレームまでのGOPはそのままコピーし、
+        残りの不完全なGOPだけを再エンコードしてつなぐ。コピー部分には
+        SPS/PPSを埋め込み、エンコード設定の異なるシーンと結合しても
+        正しくデコードできるようにする。音声はシーンの設定どおりに付け直す。
+
+        Args:
+            scene: シーンデータ
+            output_path: 出力先mp4ファイルパス
+            duration: シーンの長さ（秒）
+            fps: フレームレート
+            audio_path: 音声ファイルパス（Noneなら無音）
+            video_info: _probe_stream_copy() の結果
+            silence_padding: 会話音声の前後に追加する無音秒数
+
+        Returns:
+            成功したらTrue（キーフレームを取得できない場合などはFalse）
+        """
+        media_path = scene.media_path
+        target = video_info['duration'] if scene.keep_original_audio else duration
+        frame_count = math.ceil(target * fps - 1e-6)
+
+        keyframes = self.ffmpeg.get_keyframes(media_path)
+        if not keyframes or keyframes[0] != (0, 0.0):
+            return False
+
+        # 切り出し位置以前で最後のキーフレーム（そこまではコピー）
+        copy_index, copy_end = keyframes[0]
+        for index, pts in keyframes:
+            if index > frame_count or pts > target + 1e-3:
+                break
+            copy_index, copy_end = index, pts
+        if scene.keep_original_audio or copy_index >= frame_count:
+            # 動画全体、またはキーフレームちょうどで切れる場合は全フレームコピー
+            copy_index, copy_end = frame_count, target
+        if copy_index == 0:
+            # 最初のGOPより短いシーン：コピーできる部分がない
+            return False
+
+        print(f"  コピー: 0〜{copy_end:.2f}秒 / 再エンコード: {max(0.0, target - copy_end):.2f}秒")
+        temp_paths = []
+
+        def new_temp(suffix: str = ".mp4") -> str:
+            temp_path = make_temp_path(suffix, self.workspace)
+            temp_paths.append(temp_path)
+            return temp_path
+
+        try:
+            # 1. キーフレーム境界までのGOPをコピー（SPS/PPSをフレームに埋め込む）
+            head_path = new_temp()
+            if not self.ffmpeg.run_command([
+                "-i", media_path,
+                "-map", "0:v:0",
+                "-c:v", "copy",
+                "-frames:v", str(copy_index),
+                "-bsf:v", "h264_mp4toannexb",
+                "-video_track_timescale", str(self.VIDEO_TIMESCALE),
+                "-y",
+                head_path
+            ], step=STEP_STREAM_COPY):
+                return False
+            video_path = head_path
+
+            # 2. 残りの不完全なGOPだけを入力側シークで再エンコードして連結
+            if target - copy_end > 1e-3:
+                tail_path = new_temp()
+                if not self.ffmpeg.run_command([
+                    "-ss", f"{copy_end:.6f}",
+                    "-t", f"{target - copy_end:.6f}",
+                    "-i", media_path,
+                    "-map", "0:v:0",
+                    *self._video_codec_args(),
+                    "-y",
+                    tail_path
+                ], step=STEP_STREAM_COPY):
+                    return False
+
+                list_path = new_temp(".txt")
+                with open(list_path, 'w', encoding='utf-8') as list_file:
+                    for path in (head_path, tail_path):
+                        escaped_path = str(Path(path).absolute()).replace('\\', '/')
+                        list_file.write(f"file '{escaped_path}'\n")
+
+                video_path = new_temp()
+                if not self.ffmpeg.run_command([
+                    "-f", "concat",
+                    "-safe", "0",
+                    "-i", list_path,
+                    "-c", "copy",
+                    "-y",
+                    video_path
+                ], step=STEP_STREAM_COPY):
+                    return False
+
+            # 3. 音声を付け直す（映像はコピー）
+            args = ["-i", video_path]
+            if scene.keep_original_audio and video_info.get('has_audio'):
+                args.extend(["-i", media_path])
+                audio_filter = "[1:a]aformat=sample_rates=44100:channel_layouts=stereo,apad[aout]"
+            elif audio_path and not scene.keep_original_audio:
+                args.extend(["-i", audio_path])
+                audio_filter = self._build_narration_audio_filter(
+                    "1:a", silence_padding, output_label="narration"
+                ) + ";[narration]apad[aout]"
+            else:
+                audio_filter = "anullsrc=r=44100:cl=stereo[aout]"
+
+            args.extend([
+                "-filter_complex", audio_filter,
+                "-map", "0:v",
+                "-map", "[aout]",
+                "-t", str(target),
+                "-c:v", "copy",
+                "-video_track_timescale", str(self.VIDEO_TIMESCALE),
+                *self._audio_codec_args(),
+                "-y",
+                output_path
+            ])
+            return self.ffmpeg.run_command(args, step=STEP_STREAM_COPY)
+
+        finally:
+            for path in temp_paths:
+                if Path(path).exists():
+                    Path(path).unlink()
+
+    @staticmethod
+    def _scale_pad_filter(width: int, height: int) -> str:
+        """
+        アスペクト比を保って縮小し、余白を黒で埋めるフィルター
+        （結合時にSARが揃うよう正方ピクセルに固定）
+
+        Args:
+            width, height: 解像度
+
+        Returns:
+            scale/padフィルター文字列
+        """
+        return (
+            f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+            f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1"
+        )
+
+    def _build_subtitle_filter(
+        self,
+        subtitle_text: str,
+        width: int,
+        height: int,
+        max_chars_per_line: int = 18
+    ) -> str:
+        """
+        字幕焼き込み用のフィルターを構築（2行対応）
+
+        drawbox の黒背景に、drawtext（ないビルドでは libass の ass フィルター）で
+        白文字を描く。どちらもない場合は字幕を省略する。
+
+        Args:
+            subtitle_text: 字幕テキスト
+            width, height: 解像度
+            max_chars_per_line: 1行あたりの最大文字数
+
+        Returns:
+            フィルター文字列
+        """
+        # 字幕エリアの設定
+        # 下部マージン（メディアプレイヤーの操作バーを避ける）
+        bottom_margin = int(height * 0.12)
+        # 字幕エリアの高さ（2行対応）
+        subtitle_height = int(height * 0.10)
+        subtitle_y = height - subtitle_height - bottom_margin
+
+        # フォントサイズ（高さに応じて調整）
+        font_size = int(height * 0.022)
+
+        # 長い字幕を2行に分割
+        display_text = self._split_subtitle_text(subtitle_text, max_chars_per_line)
+
+        background = f"drawbox=x=0:y={subtitle_y}:w={width}:h={subtitle_height}:color=black@0.7:t=fill"
+
+        if self.policy.subtitle_renderer == SUBTITLE_ASS:
+            # ASSファイルを作業ディレクトリに書き、フォントはファイルのあるディレクトリから読ませる
+            ass_path = make_temp_path(".ass", self.workspace)
+            Path(ass_path).write_text(
+                build_ass_script(
+                    display_text.split("\\n"),
+                    width,
+                    height,
+                    subtitle_y + subtitle_height // 2,
+                    font_size,
+                    font_family_name(str(self.font_path))
+                ),
+                encoding='utf-8'
+            )
+            escaped_ass_path = str(ass_path).replace('\\', '/').replace(':', r'\:')
+            escaped_fonts_dir = str(Path(self.font_path).parent).replace('\\', '/').replace(':', r'\:')
+            return f"{background},ass=filename='{escaped_ass_path}':fontsdir='{escaped_fonts_dir}'"
+
+        if self.policy.subtitle_renderer != SUBTITLE_DRAWTEXT:
+            print("  ⚠ このffmpegは字幕の描画（drawtext / libass）に対応していないため、字幕を省略します")
+            return "null"
+
+        # エスケープ処理
+        escaped_text = display_text.replace(':', r'\:').replace("'", r"\'")
+
+        # フォントパスのエスケープ（Windowsパス対応）
+        # ffmpegフィルターではコロンとバックスラッシュをエスケープする必要がある
+        escaped_font_path = str(self.font_path).replace('\\', '/').replace(':', r'\:')
+
+        # drawboxで黒背景、drawtextで白文字（中央揃え）
+        return (
+            f"{background},"
+            f"drawtext=fontfile='{escaped_font_path}':text='{escaped_text}':"
+            f"fontcolor=white:fontsize={font_size}:x=(w-text_w)/2:y={subtitle_y}+({subtitle_height}-text_h)/2"
+        )
+
+    @staticmethod
+    def _build_narration_audio_filter(
+        voice_input: str,
+        silence_padding: float = 1.0,
+        original_input: Optional[str] = None,
+        output_label: str = "aout"
+    ) -> str:
+        """
+        会話音声の前後に無音を付けるオーディオフィルターを構築
+
+        Args:
+            voice_input: 会話音声の入力ラベル（例: "1:a"）
+            silence_padding: 前後に追加する無音秒数
+            original_input: ミックスする元音声の入力ラベル（Noneならミックスしない）
+            output_label: 出力ラベル
+
+        Returns:
+            [output_label] を出力するフィルター文字列
+        """
+        pad_label = "voicewithpad" if original_input else output_label
+        filter_complex = (
+            f"[{voice_input}]aformat=sample_rates=44100:channel_layouts=stereo[voice];"
+            f"anullsrc=r=44100:cl=stereo:d={silence_padding}[silence1];"
+            f"anullsrc=r=44100:cl=stereo:d={silence_padding}[silence2];"
+            f"[silence1][voice][silence2]concat=n=3:v=0:a=1[{pad_label}]"
+        )
+        if original_input:
+            # 元音声と会話音声（前後無音付き）をamixで合成
+            filter_complex += (
+                f";[{original_input}]aformat=sample_rates=44100:channel_layouts=stereo[original];"
+                f"[original][voicewithpad]amix=inputs=2:duration=longest:dropout_transition=0[{output_label}]"
+            )
+        return filter_complex
+
+    def _get_proxy(self, scene: Scene, width: int, height: int, fps: int) -> Optional[str]:
+        """
+        シーンのメディアの縮小済みプロキシを取得
+
+        Args:
+            scene: シーンデータ
+            width, height: 出力解像度
+            fps: 出力フレームレート
+
+        Returns:
+            プロキシファイルパス、使わない・作れない場合はNone
+        """
+        if not self.proxy_cache or not scene.has_media:
+            return None
+        return self.proxy_cache.get_proxy(
+            scene.media_path, scene.media_type, width, height, fps,
+            lossless=self.intermediate
+        )
+
+    def _scale_pad_filters_for(
+        self,
+        media_path: str,
+        scene: Scene,
+        width: int,
+        height: int
+    ) -> List[str]:
+        """
+        入力に必要な scale/pad フィルター（プロキシは縮小済みなので不要）
+
+        Args:
+            media_path: 実際に入力するファイル
+            scene: シーンデータ
+            width, height: 解像度
+
+        Returns:
+            フィルターのリスト
+        """
+        if media_path != scene.media_path:
+            return []
+        return [self._scale_pad_filter(width, height)]
+
+    def _generate_single_pass(
+        self,
+        scene: Scene,
+        output_path: str,
+        duration: float,
+        width: int,
+        height: int,
+        fps: int,
+        audio_path: Optional[str] = None,
+        silence_padding: float = 1.0
+    ) -> bool:
+        """
+        1回のffmpeg実行でシーン動画を生成
+
+        Args:
+            scene: シーンデータ
+            output_path: 出力先mp4ファイルパス
+            duration: シーンの長さ（秒）
+            width, height: 解像度
+            fps: フレームレート
+            audio_path: 音声ファイルパス（Noneなら無音）
+            silence_padding: 会話音声の前後に追加する無音秒数
+
+        Returns:
+            成功したらTrue
+        """
+        args = self._build_single_pass_args(
+            scene, duration, width, height, fps, audio_path, silence_padding
+        )
+        if args is None:
+            return False
+        args.extend(["-y", output_path])
+        return self.ffmpeg.run_command(args, step=STEP_SINGLE_PASS)
+
+    def _build_single_pass_args(
+        self,
+        scene: Scene,
+        duration: float,
+        width: int,
+        height: int,
+        fps: int,
+        audio_path: Optional[str] = None,
+        silence_padding: float = 1.0
+    ) -> Optional[List[str]]:
+        """
+        1パス生成のffmpeg引数を組み立てる（出力先は含まない）
+
+        scale/pad、字幕（drawbox/drawtext）、前後無音付きの会話音声を
+        1つの -filter_complex にまとめ、x264エンコードを1回だけ行う。
+        画像シーンは静止画モードで、scale/pad・字幕を1フレームだけ処理し
+        tpadで複製したフレームを stillimage チューニング・長GOPで符号化する。
+
+        Args:
+            scene: シーンデータ
+            duration: シーンの長さ（秒）
+            width, height: 解像度
+            fps: フレームレート
+            audio_path: 音声ファイルパス（Noneなら無音）
+            silence_padding: 会話音声の前後に追加する無音秒数
+
+        Returns:
+            ffmpeg引数リスト、音声ファイルがない場合はNone
+        """
+        keep_original_audio = False
+        source_has_audio = False
+        output_duration: Optional[float] = duration
+        still_image = False
+        extra_video_args: List[str] = []
+
+        # 入力0: 映像ソース
+        if scene.has_media and scene.media_type == MediaType.IMAGE:
+            media_path = self._get_proxy(scene, width, height, fps) or scene.media_path
+            if self.still_image_fast_path:
+                # 静止画モード：画像は1回だけデコード・縮小し、最後にフレームを複製
+                print(f"  画像から動画を生成（静止画モード）: {Path(scene.media_path).name}")
+                args = ["-framerate", str(fps), "-i", media_path]
+                still_image = True
+                extra_video_args = ["-g", str(fps * self.STILL_IMAGE_GOP_SECONDS)]
+                if not self.profile.tune and self.policy.supports_tune(lossless=self.intermediate):
+                    extra_video_args.extend(["-tune", "stillimage"])
+            else:
+                print(f"  画像から動画を生成: {Path(scene.media_path).name}")
+                args = ["-loop", "1", "-framerate", str(fps), "-i", media_path]
+            video_filters = self._scale_pad_filters_for(media_path, scene, width, height)
+        elif scene.has_media and scene.media_type == MediaType.VIDEO:
+            print(f"  動画をトリミング: {Path(scene.media_path).name}")
+            video_info = self.ffmpeg.probe(scene.media_path)
+            video_duration = video_info.get('duration', 0) if video_info else 0
+            source_has_audio = video_info.get('has_audio', True) if video_info else True
+
+            media_path = scene.media_path
+            if scene.keep_original_audio or (
+                0 < video_duration <= duration * self.VIDEO_PROXY_MAX_RATIO
+            ):
+                media_path = self._get_proxy(scene, width, height, fps) or media_path
+
+            if scene.keep_original_audio:
+                # 元音声を残す場合：動画をそのまま最後まで使用（カットしない）
+                print(f"  元動画の音声を残す: 動画の長さ({video_duration:.2f}秒)をそのまま使用")
+                args = ["-i", media_path]
+                keep_original_audio = True
+                output_duration = video_duration if video_duration > 0 else None
+            elif video_duration > 0 and video_duration < duration:
+                # 動画が短い場合はループ再生
+                print(f"  動画が短いためループ再生: {video_duration:.2f}秒 → {duration:.2f}秒")
+                args = ["-stream_loop", "-1", "-i", media_path]
+            else:
+                args = ["-i", media_path]
+            video_filters = self._scale_pad_filters_for(media_path, scene, width, height)
+        else:
+            # メディアなし：黒画面
+            print(f"  黒画面動画を生成")
+            args = [
+                "-f", "lavfi",
+                "-i", f"color=c=black:s={width}x{height}:d={duration}:r={fps}",
+            ]
+            video_filters = []
+
+        if not still_image:
+            video_filters.append(f"fps={fps}")
+        video_filters.append("format=yuv420p")
+        if scene.has_subtitle:
+            print(f"  字幕を焼き込み: '{scene.subtitle_text}'")
+            video_filters.append(
+                self._build_subtitle_filter(scene.subtitle_text, width, height)
+            )
+        if still_image:
+            # 字幕まで描画済みのフレームを複製して長さを埋める
+            video_filters.append(f"tpad=stop_mode=clone:stop_duration={duration}")
+        filter_complex = f"[0:v]{','.join(video_filters)}[vout]"
+
+        # 音声：どのシーンも同じ形式（44.1kHzステレオAAC）の音声トラックを必ず持たせ、
+        # 映像の長さまで無音で埋める
+        if keep_original_audio and source_has_audio:
+            print(f"  元動画の音声を使用（会話音声は追加しない）")
+            filter_complex += (
+                ";[0:a]aformat=sample_rates=44100:channel_layouts=stereo"
+                f"{',apad' if output_duration else ''}[aout]"
+            )
+        elif audio_path and not keep_original_audio:
+            if not Path(audio_path).exists():
+                print(f"エラー: 音声ファイルが見つかりません: {audio_path}")
+                return None
+            print(f"  音声ファイル: {Path(audio_path).name}（前後無音: {silence_padding}秒ずつ）")
+            args.extend(["-i", audio_path])
+            filter_complex += ";" + self._build_narration_audio_filter(
+                "1:a", silence_padding, output_label="narration"
+            ) + ";[narration]apad[aout]"
+        else:
+            print(f"  音声なし（無音トラックを付与）")
+            filter_complex += ";anullsrc=r=44100:cl=stereo[aout]"
+
+        args.extend([
+            "-filter_complex", filter_complex,
+            "-map", "[vout]",
+            "-map", "[aout]",
+        ])
+        if output_duration:
+            # 無音で埋めた音声も映像と同じ長さで終える
+            args.extend(["-t", str(output_duration)])
+        else:
+            # 元動画の長さが取得できない場合（元音声はパディングしていない）
+            args.append("-shortest")
+        args.extend([
+            *self._video_codec_args(),
+            *extra_video_args,
+            *self._audio_codec_args(),
+        ])
+        return args
+
     def _generate_from_image(
         self,
         image_path: str,
@@ -239,23 +957,20 @@ class SceneGenerator:
         Returns:
             生成された一時動画ファイルパス、失敗時はNone
         """
-        temp_file = tempfile.NamedTemporaryFile(suffix=".mp4", delete=False)
-        temp_path = temp_file.name
-        temp_file.close()
+        temp_path = make_temp_path(self.clip_suffix, self.workspace)
 
         args = [
             "-loop", "1",
             "-i", image_path,
             "-t", str(duration),
-            "-vf", f"scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2",
-            "-c:v", "libx264",
-            "-pix_fmt", "yuv420p",
+            "-vf", self._scale_pad_filter(width, height),
+            *self._video_codec_args(),
             "-r", str(fps),
             "-y",
             temp_path
         ]
 
-        if self.ffmpeg.run_command(args):
+        if self.ffmpeg.run_command(args, step=STEP_SCALE):
             return temp_path
         else:
             if Path(temp_path).exists():
@@ -284,12 +999,10 @@ class SceneGenerator:
         Returns:
             生成された一時動画ファイルパス、失敗時はNone
         """
-        temp_file = tempfile.NamedTemporaryFile(suffix=".mp4", delete=False)
-        temp_path = temp_file.name
-        temp_file.close()
+        temp_path = make_temp_path(self.clip_suffix, self.workspace)
 
         # 動画の長さを取得
-        video_info = self.ffmpeg.get_video_info(video_path)
+        video_info = self.ffmpeg.probe(video_path)
         video_duration = video_info.get('duration', 0) if video_info else 0
 
         if keep_audio:
@@ -297,12 +1010,10 @@ class SceneGenerator:
             print(f"  元動画の音声を残す: 動画の長さ({video_duration:.2f}秒)をそのまま使用")
             args = [
                 "-i", video_path,
-                "-vf", f"scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2",
-                "-c:v", "libx264",
-                "-pix_fmt", "yuv420p",
+                "-vf", self._scale_pad_filter(width, height),
+                *self._video_codec_args(),
                 "-r", str(fps),
-                "-c:a", "aac",
-                "-b:a", "192k",
+                *self._audio_codec_args(),
             ]
         elif video_duration > 0 and video_duration < duration:
             # 動画が短い場合はループ再生
@@ -311,9 +1022,8 @@ class SceneGenerator:
                 "-stream_loop", "-1",
                 "-i", video_path,
                 "-t", str(duration),
-                "-vf", f"scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2",
-                "-c:v", "libx264",
-                "-pix_fmt", "yuv420p",
+                "-vf", self._scale_pad_filter(width, height),
+                *self._video_codec_args(),
                 "-r", str(fps),
                 "-an",
             ]
@@ -322,16 +1032,15 @@ class SceneGenerator:
             args = [
                 "-i", video_path,
                 "-t", str(duration),
-                "-vf", f"scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2",
-                "-c:v", "libx264",
-                "-pix_fmt", "yuv420p",
+                "-vf", self._scale_pad_filter(width, height),
+                *self._video_codec_args(),
                 "-r", str(fps),
                 "-an",
             ]
 
         args.extend(["-y", temp_path])
 
-        if self.ffmpeg.run_command(args):
+        if self.ffmpeg.run_command(args, step=STEP_SCALE):
             return temp_path
         else:
             if Path(temp_path).exists():
@@ -356,20 +1065,17 @@ class SceneGenerator:
         Returns:
             生成された一時動画ファイルパス、失敗時はNone
         """
-        temp_file = tempfile.NamedTemporaryFile(suffix=".mp4", delete=False)
-        temp_path = temp_file.name
-        temp_file.close()
+        temp_path = make_temp_path(self.clip_suffix, self.workspace)
 
         args = [
             "-f", "lavfi",
             "-i", f"color=c=black:s={width}x{height}:d={duration}:r={fps}",
-            "-c:v", "libx264",
-            "-pix_fmt", "yuv420p",
+            *self._video_codec_args(),
             "-y",
             temp_path
         ]
 
-        if self.ffmpeg.run_command(args):
+        if self.ffmpeg.run_command(args, step=STEP_SCALE):
             return temp_path
         else:
             if Path(temp_path).exists():
@@ -396,48 +1102,25 @@ class SceneGenerator:
         Returns:
             字幕付き一時動画ファイルパス、失敗時はNone
         """
-        temp_file = tempfile.NamedTemporaryFile(suffix=".mp4", delete=False)
-        temp_path = temp_file.name
-        temp_file.close()
-
-        # 字幕エリアの設定
-        # 下部マージン（メディアプレイヤーの操作バーを避ける）
-        bottom_margin = int(height * 0.12)
-        # 字幕エリアの高さ（2行対応）
-        subtitle_height = int(height * 0.10)
-        subtitle_y = height - subtitle_height - bottom_margin
+        temp_path = make_temp_path(self.clip_suffix, self.workspace)
 
-        # フォントサイズ（高さに応じて調整）
-        font_size = int(height * 0.022)
-
-        # 長い字幕を2行に分割
-        display_text = self._split_subtitle_text(subtitle_text, max_chars_per_line)
-
-        # エスケープ処理
-        escaped_text = display_text.replace(':', r'\:').replace("'", r"\'")
-
-        # フォントパスのエスケープ（Windowsパス対応）
-        # ffmpegフィルターではコロンとバックスラッシュをエスケープする必要がある
-        escaped_font_path = str(self.font_path).replace('\\', '/').replace(':', r'\:')
-
-        # drawboxで黒背景、drawtextで白文字（中央揃え）
-        filter_complex = (
-            f"drawbox=x=0:y={subtitle_y}:w={width}:h={subtitle_height}:color=black@0.7:t=fill,"
-            f"drawtext=fontfile='{escaped_font_path}':text='{escaped_text}':"
-            f"fontcolor=white:fontsize={font_size}:x=(w-text_w)/2:y={subtitle_y}+({subtitle_height}-text_h)/2"
+        filter_complex = self._build_subtitle_filter(
+            subtitle_text,
+            width,
+            height,
+            max_chars_per_line
         )
 
         args = [
             "-i", video_path,
             "-vf", filter_complex,
-            "-c:v", "libx264",
-            "-pix_fmt", "yuv420p",
+            *self._video_codec_args(),
             "-c:a", "copy",
             "-y",
             temp_path
         ]
 
-        if self.ffmpeg.run_command(args):
+        if self.ffmpeg.run_command(args, step=STEP_SUBTITLE):
             return temp_path
         else:
             if Path(temp_path).exists():
@@ -481,24 +1164,11 @@ class SceneGenerator:
         print(f"  元音声ミックス: {'はい' if mix_original else 'いいえ'}")
 
         if mix_original:
-            # 元音声とVOICEVOX音声をミックス
             # 元音声（0:a）と会話音声（1:a、前後無音付き）をamixで合成
-            filter_complex = (
-                f"[1:a]aformat=sample_rates=44100:channel_layouts=stereo[voice];"
-                f"anullsrc=r=44100:cl=stereo:d={silence_padding}[silence1];"
-                f"anullsrc=r=44100:cl=stereo:d={silence_padding}[silence2];"
-                f"[silence1][voice][silence2]concat=n=3:v=0:a=1[voicewithpad];"
-                f"[0:a]aformat=sample_rates=44100:channel_layouts=stereo[original];"
-                f"[original][voicewithpad]amix=inputs=2:duration=longest:dropout_transition=0[aout]"
-            )
+            filter_complex = self._build_narration_audio_filter("1:a", silence_padding, "0:a")
         else:
             # VOICEVOX音声のみ（従来の動作）
-            filter_complex = (
-                f"[1:a]aformat=sample_rates=44100:channel_layouts=stereo[main];"
-                f"anullsrc=r=44100:cl=stereo:d={silence_padding}[silence1];"
-                f"anullsrc=r=44100:cl=stereo:d={silence_padding}[silence2];"
-                f"[silence1][main][silence2]concat=n=3:v=0:a=1[aout]"
-            )
+            filter_complex = self._build_narration_audio_filter("1:a", silence_padding)
 
         args = [
             "-i", video_path,
@@ -507,14 +1177,13 @@ class SceneGenerator:
             "-map", "0:v",
             "-map", "[aout]",
             "-c:v", "copy",
-            "-c:a", "aac",
-            "-b:a", "192k",
+            *self._audio_codec_args(),
             "-shortest",
             "-y",
             output_path
         ]
 
-        success = self.ffmpeg.run_command(args, show_output=True)
+        success = self.ffmpeg.run_command(args, show_output=True, step=STEP_MUX)
 
         if success:
             print(f"✓ 音声合成完了: {Path(output_path).name}")
@@ -522,3 +1191,28 @@ class SceneGenerator:
             print(f"✗ 音声合成失敗")
 
         return success
+
+    def _add_silent_audio(self, video_path: str, output_path: str) -> bool:
+        """
+        音声のない動画に無音トラックを付与（映像はコピー）
+
+        Args:
+            video_path: 動画ファイルパス
+            output_path: 出力先mp4ファイルパス
+
+        Returns:
+            成功したらTrue
+        """
+        args = [
+            "-i", video_path,
+            "-f", "lavfi",
+            "-i", "anullsrc=r=44100:cl=stereo",
+            "-map", "0:v",
+            "-map", "1:a",
+            "-c:v", "copy",
+            *self._audio_codec_args(),
+            "-shortest",
+            "-y",
+            output_path
+        ]
+        return self.ffmpeg.run_command(args, step=STEP_MUX)
@@ -0,0 +1,281 @@
+"""
+Streaming Muxer
+パイプで受け取ったシーンを1本の動画に書き出す（中間ファイルなし）
+"""
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from .ffmpeg_wrapper import FFmpegWrapper, FFmpegResult, StderrTail, STEP_MUX, read_lines, wait_with_usage
+from .scene_generator import SceneGenerator
+from .workspace import RenderWorkspace
+
+
+class StreamingMuxer:
+    """
+    シーンのMPEG-TSセグメントを1つのffmpegプロセスに流し込み、
+    最終ファイルだけをディスクに書き出すクラス
+
+    各セグメントは -output_ts_offset で通しのタイムスタンプを持たせて生成し、
+    write() でプロジェクト順に書き込む。映像はストリームコピー、
+    音声はタイムスタンプに合わせて継ぎ目の重なり・隙間を補正して再エンコードする。
+    """
+
+    # すべてのセグメントのタイムスタンプを正の値にするための基準オフセット（秒）
+    # （負のDTSを持つ先頭セグメントだけが補正でずれるのを防ぐ）
+    BASE_OFFSET = 10.0
+
+    # AACのプライミング等による継ぎ目の重なり・隙間をサンプル単位で補正
+    AUDIO_RESYNC_FILTER = "aresample=async=1000:min_hard_comp=0.01:first_pts=0"
+
+    # 保持するffmpegのエラー出力の行数
+    STDERR_LINES = 50
+
+    def __init__(self, ffmpeg: FFmpegWrapper, output_path: str):
+        """
+        Args:
+            ffmpeg: FFmpegWrapperインスタンス
+            output_path: 出力先mp4ファイルパス
+        """
+        self.ffmpeg = ffmpeg
+        self.output_path = output_path
+        self.process = None
+        self._stderr_tail = StderrTail(self.STDERR_LINES)
+        self._stderr_thread: Optional[threading.Thread] = None
+        self._started_at = 0.0
+
+    @classmethod
+    def segment_args(cls, start: float) -> List[str]:
+        """
+        セグメントを標準出力にMPEG-TSで書き出すための出力引数
+
+        セグメントごとに連続性カウンタが0から始まるため、先頭のパケットに
+        不連続の印を付け、つないだ継ぎ目を破損として扱わせない。
+
+        Args:
+            start: 最終動画内でのセグメント開始時刻（秒）
+
+        Returns:
+            ffmpeg引数リスト（出力ファイル指定の代わりに使う）
+        """
+        return [
+            "-output_ts_offset", f"{cls.BASE_OFFSET + start:.6f}",
+            "-mpegts_flags", "+initial_discontinuity",
+            "-f", "mpegts",
+            "pipe:1"
+        ]
+
+    def start(self) -> bool:
+        """
+        マルチプレクサのffmpegを起動
+
+        Returns:
+            起動できたらTrue
+        """
+        args = [
+            "-hide_banner",
+            "-loglevel", "error",
+            "-f", "mpegts",
+            "-i", "pipe:0",
+            "-map", "0:v",
+            "-map", "0:a",
+            "-c:v", "copy",
+            "-af", self.AUDIO_RESYNC_FILTER,
+            *SceneGenerator.AUDIO_CODEC_ARGS,
+            "-y",
+            self.output_path
+        ]
+        try:
+            self._started_at = time.monotonic()
+            self.process = self.ffmpeg.start_process(args)
+        except Exception as e:
+            print(f"マルチプレクサ起動エラー: {e}")
+            return False
+
+        # stderrが詰まってffmpegが止まらないよう、別スレッドで読み続ける
+        self._stderr_thread = threading.Thread(target=self._drain_stderr, daemon=True)
+        self._stderr_thread.start()
+        return True
+
+    def _drain_stderr(self):
+        """ffmpegのエラー出力を読み続ける（末尾だけ保持）"""
+        read_lines(self.process.stderr, self._stderr_tail.add)
+
+    def write(self, segment: bytes) -> bool:
+        """
+        セグメントのデータを書き込む（プロジェクト順に呼ぶこと）
+
+        Args:
+            segment: MPEG-TSデータ（セグメントの一部でもよい）
+
+        Returns:
+            書き込めたらTrue（ffmpegが終了している場合はFalse）
+        """
+        try:
+            self.process.stdin.write(segment)
+            return True
+        except (BrokenPipeError, OSError, ValueError) as e:
+            print(f"マルチプレクサへの書き込みエラー: {e}")
+            return False
+
+    def finish(self) -> FFmpegResult:
+        """
+        入力を閉じて書き出しの完了を待つ
+
+        Returns:
+            マルチプレクサの実行結果（成功したときだけ真）
+        """
+        try:
+            self.process.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+        if self._stderr_thread:
+            self._stderr_thread.join()
+        user_seconds, system_seconds, peak_rss = wait_with_usage(self.process)
+
+        result = FFmpegResult(
+            argv=[str(arg) for arg in self.process.args],
+            returncode=self.process.returncode,
+            wall_seconds=time.monotonic() - self._started_at,
+            user_seconds=user_seconds,
+            system_seconds=system_seconds,
+            peak_rss=peak_rss,
+            stderr_tail=self._stderr_tail.text(),
+            step=STEP_MUX,
+            cancelled=self.ffmpeg.cancelled,
+        )
+        if not result and not result.cancelled:
+            print(f"\n✗ マルチプレクサエラー (終了コード: {result.returncode})")
+            if self._stderr_tail:
+                print("エラー詳細:")
+                print(self._stderr_tail.text())
+        return result
+
+    def abort(self) -> str:
+        """
+        書き出しを中止し、書きかけの出力ファイルを削除
+
+        Returns:
+            マルチプレクサのエラー出力の末尾（失敗の原因の表示用）
+        """
+        if self.process:
+            if self.process.poll() is None:
+                self.process.kill()
+                self.process.wait()
+            if self._stderr_thread:
+                self._stderr_thread.join(timeout=5)
+        if Path(self.output_path).exists():
+            Path(self.output_path).unlink()
+        return self._stderr_tail.text()
+
+
+class SegmentSpool:
+    """
+    1シーン分のセグメントの受け取り先
+
+    シーンのffmpegの標準出力を受け取り、順番が来てマルチプレクサに
+    attach() されるまでは保持する（memory_limit を超えた分は作業ディレクトリの
+    ファイルに書き出す）。attach() の後は受け取ったデータをそのまま書き込むため、
+    先頭のシーンはメモリにもディスクにも溜めずに流し込まれる。
+    """
+
+    # 順番待ちの間にメモリに保持するデータの上限（バイト）
+    MEMORY_LIMIT = 8 * 1024 * 1024
+
+    # ファイルに書き出した分を読み出す単位（バイト）
+    READ_CHUNK_BYTES = 1024 * 1024
+
+    def __init__(self, workspace: RenderWorkspace, memory_limit: int = MEMORY_LIMIT):
+        """
+        Args:
+            workspace: 保持しきれない分を書き出す作業ディレクトリ
+            memory_limit: メモリに保持するデータの上限（バイト）
+        """
+        self.workspace = workspace
+        self.memory_limit = memory_limit
+        self.muxer_failed = False  # マルチプレクサへの書き込みに失敗したか
+        self.spill_path: Optional[str] = None
+        self._chunks: List[bytes] = []
+        self._buffered = 0
+        self._spill_file = None
+        self._muxer: Optional[StreamingMuxer] = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    @property
+    def rejected(self) -> bool:
+        """データを受け取れなくなったか（マルチプレクサの失敗・破棄）"""
+        return self.muxer_failed or self._closed
+
+    def write(self, data: bytes) -> bool:
+        """
+        セグメントのデータを受け取る（シーンを生成するスレッドから呼ぶ）
+
+        Args:
+            data: 標準出力から読んだデータ
+
+        Returns:
+            受け取れたらTrue（Falseならffmpegを止めてよい）
+        """
+        with self._lock:
+            if self.rejected:
+                return False
+            if self._muxer is not None:
+                return self._write_muxer(data)
+            if self._spill_file is None and self._buffered + len(data) > self.memory_limit:
+                self.spill_path = self.workspace.new_file(".ts", prefix="segment")
+                self._spill_file = open(self.spill_path, 'w+b')
+            if self._spill_file is not None:
+                self._spill_file.write(data)
+            else:
+                self._chunks.append(data)
+                self._buffered += len(data)
+            return True
+
+    def attach(self, muxer: StreamingMuxer) -> bool:
+        """
+        保持している分をマルチプレクサに書き込み、以降は直接書き込む
+
+        Args:
+            muxer: 書き込み先（前のシーンまで書き込み済みであること）
+
+        Returns:
+            書き込めたらTrue
+        """
+        with self._lock:
+            if self._closed:
+                return False
+            self._muxer = muxer
+            chunks, self._chunks, self._buffered = self._chunks, [], 0
+            for chunk in chunks:
+                if not self._write_muxer(chunk):
+                    return False
+            if self._spill_file is not None:
+                self._spill_file.seek(0)
+                for chunk in iter(lambda: self._spill_file.read(self.READ_CHUNK_BYTES), b''):
+                    if not self._write_muxer(chunk):
+                        return False
+                self._close_spill()
+            return True
+
+    def _write_muxer(self, data: bytes) -> bool:
+        """マルチプレクサに書き込む（_lock を保持して呼ぶ）"""
+        if not self._muxer.write(data):
+            self.muxer_failed = True
+            return False
+        return True
+
+    def discard(self):
+        """受け取りをやめ、保持しているデータとファイルを破棄"""
+        with self._lock:
+            self._closed = True
+            self._chunks, self._buffered = [], 0
+            self._close_spill()
+
+    def _close_spill(self):
+        """書き出したファイルを閉じて削除（_lock を保持して呼ぶ）"""
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+            Path(self.spill_path).unlink(missing_ok=True)
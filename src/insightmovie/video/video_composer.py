@@ -2,22 +2,34 @@
 Video Composer
 動画結合
 """
-import tempfile
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
-from .ffmpeg_wrapper import FFmpegWrapper
+from .ffmpeg_wrapper import FFmpegWrapper, STEP_SCALE, STEP_CONCAT
+from .scene_generator import SceneGenerator
+from .workspace import RenderWorkspace, make_temp_path
+from ..project import EncodingProfile
 
 
 class VideoComposer:
     """動画結合クラス"""
 
-    def __init__(self, ffmpeg: FFmpegWrapper):
+    def __init__(
+        self,
+        ffmpeg: FFmpegWrapper,
+        profile: Optional[EncodingProfile] = None,
+        workspace: Optional[RenderWorkspace] = None
+    ):
         """
         Args:
             ffmpeg: FFmpegWrapperインスタンス
+            profile: エンコードプロファイル（Noneなら balanced）
+            workspace: 中間ファイルを置く作業ディレクトリ（Noneならシステムの一時ディレクトリ）
         """
         self.ffmpeg = ffmpeg
+        self.policy = ffmpeg.encoder_policy
+        self.profile = profile or EncodingProfile()
+        self.workspace = workspace
 
     def concat_videos(
         self,
@@ -27,6 +39,11 @@ class VideoComposer:
         """
         複数の動画を結合
 
+        シーン動画はすべて同じストリーム構成（SceneGenerator で正規化済み）
+        なので、再エンコードせずにストリームコピーで結合する。
+        プロファイルが中間コーデックを使う場合は、結合しながら
+        プロファイルの設定で最終エンコードを1回だけ行う。
+
         Args:
             video_paths: 動画ファイルパスのリスト（順番通り）
             output_path: 出力先mp4ファイルパス
@@ -38,49 +55,50 @@ class VideoComposer:
             print("結合する動画がありません")
             return False
 
-        if len(video_paths) == 1:
+        if len(video_paths) == 1 and not self.profile.intermediate:
             # 1つだけの場合はコピー
             import shutil
             shutil.copy(video_paths[0], output_path)
             return True
 
+        list_path = make_temp_path(".txt", self.workspace)
         try:
             # concat用のリストファイルを作成
-            list_file = tempfile.NamedTemporaryFile(
-                mode='w',
-                suffix='.txt',
-                delete=False,
-                encoding='utf-8'
-            )
-
-            for video_path in video_paths:
-                # パスをエスケープ（ffmpeg concat demuxer用）
-                escaped_path = str(Path(video_path).absolute()).replace('\\', '/')
-                list_file.write(f"file '{escaped_path}'\n")
-
-            list_file.close()
+            with open(list_path, 'w', encoding='utf-8') as list_file:
+                for video_path in video_paths:
+                    # パスをエスケープ（ffmpeg concat demuxer用）
+                    escaped_path = str(Path(video_path).absolute()).replace('\\', '/')
+                    list_file.write(f"file '{escaped_path}'\n")
 
             # concat demuxerで結合
             args = [
                 "-f", "concat",
                 "-safe", "0",
-                "-i", list_file.name,
-                "-c", "copy",
-                "-y",
-                output_path
+                "-i", list_path,
             ]
-
-            success = self.ffmpeg.run_command(args)
-
-            # 一時ファイル削除
-            Path(list_file.name).unlink()
-
-            return success
+            if self.profile.intermediate:
+                # 中間コーデックのシーン動画をまとめて最終エンコード
+                args.extend([
+                    *self.policy.video_args(self.profile),
+                    *SceneGenerator.AUDIO_CODEC_ARGS,
+                ])
+                if self.profile.threads > 0:
+                    args.extend(["-threads", str(self.profile.threads)])
+            else:
+                args.extend(["-c", "copy"])
+            args.extend(["-y", output_path])
+
+            return self.ffmpeg.run_command(args, step=STEP_CONCAT)
 
         except Exception as e:
             print(f"動画結合エラー: {e}")
             return False
 
+        finally:
+            # 一時ファイル削除
+            if Path(list_path).exists():
+                Path(list_path).unlink()
+
     def concat_videos_with_re_encode(
         self,
         video_paths: List[str],
@@ -109,24 +127,36 @@ class VideoComposer:
             temp_videos = []
             width, height = map(int, resolution.split('x'))
 
+            # 中間コーデック使用時は可逆で揃え、非可逆エンコードは結合時の1回だけにする
+            if self.profile.intermediate:
+                suffix = ".mov"
+                codec_args = [
+                    *self.policy.lossless_video_args(),
+                    "-video_track_timescale", str(SceneGenerator.VIDEO_TIMESCALE),
+                    "-r", str(fps),
+                    *SceneGenerator.INTERMEDIATE_AUDIO_ARGS,
+                ]
+            else:
+                suffix = ".mp4"
+                codec_args = [
+                    *self.policy.video_args(self.profile),
+                    "-video_track_timescale", str(SceneGenerator.VIDEO_TIMESCALE),
+                    "-r", str(fps),
+                    *SceneGenerator.AUDIO_CODEC_ARGS,
+                ]
+
             for video_path in video_paths:
-                temp_file = tempfile.NamedTemporaryFile(suffix=".mp4", delete=False)
-                temp_path = temp_file.name
-                temp_file.close()
+                temp_path = make_temp_path(suffix, self.workspace)
 
                 args = [
                     "-i", video_path,
-                    "-vf", f"scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2",
-                    "-c:v", "libx264",
-                    "-pix_fmt", "yuv420p",
-                    "-r", str(fps),
-                    "-c:a", "aac",
-                    "-ar", "44100",
+                    "-vf", f"scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1",
+                    *codec_args,
                     "-y",
                     temp_path
                 ]
 
-                if self.ffmpeg.run_command(args):
+                if self.ffmpeg.run_command(args, step=STEP_SCALE):
                     temp_videos.append(temp_path)
                 else:
                     # 失敗した場合、一時ファイルをクリーンアップ
@@ -0,0 +1,159 @@
+"""
+Render Workspace
+書き出しジョブごとの作業ディレクトリ（中間ファイルの置き場所）
+"""
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import psutil
+
+
+# 作業ディレクトリのデフォルトの親ディレクトリ名（システムの一時ディレクトリ内）
+DEFAULT_ROOT_NAME = "insightmovie_build"
+
+
+def make_temp_path(suffix: str, workspace: Optional['RenderWorkspace'] = None) -> str:
+    """
+    一時ファイルのパスを取得
+
+    Args:
+        suffix: 拡張子
+        workspace: 作業ディレクトリ（Noneならシステムの一時ディレクトリ）
+
+    Returns:
+        一時ファイルパス
+    """
+    if workspace:
+        return workspace.new_file(suffix)
+    temp_file = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
+    temp_file.close()
+    return temp_file.name
+
+
+class RenderWorkspace:
+    """
+    書き出しジョブごとの作業ディレクトリ
+
+    ジョブの中間ファイルはすべてこのディレクトリに作り、cleanup() でまとめて削除する。
+    ディレクトリには作成したプロセスを記録したロックファイルを置き、
+    プロセスが異常終了して残ったディレクトリは sweep_stale() で削除できる。
+    """
+
+    PREFIX = "job_"
+    LOCK_FILE = "workspace.lock"
+
+    # ロックファイルを書く前の作成直後のディレクトリを消さないための猶予（秒）
+    CREATE_GRACE_SECONDS = 60
+
+    def __init__(self, root_dir: Optional[str] = None):
+        """
+        Args:
+            root_dir: 作業ディレクトリを作る親ディレクトリ
+                      （tmpfsや高速なローカルSSDを指定できる。Noneならシステムの一時ディレクトリ）
+        """
+        self.root_dir = self.resolve_root(root_dir)
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        self.path = Path(tempfile.mkdtemp(prefix=self.PREFIX, dir=self.root_dir))
+
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+        process = psutil.Process(os.getpid())
+        lock_data = {'pid': process.pid, 'create_time': process.create_time()}
+        (self.path / self.LOCK_FILE).write_text(json.dumps(lock_data), encoding='utf-8')
+
+    @staticmethod
+    def resolve_root(root_dir: Optional[str] = None) -> Path:
+        """
+        作業ディレクトリの親ディレクトリを決定
+
+        Args:
+            root_dir: 指定された親ディレクトリ（Noneならデフォルト）
+
+        Returns:
+            親ディレクトリのパス
+        """
+        if root_dir:
+            return Path(root_dir)
+        return Path(tempfile.gettempdir()) / DEFAULT_ROOT_NAME
+
+    def new_file(self, suffix: str, prefix: str = "tmp") -> str:
+        """
+        作業ディレクトリ内の新しいファイルパスを取得（ファイルは作らない）
+
+        Args:
+            suffix: 拡張子
+            prefix: ファイル名の接頭辞
+
+        Returns:
+            ファイルパス（ジョブ内で一意）
+        """
+        with self._lock:
+            number = next(self._counter)
+        return str(self.path / f"{prefix}_{number:04d}{suffix}")
+
+    def cleanup(self):
+        """作業ディレクトリを中間ファイルごと削除"""
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def __enter__(self) -> 'RenderWorkspace':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.cleanup()
+
+    @classmethod
+    def sweep_stale(cls, root_dir: Optional[str] = None) -> int:
+        """
+        作成したプロセスが終了している作業ディレクトリを削除（異常終了からの復旧）
+
+        Args:
+            root_dir: 作業ディレクトリの親ディレクトリ（Noneならデフォルト）
+
+        Returns:
+            削除したディレクトリ数
+        """
+        root = cls.resolve_root(root_dir)
+        if not root.exists():
+            return 0
+
+        removed = 0
+        for path in root.glob(f"{cls.PREFIX}*"):
+            if not path.is_dir() or cls._is_alive(path):
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+        return removed
+
+    @classmethod
+    def _is_alive(cls, path: Path) -> bool:
+        """
+        作業ディレクトリを作ったプロセスがまだ動いているか
+
+        Args:
+            path: 作業ディレクトリ
+
+        Returns:
+            動いていればTrue
+        """
+        lock_path = path / cls.LOCK_FILE
+        if not lock_path.exists():
+            try:
+                return time.time() - path.stat().st_mtime < cls.CREATE_GRACE_SECONDS
+            except OSError:
+                return False
+
+        try:
+            lock_data = json.loads(lock_path.read_text(encoding='utf-8'))
+            process = psutil.Process(lock_data['pid'])
+            # PIDが再利用された別プロセスでないか起動時刻で確認
+            return abs(process.create_time() - lock_data['create_time']) < 1.0
+        except (OSError, ValueError, KeyError, psutil.Error):
+            return False
@@ -3,7 +3,9 @@ VOICEVOX Integration Module
 VOICEVOX連携モジュール
 """
 from .client import VoiceVoxClient, EngineInfo
+from .engine_pool import VoiceVoxPool
 from .launcher import EngineLauncher
 from .audio_cache import AudioCache
+from .batch_synthesizer import BatchSynthesizer, BatchSynthesisResult
 
-__all__ = ['VoiceVoxClient', 'EngineInfo', 'EngineLauncher', 'AudioCache']
+__all__ = ['VoiceVoxClient', 'VoiceVoxPool', 'EngineInfo', 'EngineLauncher', 'AudioCache', 'BatchSynthesizer', 'BatchSynthesisResult']
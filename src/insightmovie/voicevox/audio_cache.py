@@ -3,9 +3,11 @@ Audio Cache Manager
 音声キャッシュ管理
 """
 import hashlib
+import os
+import threading
 import wave
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, List, Optional, Tuple
 
 
 class AudioCache:
@@ -66,6 +68,21 @@ class AudioCache:
         cache_path = self.get_cache_path(text, speaker_id)
         return cache_path.exists()
 
+    def missing(self, items: Iterable[Tuple[str, int]]) -> List[Tuple[str, int]]:
+        """
+        キャッシュにない (テキスト, 話者ID) を取得
+
+        Args:
+            items: (テキスト, 話者ID) の並び（重複可）
+
+        Returns:
+            キャッシュにない組み合わせ（重複を除き、最初に現れた順）
+        """
+        return [
+            (text, speaker_id) for text, speaker_id in dict.fromkeys(items)
+            if not self.exists(text, speaker_id)
+        ]
+
     def save(self, text: str, speaker_id: int, audio_data: bytes) -> str:
         """
         音声データをキャッシュに保存
@@ -79,8 +96,11 @@ class AudioCache:
             保存したファイルパス
         """
         cache_path = self.get_cache_path(text, speaker_id)
-        with open(cache_path, 'wb') as f:
+        # 並列レンダリング中に書きかけのファイルを読まれないよう、一時ファイル経由で置き換える
+        temp_path = cache_path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(temp_path, 'wb') as f:
             f.write(audio_data)
+        os.replace(temp_path, cache_path)
         return str(cache_path)
 
     def load(self, text: str, speaker_id: int) -> Optional[bytes]:
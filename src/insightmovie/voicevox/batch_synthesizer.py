@@ -0,0 +1,197 @@
+"""
+Batch Synthesizer
+ナレーションのまとめて合成（書き出し前に音声キャッシュをそろえる）
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .audio_cache import AudioCache
+from .client import VoiceVoxClient
+
+
+# エンジン1つあたりに同時に処理するまとまりの数（エンジンの合成待ちの間に、次のクエリ作成・通信を進める）
+DEFAULT_BATCH_WORKERS = 4
+
+# /multi_synthesis 1回でまとめて合成する数の上限
+MAX_CHUNK_SIZE = 8
+
+
+@dataclass
+class BatchSynthesisResult:
+    """まとめて合成した結果"""
+    synthesized: List[Tuple[str, int]] = field(default_factory=list)  # 合成してキャッシュに保存した (テキスト, 話者ID)
+    cached: int = 0  # キャッシュ済みだった数（重複を除く）
+    failed: Dict[Tuple[str, int], str] = field(default_factory=dict)  # 合成に失敗した (テキスト, 話者ID) → エラー
+    timings: List[Tuple[int, float]] = field(default_factory=list)  # まとまりごとの (文字数, 秒数)
+    seconds: float = 0.0  # 全体の所要時間
+
+    @property
+    def complete(self) -> bool:
+        """すべての音声がキャッシュにそろったか"""
+        return not self.failed
+
+
+class BatchSynthesizer:
+    """
+    ナレーションのまとめて合成クラス
+
+    (テキスト, 話者ID) の組み合わせから重複とキャッシュ済みのものを除き、
+    残りを話者ごとのまとまりに分けて並行して合成する。まとまりごとに
+    オーディオクエリを作成し、/multi_synthesis で1回のリクエストで合成する
+    （エンジンが対応していない・失敗した場合は1件ずつ /synthesis で合成）。
+    合成した音声はすぐに音声キャッシュに保存する。
+    """
+
+    def __init__(
+        self,
+        client: VoiceVoxClient,
+        audio_cache: AudioCache,
+        max_workers: Optional[int] = None,
+        chunk_size: int = MAX_CHUNK_SIZE
+    ):
+        """
+        Args:
+            client: VOICEVOXクライアント（複数のスレッドから使う）
+            audio_cache: 合成した音声の保存先
+            max_workers: 同時に処理するまとまりの数（Noneならエンジン数 × DEFAULT_BATCH_WORKERS）
+            chunk_size: /multi_synthesis 1回でまとめて合成する数の上限
+        """
+        self.client = client
+        self.audio_cache = audio_cache
+        self.max_workers = max(1, max_workers or DEFAULT_BATCH_WORKERS * client.engine_count)
+        self.chunk_size = max(1, chunk_size)
+        # /multi_synthesis に対応しているか（Noneなら未確認）
+        self._multi_synthesis: Optional[bool] = None
+        self._lock = threading.Lock()
+
+    def synthesize(
+        self,
+        items: Iterable[Tuple[str, int]],
+        should_stop: Optional[Callable[[], bool]] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> BatchSynthesisResult:
+        """
+        キャッシュにない音声をまとめて合成
+
+        Args:
+            items: (テキスト, 話者ID) の並び（重複・キャッシュ済みを含んでよい）
+            should_stop: Trueを返したら未着手のまとまりを取り消す
+            progress_callback: まとまりが終わるたびに (処理済みの数, 合成する数) を通知
+
+        Returns:
+            BatchSynthesisResult
+        """
+        started_at = time.monotonic()
+        items = [(text, speaker_id) for text, speaker_id in dict.fromkeys(items) if text]
+        pending = self.audio_cache.missing(items)
+        result = BatchSynthesisResult(cached=len(items) - len(pending))
+        if not pending:
+            return result
+
+        stop = should_stop or (lambda: False)
+        done = 0
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = [
+                executor.submit(self._synthesize_chunk, speaker_id, texts, stop)
+                for speaker_id, texts in self._chunks(pending)
+            ]
+            for future in as_completed(futures):
+                synthesized, failed, chars, seconds = future.result()
+                result.synthesized.extend(synthesized)
+                result.failed.update(failed)
+                if synthesized:
+                    result.timings.append((chars, seconds))
+                done += len(synthesized) + len(failed)
+                if progress_callback:
+                    progress_callback(done, len(pending))
+                if stop():
+                    break
+        finally:
+            executor.shutdown(wait=not stop(), cancel_futures=True)
+
+        result.seconds = time.monotonic() - started_at
+        return result
+
+    def _chunks(self, pending: List[Tuple[str, int]]) -> List[Tuple[int, List[str]]]:
+        """
+        話者ごとにまとまりに分ける
+
+        まとまりが少なすぎて並行できない場合は、上限より小さく分ける。
+
+        Returns:
+            (話者ID, テキストのリスト) のリスト
+        """
+        by_speaker: Dict[int, List[str]] = {}
+        for text, speaker_id in pending:
+            by_speaker.setdefault(speaker_id, []).append(text)
+
+        size = max(1, min(self.chunk_size, -(-len(pending) // self.max_workers)))
+        return [
+            (speaker_id, texts[start:start + size])
+            for speaker_id, texts in by_speaker.items()
+            for start in range(0, len(texts), size)
+        ]
+
+    def _synthesize_chunk(
+        self,
+        speaker_id: int,
+        texts: List[str],
+        should_stop: Callable[[], bool]
+    ) -> Tuple[List[Tuple[str, int]], Dict[Tuple[str, int], str], int, float]:
+        """
+        1つのまとまりを合成してキャッシュに保存（ワーカースレッドで実行）
+
+        Returns:
+            (保存した組み合わせ, 失敗した組み合わせ → エラー, 保存した文字数, 所要時間)
+        """
+        started_at = time.monotonic()
+        failed: Dict[Tuple[str, int], str] = {}
+
+        queries = []
+        for text in texts:
+            if should_stop():
+                return [], failed, 0, 0.0
+            try:
+                queries.append((text, self.client.create_audio_query(text, speaker_id)))
+            except RuntimeError as e:
+                failed[(text, speaker_id)] = str(e)
+
+        audio_list: Optional[List[bytes]] = None
+        if len(queries) > 1 and self._multi_synthesis is not False and not should_stop():
+            try:
+                audio_list = self.client.multi_synthesize([query for _, query in queries], speaker_id)
+                with self._lock:
+                    if audio_list is None and self._multi_synthesis is None:
+                        print("VOICEVOXエンジンが /multi_synthesis に対応していないため、1件ずつ合成します")
+                    self._multi_synthesis = audio_list is not None
+            except RuntimeError as e:
+                # どれか1件の問題でまとめて失敗するため、1件ずつ合成し直す
+                print(f"まとめての音声合成に失敗（1件ずつ合成します）: {e}")
+
+        synthesized = []
+        chars = 0
+        for n, (text, query) in enumerate(queries):
+            if audio_list is not None:
+                audio_data = audio_list[n]
+            else:
+                if should_stop():
+                    break
+                try:
+                    audio_data = self.client.synthesize(query, speaker_id)
+                except RuntimeError as e:
+                    failed[(text, speaker_id)] = str(e)
+                    continue
+            try:
+                self.audio_cache.save(text, speaker_id, audio_data)
+            except OSError as e:
+                # ディスクの空き不足などは、その1件の失敗として残りの合成を続ける
+                failed[(text, speaker_id)] = f"音声の保存に失敗: {e}"
+                continue
+            synthesized.append((text, speaker_id))
+            chars += len(text)
+
+        return synthesized, failed, chars, time.monotonic() - started_at
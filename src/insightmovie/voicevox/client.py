@@ -4,9 +4,14 @@ VOICEVOX Engine Client with Auto-Discovery
 """
 import requests
 import json
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, Dict, List, Tuple
 from dataclasses import dataclass
+from urllib.parse import urlparse
+
+from requests.adapters import HTTPAdapter
 
 
 @dataclass
@@ -28,21 +33,78 @@ class VoiceVoxClient:
     DEFAULT_PORT = 50021
     PORT_SCAN_RANGE = (50020, 50100)
     CONNECTION_TIMEOUT = 0.5  # 高速スキャン用の短いタイムアウト
+    MAX_SCAN_WORKERS = 128  # ポートスキャンで同時に確認する数（範囲全体を1回のタイムアウトで調べる）
+    DEFAULT_POOL_SIZE = 8  # エンジンごとに保持する接続数（同時に合成するシーン数の目安）
 
-    def __init__(self, base_url: Optional[str] = None):
+    def __init__(self, base_url: Optional[str] = None, pool_size: int = DEFAULT_POOL_SIZE):
         """
         Args:
             base_url: エンジンのベースURL（例: http://127.0.0.1:50021）
                      Noneの場合は自動検出を試みる
+            pool_size: 接続を使い回すために保持する接続数（ホストごと）
         """
         self._base_url = base_url
         self._engine_info: Optional[EngineInfo] = None
 
+        # 接続を使い回す（keep-alive）ための接続プール。全スレッドで共有し、
+        # セッション（Cookie等の状態）はスレッドごとに分ける
+        self.pool_size = max(1, pool_size)
+        self._adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size)
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        """このスレッドのセッション（接続プールは全スレッドで共有）"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.mount("http://", self._adapter)
+            session.mount("https://", self._adapter)
+            self._local.session = session
+        return session
+
+    def _request(self, method: str, url: str, timeout: float, **kwargs) -> requests.Response:
+        """
+        プールした接続でリクエストを送る
+
+        Args:
+            method: HTTPメソッド
+            url: URL（base_url からの相対パスも可、"/" で始める）
+            timeout: タイムアウト（秒）
+            **kwargs: requests に渡す引数（params, json など）
+
+        Returns:
+            レスポンス
+
+        Raises:
+            RuntimeError: エンジンに接続されていない状態で相対パスを指定した場合
+            requests.exceptions.RequestException: 通信エラー
+        """
+        if url.startswith("/"):
+            if not self._base_url:
+                raise RuntimeError("エンジンに接続されていません")
+            url = f"{self._base_url}{url}"
+        return self._session().request(method, url, timeout=timeout, **kwargs)
+
+    def close(self):
+        """保持している接続を閉じる"""
+        self._adapter.close()
+
+    def __enter__(self) -> 'VoiceVoxClient':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     @property
     def base_url(self) -> Optional[str]:
         """現在のベースURL"""
         return self._base_url
 
+    @property
+    def engine_count(self) -> int:
+        """リクエストを振り分けるエンジン数（同時に合成できる数の目安）"""
+        return 1
+
     @property
     def engine_info(self) -> Optional[EngineInfo]:
         """エンジン情報"""
@@ -50,37 +112,116 @@ class VoiceVoxClient:
 
     def discover_engine(self, fast_check_first: bool = True) -> Optional[EngineInfo]:
         """
-        VOICEVOXエンジンを自動検出
+        VOICEVOXエンジンを自動検出（見つかった時点で残りの確認を打ち切る）
+
+        前回の接続先（base_url）→ デフォルトポート → ポート範囲の優先順で、
+        すべての候補を並行して確認する。
 
         Args:
-            fast_check_first: デフォルトポートを最初にチェック
+            fast_check_first: デフォルトポートをポート範囲より優先する
 
         Returns:
             見つかったエンジン情報、見つからない場合はNone
         """
-        # まずデフォルトポートをチェック
+        engines = self._scan(self._candidate_addresses(fast_check_first), first_only=True)
+        return self._connect_first(engines)
+
+    def discover_engines(self, fast_check_first: bool = True) -> List[EngineInfo]:
+        """
+        起動しているVOICEVOXエンジンをすべて検出
+
+        最も優先度の高いエンジン（discover_engine() と同じ順）に接続する。
+
+        Args:
+            fast_check_first: デフォルトポートをポート範囲より優先する
+
+        Returns:
+            見つかったエンジン情報のリスト（優先順）
+        """
+        engines = self._scan(self._candidate_addresses(fast_check_first), first_only=False)
+        self._connect_first(engines)
+        return engines
+
+    def _candidate_addresses(self, fast_check_first: bool) -> List[Tuple[str, int]]:
+        """
+        確認する (ホスト, ポート) を優先順に列挙
+
+        Args:
+            fast_check_first: デフォルトポートをポート範囲より優先する
+
+        Returns:
+            重複のない候補のリスト
+        """
+        candidates = []
+        if self._base_url:
+            # 前回の接続先（Config.engine_url など）
+            parsed = urlparse(self._base_url)
+            if parsed.hostname and parsed.port:
+                candidates.append((parsed.hostname, parsed.port))
         if fast_check_first:
-            info = self._check_engine(self.DEFAULT_HOST, self.DEFAULT_PORT)
-            if info:
-                self._engine_info = info
-                self._base_url = info.base_url
-                return info
+            candidates.append((self.DEFAULT_HOST, self.DEFAULT_PORT))
+        for port in range(self.PORT_SCAN_RANGE[0], self.PORT_SCAN_RANGE[1] + 1):
+            candidates.append((self.DEFAULT_HOST, port))
+        return list(dict.fromkeys(candidates))
+
+    def _scan(self, candidates: List[Tuple[str, int]], first_only: bool) -> List[EngineInfo]:
+        """
+        候補を並行して確認
+
+        first_only の場合は、見つかったエンジンより優先度の高い候補が
+        すべて確認済みになった時点で打ち切る（未着手の確認は取り消す）。
+
+        Args:
+            candidates: 優先順の (ホスト, ポート) のリスト
+            first_only: 最も優先度の高いエンジンだけを探す
 
-        # ポート範囲をスキャン
+        Returns:
+            見つかったエンジン情報のリスト（優先順）
+        """
         print(f"エンジンをポート {self.PORT_SCAN_RANGE[0]}-{self.PORT_SCAN_RANGE[1]} でスキャン中...")
-        for port in range(self.PORT_SCAN_RANGE[0], self.PORT_SCAN_RANGE[1] + 1):
-            if port == self.DEFAULT_PORT and fast_check_first:
-                continue  # 既にチェック済み
+        found: Dict[int, EngineInfo] = {}
+        pending = set(range(len(candidates)))
 
-            info = self._check_engine(self.DEFAULT_HOST, port)
-            if info:
-                print(f"エンジンを検出: {info.base_url} (version: {info.version})")
-                self._engine_info = info
-                self._base_url = info.base_url
-                return info
+        executor = ThreadPoolExecutor(max_workers=max(1, min(len(candidates), self.MAX_SCAN_WORKERS)))
+        try:
+            futures = {
+                executor.submit(self._check_engine, host, port): index
+                for index, (host, port) in enumerate(candidates)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                pending.discard(index)
+                info = future.result()
+                if info:
+                    found[index] = info
+                if first_only and found and min(found) < min(pending, default=len(candidates)):
+                    break
+        finally:
+            # 応答待ちの確認は待たずに戻る（タイムアウトで終わる）
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        engines = [found[index] for index in sorted(found)]
+        for info in engines:
+            print(f"エンジンを検出: {info.base_url} (version: {info.version})")
+        if not engines:
+            print("エンジンが見つかりませんでした")
+        return engines
+
+    def _connect_first(self, engines: List[EngineInfo]) -> Optional[EngineInfo]:
+        """
+        最も優先度の高いエンジンを接続先にする
 
-        print("エンジンが見つかりませんでした")
-        return None
+        Args:
+            engines: 優先順のエンジン情報のリスト
+
+        Returns:
+            接続先にしたエンジン情報、空の場合はNone
+        """
+        if not engines:
+            return None
+        self._engine_info = engines[0]
+        self._base_url = engines[0].base_url
+        return engines[0]
 
     def _check_engine(self, host: str, port: int) -> Optional[EngineInfo]:
         """
@@ -95,7 +236,7 @@ class VoiceVoxClient:
         """
         try:
             url = f"http://{host}:{port}/version"
-            response = requests.get(url, timeout=self.CONNECTION_TIMEOUT)
+            response = self._request("GET", url, self.CONNECTION_TIMEOUT)
 
             if response.status_code == 200:
                 version = response.text.strip('"')
@@ -118,10 +259,7 @@ class VoiceVoxClient:
             return False
 
         try:
-            response = requests.get(
-                f"{self._base_url}/version",
-                timeout=2.0
-            )
+            response = self._request("GET", "/version", 2.0)
             return response.status_code == 200
         except requests.exceptions.RequestException:
             return False
@@ -137,10 +275,7 @@ class VoiceVoxClient:
             raise RuntimeError("エンジンに接続されていません")
 
         try:
-            response = requests.get(
-                f"{self._base_url}/speakers",
-                timeout=5.0
-            )
+            response = self._request("GET", "/speakers", 5.0)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -236,10 +371,11 @@ class VoiceVoxClient:
             raise RuntimeError("エンジンに接続されていません")
 
         try:
-            response = requests.post(
-                f"{self._base_url}/audio_query",
-                params={"text": text, "speaker": speaker_id},
-                timeout=10.0
+            response = self._request(
+                "POST",
+                "/audio_query",
+                10.0,
+                params={"text": text, "speaker": speaker_id}
             )
             response.raise_for_status()
             return response.json()
@@ -261,17 +397,64 @@ class VoiceVoxClient:
             raise RuntimeError("エンジンに接続されていません")
 
         try:
-            response = requests.post(
-                f"{self._base_url}/synthesis",
+            response = self._request(
+                "POST",
+                "/synthesis",
+                30.0,
                 params={"speaker": speaker_id},
-                json=query,
-                timeout=30.0
+                json=query
             )
             response.raise_for_status()
             return response.content
         except requests.exceptions.RequestException as e:
             raise RuntimeError(f"音声合成に失敗: {e}")
 
+    def multi_synthesize(self, queries: List[Dict], speaker_id: int) -> Optional[List[bytes]]:
+        """
+        複数の音声を1回のリクエストでまとめて合成（/multi_synthesis）
+
+        エンジンは同じ話者のクエリを順に合成し、WAVをまとめたZIPを返す。
+
+        Args:
+            queries: オーディオクエリのリスト（すべて同じ話者）
+            speaker_id: 話者ID
+
+        Returns:
+            WAVファイルのバイナリデータのリスト（queries と同じ順）、
+            エンジンが /multi_synthesis に対応していない場合はNone
+
+        Raises:
+            RuntimeError: 合成に失敗した場合
+        """
+        if not self._base_url:
+            raise RuntimeError("エンジンに接続されていません")
+
+        import io
+        import zipfile
+
+        try:
+            response = self._request(
+                "POST",
+                "/multi_synthesis",
+                30.0 * len(queries),
+                params={"speaker": speaker_id},
+                json=queries
+            )
+            if response.status_code in (404, 405):
+                return None
+            response.raise_for_status()
+            with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+                # 001.wav, 002.wav, ... の順
+                audio_list = [archive.read(name) for name in sorted(archive.namelist())]
+        except requests.exceptions.RequestException as e:
+            raise RuntimeError(f"音声合成に失敗: {e}")
+        except zipfile.BadZipFile as e:
+            raise RuntimeError(f"音声合成の結果を読み込めません: {e}")
+
+        if len(audio_list) != len(queries):
+            raise RuntimeError(f"音声合成の結果の数が一致しません: {len(audio_list)}/{len(queries)}")
+        return audio_list
+
     def generate_audio(self, text: str, speaker_id: int) -> bytes:
         """
         テキストから音声を生成（ワンステップ）
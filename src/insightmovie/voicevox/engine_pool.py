@@ -0,0 +1,233 @@
+"""
+VOICEVOX Engine Pool
+複数のVOICEVOXエンジンに音声合成を振り分けるクライアント
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .client import VoiceVoxClient
+
+
+@dataclass
+class PoolMember:
+    """プール内の1エンジンの状態"""
+    base_url: str
+    outstanding: int = 0  # 応答待ちのリクエスト数
+    completed: int = 0  # 応答を受け取ったリクエスト数
+    failures: int = 0  # 連続して失敗した回数（0なら正常）
+    retry_at: float = 0.0  # 切り離したエンジンの状態を確認し直す時刻（time.monotonic）
+
+    @property
+    def healthy(self) -> bool:
+        """振り分け対象か"""
+        return self.failures == 0
+
+
+class VoiceVoxPool(VoiceVoxClient):
+    """
+    複数エンジンのクライアント
+
+    VoiceVoxClient と同じように使え、エンジンへのリクエスト
+    （/audio_query, /synthesis など）を応答待ちが最も少ない正常なエンジンに送る。
+    接続できない・応答がないエンジンは切り離して別のエンジンで送り直し、
+    時間をおいて /version で確認できたら振り分けに戻す（確認の間隔は失敗する
+    たびに倍にする）。すべてのエンジンが切り離されている場合は、切り離したものも
+    順に試す。
+    """
+
+    EJECT_SECONDS = 2.0  # 切り離したエンジンを最初に確認し直すまでの時間
+    MAX_EJECT_SECONDS = 60.0  # 確認し直すまでの時間の上限
+
+    def __init__(self, base_urls: List[str], pool_size: int = VoiceVoxClient.DEFAULT_POOL_SIZE):
+        """
+        Args:
+            base_urls: エンジンのベースURLのリスト（例: http://127.0.0.1:50021）
+            pool_size: 接続を使い回すために保持する接続数（エンジンごと）
+        """
+        if not base_urls:
+            raise ValueError("エンジンのURLが指定されていません")
+        super().__init__(base_url=base_urls[0], pool_size=pool_size)
+
+        # エンジンの数だけ接続プールを保持する
+        self._adapter = HTTPAdapter(
+            pool_connections=max(4, len(base_urls)),
+            pool_maxsize=self.pool_size
+        )
+        self._members = [PoolMember(base_url=url.rstrip("/")) for url in dict.fromkeys(base_urls)]
+        self._members_lock = threading.Lock()
+
+    @property
+    def members(self) -> List[PoolMember]:
+        """各エンジンの状態（コピー）"""
+        with self._members_lock:
+            return [PoolMember(**vars(member)) for member in self._members]
+
+    @property
+    def engine_count(self) -> int:
+        """振り分け対象のエンジン数（切り離し中のものを除く、最低1）"""
+        with self._members_lock:
+            return max(1, sum(1 for member in self._members if member.healthy))
+
+    @property
+    def base_url(self) -> Optional[str]:
+        """正常なエンジンのうち最初のもののベースURL"""
+        with self._members_lock:
+            for member in self._members:
+                if member.healthy:
+                    return member.base_url
+        return self._base_url
+
+    def _request(self, method: str, url: str, timeout: float, **kwargs) -> requests.Response:
+        """
+        応答待ちが最も少ないエンジンにリクエストを送る
+
+        接続できない・タイムアウトした場合は、そのエンジンを切り離して
+        まだ試していないエンジンで送り直す。絶対URLはそのまま送る。
+
+        Raises:
+            requests.exceptions.RequestException: すべてのエンジンで失敗した場合
+        """
+        if not url.startswith("/"):
+            return super()._request(method, url, timeout, **kwargs)
+
+        self._readmit_due()
+        tried: Set[str] = set()
+        last_error: Optional[requests.exceptions.RequestException] = None
+        while True:
+            member = self._acquire(tried)
+            if member is None:
+                raise last_error or requests.exceptions.ConnectionError("利用できるエンジンがありません")
+            tried.add(member.base_url)
+
+            try:
+                response = self._session().request(
+                    method, f"{member.base_url}{url}", timeout=timeout, **kwargs
+                )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if self._release(member, success=False):
+                    print(f"エンジンを切り離しました: {member.base_url} ({type(e).__name__})")
+                last_error = e
+                continue
+
+            self._release(member, success=True)
+            return response
+
+    def _acquire(self, tried: Set[str]) -> Optional[PoolMember]:
+        """
+        リクエストを送るエンジンを選ぶ（応答待ちの数を1増やす）
+
+        Args:
+            tried: このリクエストで既に試したエンジンのURL
+
+        Returns:
+            選んだエンジン、試せるものがなければNone
+        """
+        with self._members_lock:
+            candidates = [member for member in self._members if member.base_url not in tried]
+            healthy = [member for member in candidates if member.healthy]
+            if healthy:
+                member = min(healthy, key=lambda m: (m.outstanding, m.completed))
+            elif candidates:
+                # すべて切り離されている場合は、確認し直す時刻が近いものから試す
+                member = min(candidates, key=lambda m: m.retry_at)
+            else:
+                return None
+            member.outstanding += 1
+            return member
+
+    def _release(self, member: PoolMember, success: bool) -> bool:
+        """
+        リクエストの結果を反映（応答待ちの数を1減らす）
+
+        同時に送っていたリクエストがまとめて失敗しても、切り離すのは1回だけにする。
+
+        Args:
+            member: リクエストを送ったエンジン
+            success: 応答を受け取れたか
+
+        Returns:
+            このリクエストの失敗でエンジンを切り離した場合True
+        """
+        with self._members_lock:
+            member.outstanding -= 1
+            if success:
+                member.completed += 1
+                member.failures = 0
+                return False
+            if not member.healthy:
+                return False
+            self._eject(member)
+            return True
+
+    def _eject(self, member: PoolMember):
+        """エンジンを切り離し、確認し直す時刻を決める（_members_lock を保持して呼ぶ）"""
+        member.failures += 1
+        backoff = self.EJECT_SECONDS * 2 ** (member.failures - 1)
+        member.retry_at = time.monotonic() + min(self.MAX_EJECT_SECONDS, backoff)
+
+    def _readmit_due(self):
+        """確認し直す時刻になった切り離し中のエンジンを /version で確認"""
+        now = time.monotonic()
+        with self._members_lock:
+            due = [member for member in self._members if not member.healthy and member.retry_at <= now]
+            # 確認中に他のスレッドが同じエンジンを確認しないよう、次の確認時刻を先に進める
+            for member in due:
+                member.retry_at = now + self.MAX_EJECT_SECONDS
+
+        for member in due:
+            alive = self._check_engine_url(member.base_url)
+            with self._members_lock:
+                if alive:
+                    member.failures = 0
+                    print(f"エンジンを振り分けに戻しました: {member.base_url}")
+                else:
+                    self._eject(member)
+
+    def _check_engine_url(self, base_url: str) -> bool:
+        """エンジンが応答するか（/version）"""
+        address = urlparse(base_url)
+        return self._check_engine(address.hostname, address.port or 80) is not None
+
+    def check_health(self) -> Dict[str, bool]:
+        """
+        すべてのエンジンを確認し、切り離し・振り分けへの復帰を反映
+
+        Returns:
+            ベースURL → 応答したか
+        """
+        with self._members_lock:
+            members = list(self._members)
+
+        status = {}
+        for member in members:
+            alive = self._check_engine_url(member.base_url)
+            with self._members_lock:
+                if alive:
+                    member.failures = 0
+                elif member.healthy:
+                    self._eject(member)
+            status[member.base_url] = alive
+        return status
+
+    def wait_until_ready(self, timeout: float = 60.0) -> int:
+        """
+        起動直後のエンジンが応答するまで待つ
+
+        Args:
+            timeout: 待つ時間の上限（秒）
+
+        Returns:
+            応答したエンジン数（タイムアウト時はその時点の数）
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            ready = sum(1 for alive in self.check_health().values() if alive)
+            if ready == len(self._members) or time.monotonic() >= deadline:
+                return ready
+            time.sleep(0.5)
@@ -3,11 +3,12 @@ VOICEVOX Engine Launcher
 エンジンの起動・停止を管理
 """
 import os
+import socket
 import subprocess
 import time
 import psutil
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 
 
 class EngineLauncher:
@@ -21,6 +22,8 @@ class EngineLauncher:
         self._engine_path = engine_path
         self._process: Optional[subprocess.Popen] = None
         self._pid: Optional[int] = None
+        # launch_pool() で追加起動したエンジン（ポート → プロセス）
+        self._pool_processes: Dict[int, subprocess.Popen] = {}
 
     @property
     def engine_path(self) -> Optional[str]:
@@ -96,21 +99,7 @@ class EngineLauncher:
             return True
 
         try:
-            # コマンドライン引数
-            cmd = [self._engine_path, f"--port={port}"]
-            if not use_gpu:
-                cmd.append("--use_gpu=false")
-
-            # プロセス起動（バックグラウンド）
-            self._process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                encoding="utf-8",
-                errors="replace",
-                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-            )
+            self._process = self._start_process(port, use_gpu)
             self._pid = self._process.pid
 
             print(f"エンジンを起動しました (PID: {self._pid}, Port: {port})")
@@ -128,6 +117,109 @@ class EngineLauncher:
             print(f"エンジン起動エラー: {e}")
             return False
 
+    def _start_process(self, port: int, use_gpu: bool, cpu_threads: Optional[int] = None) -> subprocess.Popen:
+        """
+        エンジンのプロセスを起動（起動待ちはしない）
+
+        Args:
+            port: 使用するポート番号
+            use_gpu: GPU使用フラグ
+            cpu_threads: CPU版の合成に使うスレッド数（Noneならエンジンの既定）
+
+        Returns:
+            起動したプロセス
+        """
+        # コマンドライン引数
+        cmd = [self._engine_path, f"--port={port}"]
+        if not use_gpu:
+            cmd.append("--use_gpu=false")
+        if cpu_threads:
+            cmd.append(f"--cpu_num_threads={cpu_threads}")
+
+        # プロセス起動（バックグラウンド）
+        # 出力は読まないため、パイプが詰まってエンジンが止まらないよう捨てる
+        return subprocess.Popen(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+        )
+
+    @staticmethod
+    def _port_available(port: int, host: str = "127.0.0.1") -> bool:
+        """ポートが使われていないか"""
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            try:
+                sock.bind((host, port))
+                return True
+            except OSError:
+                return False
+
+    @property
+    def pool_ports(self) -> List[int]:
+        """launch_pool() で起動し、動作中のエンジンのポート"""
+        return [port for port, process in self._pool_processes.items() if process.poll() is None]
+
+    def launch_pool(
+        self,
+        count: int,
+        base_port: int = 50021,
+        use_gpu: bool = False,
+        host: str = "127.0.0.1"
+    ) -> List[str]:
+        """
+        エンジンを複数起動（VoiceVoxPool で振り分けて使う）
+
+        base_port から順に空いているポートで起動する。CPU版では
+        CPUのコア数をエンジン数で分けて、エンジンどうしが取り合わないようにする。
+        起動を待たずに戻るため、読み込み中のエンジンは VoiceVoxPool が
+        切り離し、応答するようになった時点で振り分けに戻す。
+
+        Args:
+            count: 起動するエンジン数
+            base_port: 最初に試すポート番号
+            use_gpu: GPU使用フラグ
+            host: エンジンのホスト名（URLに使用）
+
+        Returns:
+            起動したエンジンのベースURLのリスト
+        """
+        if not self._engine_path:
+            self._engine_path = self.find_default_engine_path()
+        if not self._engine_path or not os.path.exists(self._engine_path):
+            print(f"エンジンが見つかりません: {self._engine_path}")
+            return []
+
+        cpu_threads = None if use_gpu else max(1, (os.cpu_count() or 1) // max(1, count))
+        urls = []
+        port = base_port
+        while len(urls) < count and port < base_port + 100:
+            if port not in self._pool_processes and self._port_available(port, host):
+                try:
+                    process = self._start_process(port, use_gpu, cpu_threads)
+                except Exception as e:
+                    print(f"エンジン起動エラー: {e}")
+                    break
+                self._pool_processes[port] = process
+                urls.append(f"http://{host}:{port}")
+                print(f"エンジンを起動しました (PID: {process.pid}, Port: {port})")
+            port += 1
+
+        return urls
+
+    def stop_pool(self):
+        """launch_pool() で起動したエンジンをすべて停止"""
+        processes, self._pool_processes = self._pool_processes, {}
+        for process in processes.values():
+            process.terminate()
+        for port, process in processes.items():
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+            print(f"エンジンを停止しました (Port: {port})")
+
     def stop(self) -> bool:
         """
         エンジンを停止
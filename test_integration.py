@@ -52,6 +52,108 @@ def test_ffmpeg_detection():
         print(f"✗ ffmpeg detection failed: {e}")
         return False
 
+def test_async_ffmpeg():
+    """非同期ffmpeg実行APIのテスト"""
+    print("\nTesting async ffmpeg execution...")
+    try:
+        import asyncio
+        from insightmovie.video import FFmpegWrapper
+        try:
+            ffmpeg = FFmpegWrapper()
+        except Exception as e:
+            print(f"⚠ ffmpeg not found (expected if not installed): {e}")
+            return True
+
+        async def run_all():
+            audio = await asyncio.gather(*[
+                ffmpeg.run_to_bytes_async(["-f", "lavfi", "-i", "anullsrc=d=0.2", "-f", "wav", "pipe:1"])
+                for _ in range(3)
+            ])
+            # 終わらない入力はタイムアウトで終了させる
+            timed_out = await ffmpeg.run_command_async(
+                ["-f", "lavfi", "-i", "anullsrc,arealtime", "-f", "null", "-"],
+                timeout=0.5
+            )
+            return audio, timed_out
+
+        audio, timed_out = asyncio.run(run_all())
+        assert all(data and data[:4] == b"RIFF" for data in audio)
+        assert not timed_out and timed_out.timed_out
+
+        print("✓ Async ffmpeg execution working")
+        return True
+    except Exception as e:
+        print(f"✗ Async ffmpeg execution failed: {e}")
+        return False
+
+def test_ffmpeg_result():
+    """ffmpegの実行結果（時間・CPU・メモリ）のテスト"""
+    print("\nTesting ffmpeg run results...")
+    try:
+        import os
+        from insightmovie.video import FFmpegWrapper
+        from insightmovie.video.render_job import format_step_breakdown
+        try:
+            ffmpeg = FFmpegWrapper()
+        except Exception as e:
+            print(f"⚠ ffmpeg not found (expected if not installed): {e}")
+            return True
+
+        with ffmpeg.collect_results() as results:
+            ok = ffmpeg.run_command(
+                ["-f", "lavfi", "-i", "testsrc=d=1:s=320x240", "-f", "null", "-"], step="scale"
+            )
+            failed = ffmpeg.run_command(["-i", "missing_input.mp4", "-f", "null", "-"], step="subtitle")
+        assert ok and ok.returncode == 0 and ok.wall_seconds > 0
+        assert ok.argv[0] == ffmpeg.ffmpeg_path
+        assert not failed and failed.returncode != 0 and "missing_input.mp4" in failed.stderr_tail
+        assert results == [ok, failed]
+        if hasattr(os, 'wait4'):
+            assert ok.cpu_seconds is not None and ok.peak_rss > 0
+
+        # 非同期実行は実行中に読んだメモリ使用量の最大を残す
+        import asyncio
+        async_ok = asyncio.run(ffmpeg.run_command_async(
+            ["-f", "lavfi", "-i", "testsrc=d=1:s=320x240", "-f", "null", "-"], step="scale"
+        ))
+        assert async_ok and async_ok.cpu_seconds is not None
+        assert async_ok.peak_rss and async_ok.peak_rss_sampled
+        lines = format_step_breakdown(results)
+        assert len(lines) == 2 and "2回" not in lines[0]
+
+        print(f"✓ ffmpeg run results working ({ok.summary()})")
+        return True
+    except Exception as e:
+        print(f"✗ ffmpeg run results failed: {e}")
+        return False
+
+def test_stderr_tail():
+    """ffmpegのエラー出力のリングバッファのテスト"""
+    print("\nTesting ffmpeg stderr ring buffer...")
+    try:
+        from insightmovie.video.ffmpeg_wrapper import StderrTail, split_output, MAX_LINE_BYTES
+
+        tail = StderrTail(max_lines=3)
+        assert not tail.add("frame=  120 fps= 60 q=28.0 size=  256KiB time=00:00:04.00 bitrate= 524kbits/s")
+        assert not tail.add("Press [q] to stop, [?] for help")
+        for i in range(5):
+            assert tail.add(f"[libx264 @ 0x1] line {i}")
+        assert tail.dropped == 2
+        assert tail.text().splitlines() == ["...（2行省略）", "[libx264 @ 0x1] line 2",
+                                            "[libx264 @ 0x1] line 3", "[libx264 @ 0x1] line 4"]
+
+        # \r の書き換えも区切り、改行のない長い出力はためこまない
+        lines, rest = split_output(b"", b"a\rb\n\nc")
+        assert lines == ["a", "b"] and rest == b"c"
+        lines, rest = split_output(rest, b"x" * (MAX_LINE_BYTES * 2 + 10))
+        assert len(lines) == 2 and len(rest) <= MAX_LINE_BYTES
+
+        print("✓ ffmpeg stderr ring buffer working")
+        return True
+    except Exception as e:
+        print(f"✗ ffmpeg stderr ring buffer failed: {e}")
+        return False
+
 def test_voicevox_client():
     """VOICEVOX クライアントテスト"""
     print("\nTesting VOICEVOX client...")
@@ -68,6 +170,88 @@ def test_voicevox_client():
         print(f"✗ VOICEVOX client test failed: {e}")
         return False
 
+def test_batch_synthesis():
+    """ナレーションのまとめて合成のテスト（エンジンの代わりに記録するだけのクライアント）"""
+    print("\nTesting batch synthesis...")
+    try:
+        from insightmovie.voicevox import AudioCache, BatchSynthesizer
+        import tempfile
+
+        class RecordingClient:
+            def __init__(self):
+                self.calls = []
+
+            def create_audio_query(self, text, speaker_id):
+                return {"text": text}
+
+            def multi_synthesize(self, queries, speaker_id):
+                self.calls.append(("multi", speaker_id, len(queries)))
+                return None  # /multi_synthesis に対応していないエンジン
+
+            def synthesize(self, query, speaker_id):
+                self.calls.append(("single", speaker_id, 1))
+                return query["text"].encode('utf-8')
+
+        with tempfile.TemporaryDirectory() as root:
+            cache = AudioCache(root)
+            cache.save("済み", 1, b"cached")
+            client = RecordingClient()
+            items = [("あ", 1), ("い", 1), ("あ", 1), ("済み", 1), ("う", 2), ("", 1)]
+
+            result = BatchSynthesizer(client, cache, max_workers=1).synthesize(items)
+            assert sorted(result.synthesized) == [("あ", 1), ("い", 1), ("う", 2)], result.synthesized
+            assert result.cached == 1 and result.complete
+            assert cache.load("い", 1) == "い".encode('utf-8')
+            assert client.calls.count(("multi", 1, 2)) == 1, "Same-speaker misses should be batched"
+            assert not cache.missing(items[:-1])
+
+            # 保存に失敗した1件だけを失敗として記録し、残りは保存する
+            class FailingCache(AudioCache):
+                def save(self, text, speaker_id, audio_data):
+                    if text == "壊":
+                        raise OSError("No space left on device")
+                    return super().save(text, speaker_id, audio_data)
+
+            result = BatchSynthesizer(RecordingClient(), FailingCache(root), max_workers=1).synthesize(
+                [("壊", 3), ("え", 3)]
+            )
+            assert result.synthesized == [("え", 3)] and list(result.failed) == [("壊", 3)], result.failed
+
+        print("✓ Batch synthesis working")
+        return True
+    except Exception as e:
+        print(f"✗ Batch synthesis failed: {e}")
+        return False
+
+def test_voicevox_pool():
+    """複数エンジンへの振り分けのテスト（接続できないポートで切り離しを確認）"""
+    print("\nTesting VOICEVOX pool...")
+    try:
+        from insightmovie.voicevox import VoiceVoxPool
+
+        pool = VoiceVoxPool(["http://127.0.0.1:1", "http://127.0.0.1:2/", "http://127.0.0.1:1"])
+        assert pool.engine_count == 2, "Duplicate URLs should be merged"
+
+        first = pool._acquire(set())
+        second = pool._acquire(set())
+        assert first.base_url != second.base_url, "Least outstanding engine should be chosen"
+        pool._release(first, success=True)
+        pool._release(second, success=True)
+
+        assert not pool.check_connection()
+        assert all(not member.healthy for member in pool.members), "Unreachable engines should be ejected"
+        try:
+            pool.get_speakers()
+            raise AssertionError("Request without any engine should fail")
+        except RuntimeError:
+            pass
+
+        print("✓ VOICEVOX pool working")
+        return True
+    except Exception as e:
+        print(f"✗ VOICEVOX pool failed: {e}")
+        return False
+
 def test_scene_serialization():
     """シーンのシリアライズテスト"""
     print("\nTesting scene serialization...")
@@ -99,6 +283,319 @@ def test_scene_serialization():
         traceback.print_exc()
         return False
 
+def test_clip_fingerprint():
+    """シーン動画フィンガープリントのテスト"""
+    print("\nTesting clip fingerprint...")
+    try:
+        from insightmovie.project import Scene
+        from insightmovie.video import SceneClipCache
+
+        scene = Scene(subtitle_text="テスト字幕")
+        encoder = {'video': ["-c:v", "libx264"]}
+
+        def fingerprint(s):
+            return SceneClipCache.get_fingerprint(s, 3.0, "1080x1920", 30, None, None, encoder)
+
+        base = fingerprint(scene)
+        assert base == fingerprint(scene), "Fingerprint should be stable"
+
+        scene.subtitle_text = "テスト字幕（修正）"
+        assert base != fingerprint(scene), "Subtitle edit should change fingerprint"
+
+        # 作業ディレクトリで生成した動画を移し、上限を超えたら最後に使われた時刻が古いものから削除
+        import os
+        import tempfile
+        with tempfile.TemporaryDirectory() as root:
+            cache_dir = Path(root) / "clips"
+            cache = SceneClipCache(str(cache_dir), max_bytes=3000)
+            for n, name in enumerate(["a", "b", "c"]):
+                temp_path = Path(root) / f"{name}.mp4"
+                temp_path.write_bytes(b"x" * 1000)
+                cache.commit(name, str(temp_path))
+                assert not temp_path.exists()
+                os.utime(cache.get_clip_path(name), (n, n))
+            cache.lookup("a")
+            assert cache.contains("b"), "Cached clip should be found"
+            cache.max_bytes = 2500
+            cache._evict()
+            assert cache.lookup("a") and cache.lookup("c") and not cache.lookup("b"), "LRU eviction"
+
+            # 異常終了した書き出しの古い一時ファイルだけを起動時に削除
+            stale = cache.get_temp_path("d")
+            stale.write_bytes(b"x")
+            os.utime(stale, (0, 0))
+            fresh = cache.get_temp_path("e")
+            fresh.write_bytes(b"x")
+            SceneClipCache(str(cache_dir))
+            assert not stale.exists() and fresh.exists(), "Stale temp files should be swept"
+
+            # 1つのジョブのシーン動画が合わせて上限を超えても、結合が終わるまでは消さない
+            job_cache = SceneClipCache(str(Path(root) / "job"), max_bytes=1500)
+            pinned = []
+            for name in ["p", "q", "r"]:
+                temp_path = Path(root) / f"{name}.mp4"
+                temp_path.write_bytes(b"x" * 1000)
+                pinned.append(job_cache.commit(name, str(temp_path), pin=True))
+            assert all(Path(p).exists() for p in pinned), "Pinned clips should survive eviction"
+            job_cache.unpin(pinned)
+            assert job_cache.total_bytes <= 1500, "Unpinned clips should be evicted"
+
+        print("✓ Clip fingerprint working")
+        return True
+    except Exception as e:
+        print(f"✗ Clip fingerprint failed: {e}")
+        return False
+
+def test_encoding_profile():
+    """エンコードプロファイルのテスト"""
+    print("\nTesting encoding profile...")
+    try:
+        from insightmovie.project import Project, get_encoding_profile
+        import tempfile
+
+        project = Project()
+        project.output.profile = get_encoding_profile("draft")
+        project.output.profile.intermediate = True
+        assert project.output.render_resolution == "540x960", "Draft should halve resolution"
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+            temp_path = f.name
+
+        project.save(temp_path)
+        loaded_project = Project(temp_path)
+        assert loaded_project.output.profile.name == "draft"
+        assert loaded_project.output.profile.preset == "ultrafast"
+        assert loaded_project.output.profile.intermediate is True
+        assert get_encoding_profile("draft").intermediate is False, "Built-ins must not be modified"
+
+        print("✓ Encoding profile working")
+        Path(temp_path).unlink()  # Cleanup
+        return True
+    except Exception as e:
+        print(f"✗ Encoding profile failed: {e}")
+        return False
+
+def test_encoder_policy():
+    """エンコーダー選択のテスト"""
+    print("\nTesting encoder policy...")
+    try:
+        from insightmovie.project import get_encoding_profile
+        from insightmovie.video import EncoderPolicy, FFmpegCapabilities
+
+        profile = get_encoding_profile("balanced")
+
+        default = EncoderPolicy()
+        assert default.video_args(profile) == [
+            "-c:v", "libx264", "-pix_fmt", "yuv420p", "-preset", "medium", "-crf", "23"
+        ]
+        assert default.subtitle_renderer == "drawtext"
+
+        # libx264 も drawtext もないビルド
+        capabilities = FFmpegCapabilities(
+            encoders=["libopenh264", "libx265", "mpeg4", "utvideo"],
+            filters=["drawbox", "ass", "tpad"]
+        )
+        policy = EncoderPolicy(capabilities)
+        assert policy.video_encoder.name == "libopenh264"
+        assert policy.lossless_video_args()[:2] == ["-c:v", "libx265"]
+        assert policy.subtitle_renderer == "ass"
+        assert not policy.supports_tune()
+
+        minimal = EncoderPolicy(FFmpegCapabilities(encoders=["mpeg4"], filters=["drawbox"]))
+        assert minimal.video_encoder.name == "mpeg4"
+        assert minimal.lossless_video_args()[:2] == ["-c:v", "utvideo"]
+        assert minimal.subtitle_renderer is None
+
+        # libass 用の字幕: "\" はそのまま残し、改行の指定として読まれる組み合わせだけ区切る
+        from insightmovie.video.ass_subtitle import build_ass_script
+        script = build_ass_script(["C:\\new\\x", "{a}"], 320, 240, 120, 24, None)
+        assert script.rstrip("\n").endswith("C:\\\u2060new\\x\\N\\{a\\}")
+
+        print("✓ Encoder policy working")
+        return True
+    except Exception as e:
+        print(f"✗ Encoder policy failed: {e}")
+        return False
+
+def test_job_manifest():
+    """書き出しマニフェスト（再開）のテスト"""
+    print("\nTesting job manifest...")
+    try:
+        from insightmovie.video import JobManifest
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as root:
+            manifest = JobManifest.for_output(str(Path(root) / "out.mp4"), root)
+            manifest.reset(3)
+
+            clip_path = Path(root) / "clip.mp4"
+            clip_path.write_bytes(b"clip")
+            kept_path = manifest.keep_clip(1, str(clip_path))
+            manifest.record(1, "abc", kept_path)
+
+            loaded = JobManifest.for_output(str(Path(root) / "out.mp4"), root)
+            assert loaded.load(), "Manifest should be loadable"
+            assert loaded.completed_count == 1
+            assert loaded.lookup(1, "abc") == kept_path
+            assert loaded.lookup(1, "changed") is None, "Changed scene must be re-rendered"
+            assert loaded.lookup(2, "abc") is None
+
+            loaded.discard()
+            assert not manifest.exists()
+
+        print("✓ Job manifest working")
+        return True
+    except Exception as e:
+        print(f"✗ Job manifest failed: {e}")
+        return False
+
+def test_probe_parsing():
+    """ffprobeのJSON解析とメディア情報キャッシュのテスト"""
+    print("\nTesting media probe parsing...")
+    try:
+        from insightmovie.video import FFmpegWrapper, MediaProbeCache
+        import tempfile
+
+        data = {
+            'format': {'duration': '10.010000'},
+            'streams': [
+                {
+                    'index': 0, 'codec_type': 'video', 'codec_name': 'h264',
+                    'width': 1920, 'height': 1080, 'pix_fmt': 'yuv420p',
+                    'sample_aspect_ratio': '1:1', 'avg_frame_rate': '30000/1001',
+                    'side_data_list': [{'side_data_type': 'Display Matrix', 'rotation': -90}],
+                },
+                {'index': 1, 'codec_type': 'audio', 'codec_name': 'aac', 'sample_rate': '48000', 'channels': 2},
+            ],
+        }
+        info = FFmpegWrapper.parse_probe_json(data)
+        assert info['duration'] == 10.01
+        assert info['has_audio']
+        assert info['video_codec'] == 'h264' and info['width'] == 1920 and info['height'] == 1080
+        assert abs(info['fps'] - 29.97) < 0.01
+        assert info['rotation'] == 90
+        assert len(info['streams']) == 2
+
+        with tempfile.TemporaryDirectory() as root:
+            media_path = Path(root) / "media.mp4"
+            media_path.write_bytes(b"media")
+            cache = MediaProbeCache(str(Path(root) / "probes"))
+            cache.put(str(media_path), info)
+            assert MediaProbeCache(str(Path(root) / "probes")).get(str(media_path)) == info
+
+            media_path.write_bytes(b"changed media")
+            assert cache.get(str(media_path)) is None, "Changed file must be probed again"
+
+        print("✓ Media probe parsing working")
+        return True
+    except Exception as e:
+        print(f"✗ Media probe parsing failed: {e}")
+        return False
+
+def test_render_estimator():
+    """書き出し時間の予測のテスト"""
+    print("\nTesting render estimator...")
+    try:
+        from insightmovie.project import Project
+        from insightmovie.video import RenderHistory
+        from insightmovie.video.render_history import STAGE_SCENE, STAGE_CONCAT, profile_key
+        import tempfile
+
+        project = Project()
+        with tempfile.TemporaryDirectory() as root:
+            history = RenderHistory(str(Path(root) / "history.sqlite3"))
+            default = project.estimate_render_time(13, history=history)
+            assert default.total_seconds > 0
+            assert not default.from_history, "Empty history must fall back to defaults"
+
+            key = profile_key(project.output.profile)
+            for work in (1.0, 2.0, 4.0):
+                history.record(STAGE_SCENE, work, work * 10.0, media_type="none", profile=key)
+            history.record(STAGE_CONCAT, 4.0, 0.5, profile=key)
+
+            estimate = project.estimate_render_time(13, history=history)
+            assert estimate.from_history
+            assert estimate.total_seconds > default.total_seconds, "Slow history should raise the estimate"
+
+        print(f"✓ Render estimator working (約{estimate.format_total()})")
+        return True
+    except Exception as e:
+        print(f"✗ Render estimator failed: {e}")
+        return False
+
+def test_streaming_export():
+    """ストリーミング書き出し（シーンをパイプでマルチプレクサに流し込む）のテスト"""
+    print("\nTesting streaming export...")
+    try:
+        import tempfile
+        from insightmovie.project import Project, Scene, DurationMode, get_encoding_profile
+        from insightmovie.video import FFmpegWrapper, RenderJob, RenderWorkspace, SegmentSpool
+        from insightmovie.voicevox import VoiceVoxClient, AudioCache
+
+        class FakeMuxer:
+            def __init__(self, accept=True):
+                self.data = b""
+                self.accept = accept
+
+            def write(self, segment):
+                self.data += segment
+                return self.accept
+
+        with tempfile.TemporaryDirectory() as root:
+            # 順番待ちの分は上限を超えたらファイルに書き出し、つないだ時に順番どおり書き込む
+            with RenderWorkspace(root) as workspace:
+                spool = SegmentSpool(workspace, memory_limit=4)
+                assert spool.write(b"abc") and spool.write(b"defg")
+                assert spool.spill_path and Path(spool.spill_path).exists(), "Overflow should spill to a file"
+                muxer = FakeMuxer()
+                assert spool.attach(muxer) and spool.write(b"h")
+                assert muxer.data == b"abcdefgh"
+                assert not Path(spool.spill_path).exists()
+
+                failing = SegmentSpool(workspace)
+                failing.attach(FakeMuxer(accept=False))
+                assert not failing.write(b"x") and failing.muxer_failed
+
+            try:
+                ffmpeg = FFmpegWrapper()
+            except Exception as e:
+                print(f"⚠ ffmpeg not found (expected if not installed): {e}")
+                return True
+
+            project = Project()
+            project.scenes = [
+                Scene(duration_mode=DurationMode.FIXED, fixed_seconds=seconds)
+                for seconds in (1.0, 1.5, 1.0)
+            ]
+            project.output.resolution = "360x640"
+            project.output.profile = get_encoding_profile("draft")
+            project.output.output_path = str(Path(root) / "streaming.mp4")
+            project.settings.workspace_dir = root
+
+            job = RenderJob(
+                project,
+                VoiceVoxClient(),
+                AudioCache(str(Path(root) / "audio")),
+                ffmpeg,
+                speaker_id=0,
+                max_workers=2,
+                streaming=True
+            )
+            success, message = job.run()
+            assert success, message
+
+            info = ffmpeg.probe(project.output.output_path, use_cache=False)
+            assert info and info['has_audio'], "Output should have video and audio"
+            assert abs(info['duration'] - 3.5) < 0.1, f"Unexpected duration: {info['duration']}"
+
+        print("✓ Streaming export working")
+        return True
+    except Exception as e:
+        print(f"✗ Streaming export failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
 def main():
     """メインテスト"""
     print("=" * 60)
@@ -109,8 +606,20 @@ def main():
     results.append(("Imports", test_imports()))
     results.append(("Project Creation", test_project_creation()))
     results.append(("ffmpeg Detection", test_ffmpeg_detection()))
+    results.append(("Async ffmpeg", test_async_ffmpeg()))
+    results.append(("FFmpeg Result", test_ffmpeg_result()))
+    results.append(("Stderr Tail", test_stderr_tail()))
     results.append(("VOICEVOX Client", test_voicevox_client()))
+    results.append(("Batch Synthesis", test_batch_synthesis()))
+    results.append(("VOICEVOX Pool", test_voicevox_pool()))
     results.append(("Scene Serialization", test_scene_serialization()))
+    results.append(("Clip Fingerprint", test_clip_fingerprint()))
+    results.append(("Encoding Profile", test_encoding_profile()))
+    results.append(("Encoder Policy", test_encoder_policy()))
+    results.append(("Job Manifest", test_job_manifest()))
+    results.append(("Media Probe", test_probe_parsing()))
+    results.append(("Render Estimator", test_render_estimator()))
+    results.append(("Streaming Export", test_streaming_export()))
 
     print("\n" + "=" * 60)
     print("Test Results:")